@@ -0,0 +1,163 @@
+"""The broadcaster module contains the Broadcaster class, which sends messages within the rate limits of Telegram."""
+import asyncio
+import time
+from typing import Callable, Protocol
+
+import telegram
+
+from f1_schedule_telegram_bot.consts import (
+    GLOBAL_RATE_LIMIT,
+    GROUP_BUCKETS_EVICT_AT,
+    GROUP_BURST_LIMIT,
+    GROUP_RATE_LIMIT,
+)
+from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
+
+GROUP_CHAT_TYPES = (
+    telegram.constants.ChatType.GROUP,
+    telegram.constants.ChatType.SUPERGROUP,
+)
+
+
+class Recipient(Protocol):
+    """A chat that messages can be broadcast to."""
+
+    @property
+    def chat_id(self) -> int:
+        """Return the id of the chat."""
+
+    @property
+    def chat_type(self) -> str:
+        """Return the type of the chat, e.g. "private" or "group"."""
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter.
+
+    The bucket holds at most `capacity` tokens and is refilled with `rate`
+    tokens per second. Every sent message takes a single token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a full token bucket.
+
+        :param rate: The amount of tokens added per second.
+        :param capacity: The maximum amount of tokens, i.e. the allowed burst.
+        :param clock: A monotonic clock returning seconds.
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns 0 if a token was taken, otherwise the amount of seconds to wait
+        before a token becomes available.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self._rate
+
+    def is_full(self) -> bool:
+        """Return whether the bucket is full, as if it was never used."""
+        self._refill()
+        return self._tokens >= self._capacity
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while (delay := self.try_acquire()) > 0:
+            await asyncio.sleep(delay)
+
+
+class Broadcaster:
+    """
+    Send messages to many chats within the rate limits.
+
+    All messages go through the given message handler, while a global token
+    bucket and a token bucket per group chat keep the bot within the rate
+    limits Telegram imposes on bots. The buckets of the groups that are full
+    again are dropped every time the amount of buckets doubled, so only the
+    recently messaged groups are kept.
+    """
+
+    def __init__(
+        self,
+        message_handler: MessageHandlerInterface,
+        global_rate: float = GLOBAL_RATE_LIMIT,
+        group_rate: float = GROUP_RATE_LIMIT,
+        group_burst: float = GROUP_BURST_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the broadcaster.
+
+        :param message_handler: The message handler used to send each message.
+        :param global_rate: The maximum amount of messages per second.
+        :param group_rate: The maximum amount of messages per second per group.
+        :param group_burst: The amount of messages a group may receive at once.
+        """
+        self._message_handler = message_handler
+        self._group_rate = group_rate
+        self._group_burst = group_burst
+        self._clock = clock
+        self._global_bucket = TokenBucket(global_rate, global_rate, clock)
+        self._group_buckets: dict[int, TokenBucket] = {}
+        self._evict_at = GROUP_BUCKETS_EVICT_AT
+
+    def _evict_full_buckets(self) -> None:
+        # A full bucket behaves like a new one, so dropping it is harmless
+        self._group_buckets = {
+            chat_id: bucket
+            for chat_id, bucket in self._group_buckets.items()
+            if not bucket.is_full()
+        }
+        self._evict_at = max(
+            GROUP_BUCKETS_EVICT_AT, 2 * len(self._group_buckets)
+        )
+
+    def _group_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._group_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._group_buckets) >= self._evict_at:
+                self._evict_full_buckets()
+            bucket = TokenBucket(
+                self._group_rate, self._group_burst, self._clock
+            )
+            self._group_buckets[chat_id] = bucket
+        return bucket
+
+    async def send(
+        self, context, chat: Recipient, message: str, *args, **kwargs
+    ) -> None:
+        """
+        Send a single message once the rate limits allow it.
+
+        Any extra arguments are passed on to the message handler, as are the
+        errors it raises.
+        """
+        if chat.chat_type in GROUP_CHAT_TYPES:
+            await self._group_bucket(chat.chat_id).acquire()
+        await self._global_bucket.acquire()
+        await self._message_handler.send_telegram_message(
+            context, chat.chat_id, message, *args, **kwargs
+        )
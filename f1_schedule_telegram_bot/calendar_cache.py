@@ -0,0 +1,147 @@
+"""The calendar_cache module contains the CalendarCache class."""
+import asyncio
+import dataclasses
+import datetime
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from f1_schedule_telegram_bot.consts import CALENDAR_CACHE_TTL
+from f1_schedule_telegram_bot.event_index import EventIndex
+from f1_schedule_telegram_bot.ical_fetcher import (
+    ICalFetcherInterface,
+    ICalFetchError,
+)
+from f1_schedule_telegram_bot.ics_parser import ICalCalendar
+from f1_schedule_telegram_bot.sessions import classify_all
+
+
+@dataclass(frozen=True)
+class CalendarSnapshot:
+    """An immutable, parsed version of the calendar shared by all jobs."""
+
+    calendar: ICalCalendar
+    index: EventIndex
+    content_hash: str
+    fetched_at: float
+
+
+@dataclass
+class CalendarCacheStats:
+    """Counters describing how the calendar cache has been used."""
+
+    # A fresh snapshot was served without fetching
+    hits: int = 0
+    # The calendar was fetched from the upstream fetcher
+    misses: int = 0
+    # A request waited on a fetch that was already in flight
+    coalesced: int = 0
+    # The upstream failed and the previous snapshot was served instead
+    stale: int = 0
+    # A fetched calendar differed from the previous snapshot
+    changes: int = 0
+
+
+def content_hash(calendar: ICalCalendar) -> str:
+    """Return a hash of the events in the calendar, independent of their order."""
+    digest = hashlib.sha256()
+    for line in sorted(
+        f"{event.uid}|{event.name}|{event.begin}|{event.end}|"
+        f"{event.status}|{event.sequence}"
+        for event in calendar.events
+    ):
+        digest.update(line.encode())
+    return digest.hexdigest()
+
+
+class CalendarCache(ICalFetcherInterface):
+    """
+    Cache the calendar retrieved by another ICalFetcherInterface.
+
+    A snapshot is reused until it is older than the ttl. Concurrent requests
+    for a new snapshot share a single upstream fetch, and when the upstream
+    fails the previous snapshot is served instead.
+    """
+
+    def __init__(
+        self,
+        fetcher: ICalFetcherInterface,
+        ttl: datetime.timedelta = CALENDAR_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        :param fetcher: The fetcher used to retrieve the calendar.
+        :param ttl: How long a snapshot is used before it is refreshed.
+        :param clock: A monotonic clock returning seconds.
+        """
+        self._fetcher = fetcher
+        self._ttl = ttl.total_seconds()
+        self._clock = clock
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._in_flight: Optional[asyncio.Task] = None
+        self.stats = CalendarCacheStats()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and self._clock() - self._snapshot.fetched_at < self._ttl
+        )
+
+    async def _refresh(self) -> CalendarSnapshot:
+        self.stats.misses += 1
+        try:
+            calendar = await self._fetcher.fetch()
+        except ICalFetchError as err:
+            if self._snapshot is None:
+                raise
+            self.stats.stale += 1
+            logging.warning("serving stale iCal, unable to refresh: %s", err)
+            return self._snapshot
+        finally:
+            self._in_flight = None
+
+        calendar_hash = content_hash(calendar)
+        if self._snapshot is not None:
+            if self._snapshot.content_hash == calendar_hash:
+                # Keep the existing snapshot, such that everything derived
+                # from it stays valid
+                self._snapshot = dataclasses.replace(
+                    self._snapshot, fetched_at=self._clock()
+                )
+                return self._snapshot
+            self.stats.changes += 1
+
+        self._snapshot = CalendarSnapshot(
+            calendar=calendar,
+            index=EventIndex(classify_all(calendar.events)),
+            content_hash=calendar_hash,
+            fetched_at=self._clock(),
+        )
+        return self._snapshot
+
+    async def snapshot(self) -> CalendarSnapshot:
+        """Return the cached snapshot, refreshing it when it has expired."""
+        if self._is_fresh():
+            self.stats.hits += 1
+            return self._snapshot  # type: ignore
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.create_task(self._refresh())
+        else:
+            self.stats.coalesced += 1
+
+        # Shield the shared fetch, such that a cancelled waiter does not
+        # cancel it for all others
+        return await asyncio.shield(self._in_flight)
+
+    async def fetch(self) -> ICalCalendar:
+        """Retrieve Formula 1 events calendar."""
+        return (await self.snapshot()).calendar
+
+    async def close(self) -> None:
+        """Close the underlying fetcher."""
+        await self._fetcher.close()
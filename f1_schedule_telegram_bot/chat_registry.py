@@ -0,0 +1,181 @@
+"""The chat_registry module contains the ChatRegistry class."""
+import array
+import bisect
+from typing import Iterator, NamedTuple, Optional
+
+from f1_schedule_telegram_bot.chat_store import ChatStoreInterface
+from f1_schedule_telegram_bot.consts import TIMEZONE
+from f1_schedule_telegram_bot.database import DatabaseChat, NoDevChatException
+
+# The chats are grouped by their timezone and chat type
+GroupKey = tuple[str, str]
+
+
+class RegisteredChat(NamedTuple):
+    """A chat that is registered to receive the notifications."""
+
+    chat_id: int
+    chat_type: str
+    timezone: str = TIMEZONE
+
+
+class ChatRegistry:
+    """
+    Keep the registered chats in memory, writing new chats through to a store.
+
+    The chats are read from the store once, on first use, and kept as
+    sorted arrays of chat ids per timezone and chat type. Broadcasting to all
+    chats therefore never queries the database, and new chats are stored in
+    both. The dev chat is kept apart, as it does not receive the
+    notifications.
+    """
+
+    def __init__(self, store: ChatStoreInterface):
+        """
+        Initialize the registry, the chats are loaded on first use.
+
+        :param store: The store the chats are kept in.
+        """
+        self._store = store
+        self._chat_ids: Optional[dict[GroupKey, array.array]] = None
+        self._dev_chat: Optional[DatabaseChat] = None
+
+    def _load(self) -> dict[GroupKey, array.array]:
+        if self._chat_ids is not None:
+            return self._chat_ids
+
+        chat_ids: dict[GroupKey, list[int]] = {}
+        for chat in self._store.read_chats():
+            key = (chat.timezone or TIMEZONE, chat.chat_type)
+            chat_ids.setdefault(key, []).append(chat.chat_id)
+        self._dev_chat = self._store.read_dev_chat()
+
+        self._chat_ids = {
+            key: array.array("q", sorted(ids)) for key, ids in chat_ids.items()
+        }
+        return self._chat_ids
+
+    def _find(self, chat_id: int) -> Optional[GroupKey]:
+        for key, ids in self._load().items():
+            index = bisect.bisect_left(ids, chat_id)
+            if index < len(ids) and ids[index] == chat_id:
+                return key
+        return None
+
+    def _add(self, key: GroupKey, chat_id: int) -> None:
+        ids = self._load().setdefault(key, array.array("q"))
+        ids.insert(bisect.bisect_left(ids, chat_id), chat_id)
+
+    def __contains__(self, chat_id: int) -> bool:
+        """Return whether the chat, or the dev chat, is registered."""
+        self._load()
+        if self._dev_chat is not None and self._dev_chat.chat_id == chat_id:
+            return True
+        return self._find(chat_id) is not None
+
+    def __len__(self) -> int:
+        """Return the amount of registered chats, except the dev chat."""
+        return sum(len(ids) for ids in self._load().values())
+
+    def recipients(self) -> Iterator[RegisteredChat]:
+        """Return all registered chats, except the dev chat."""
+        for (timezone, chat_type), ids in self._load().items():
+            for chat_id in ids:
+                yield RegisteredChat(chat_id, chat_type, timezone)
+
+    def by_timezone(self) -> Iterator[tuple[str, Iterator[RegisteredChat]]]:
+        """Return the registered chats grouped by their timezone."""
+        keys: dict[str, list[GroupKey]] = {}
+        for key, ids in self._load().items():
+            if ids:
+                keys.setdefault(key[0], []).append(key)
+
+        def chats(group: list[GroupKey]) -> Iterator[RegisteredChat]:
+            for timezone, chat_type in group:
+                for chat_id in self._load()[(timezone, chat_type)]:
+                    yield RegisteredChat(chat_id, chat_type, timezone)
+
+        for timezone, group in keys.items():
+            yield timezone, chats(group)
+
+    def timezone(self, chat_id: int) -> Optional[str]:
+        """Return the timezone of a chat, or None if it is not registered."""
+        key = self._find(chat_id)
+        return None if key is None else key[0]
+
+    def dev_chat(self) -> DatabaseChat:
+        """Return the dev chat."""
+        self._load()
+        if self._dev_chat is None:
+            raise NoDevChatException("DEV chat id does not exist in database")
+        return self._dev_chat
+
+    async def register(
+        self, chat_id: int, chat_type: str, name: str, is_dev: bool = False
+    ) -> bool:
+        """
+        Register a chat, returning whether it was not registered before.
+
+        :param chat_id: The id of the chat.
+        :param chat_type: The type of the chat, e.g. "private" or "group".
+        :param name: The username or title of the chat.
+        :param is_dev: Whether the chat is the dev chat.
+        """
+        chat_id, chat_type = int(chat_id), str(chat_type)
+        if chat_id in self:
+            return False
+
+        chat = DatabaseChat(chat_id, chat_type, name)
+        # A chat that registers again keeps the timezone it had before
+        timezone = await self._store.save_chat(chat, is_dev)
+        # The same chat may have been registered while it was saved
+        if chat_id in self:
+            return False
+
+        if is_dev:
+            self._dev_chat = chat
+        else:
+            self._add((timezone or TIMEZONE, chat_type), chat_id)
+        return True
+
+    async def set_timezone(self, chat_id: int, timezone: str) -> bool:
+        """
+        Set the timezone of a chat, returning whether the chat is registered.
+
+        :param chat_id: The id of the chat.
+        :param timezone: The canonical name of the timezone.
+        """
+        if self._find(chat_id) is None:
+            return False
+
+        await self._store.save_timezone(chat_id, timezone)
+        # The chat may have moved while the timezone was saved
+        key = self._find(chat_id)
+        if key is None:
+            return False
+
+        ids = self._load()[key]
+        del ids[bisect.bisect_left(ids, chat_id)]
+        self._add((timezone, key[1]), chat_id)
+        return True
+
+    async def deactivate(self, chat_id: int) -> bool:
+        """
+        Stop sending to a chat, returning whether it was registered.
+
+        The chat is registered again once it sends /start.
+
+        :param chat_id: The id of the chat.
+        """
+        if self._find(chat_id) is None:
+            return False
+
+        await self._store.deactivate_chat(chat_id)
+        # The chat may have moved while it was deactivated
+        key = self._find(chat_id)
+        if key is None:
+            return False
+
+        ids = self._load()[key]
+        del ids[bisect.bisect_left(ids, chat_id)]
+        return True
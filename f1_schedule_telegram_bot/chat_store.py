@@ -0,0 +1,159 @@
+"""The chat_store module contains the classes that store the chats."""
+import abc
+import sqlite3
+from typing import Optional
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+
+
+def _dev_chat(conn: sqlite3.Connection) -> Optional[DatabaseChat]:
+    try:
+        return database.get_chat_dev(conn)
+    except database.NoDevChatException:
+        return None
+
+
+class ChatStoreInterface:
+    """The ChatStoreInterface class provides an interface for the chat stores."""
+
+    @abc.abstractmethod
+    def read_chats(self) -> list[DatabaseChat]:
+        """
+        Return all chats, except the dev chat.
+
+        This blocks until the chats are read, it is meant to be called once
+        while the bot starts.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_dev_chat(self) -> Optional[DatabaseChat]:
+        """Return the dev chat, if any, blocking until it is read."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list_chats(self) -> list[DatabaseChat]:
+        """Return all chats, except the dev chat."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def save_chat(
+        self, chat: DatabaseChat, is_dev: bool = False
+    ) -> Optional[str]:
+        """
+        Insert or update a chat, returning once it is committed.
+
+        Returns the timezone the chat is stored with.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def save_timezone(self, chat_id: int, timezone: str) -> None:
+        """Set the timezone of a chat, returning once it is committed."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def deactivate_chat(self, chat_id: int) -> None:
+        """Stop listing a chat until it is saved again, once committed."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class ConnectionChatStore(ChatStoreInterface):
+    """
+    Store the chats using a connection on the calling thread.
+
+    Every call blocks until the database is done, which is only suitable for
+    small databases, such as the in-memory databases of the tests.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the store, migrating the database if needed.
+
+        :param conn: The database connection the chats are stored in.
+        """
+        self._conn = conn
+        database.migrate(conn)
+
+    def read_chats(self) -> list[DatabaseChat]:
+        """Return all chats, except the dev chat."""
+        return database.list_chats(self._conn)
+
+    def read_dev_chat(self) -> Optional[DatabaseChat]:
+        """Return the dev chat, if any."""
+        return _dev_chat(self._conn)
+
+    async def list_chats(self) -> list[DatabaseChat]:
+        """Return all chats, except the dev chat."""
+        return database.list_chats(self._conn)
+
+    async def save_chat(
+        self, chat: DatabaseChat, is_dev: bool = False
+    ) -> Optional[str]:
+        """Insert or update a chat and commit it, returning its timezone."""
+        timezone = database.save_chat(self._conn, chat, is_dev)
+        self._conn.commit()
+        return timezone
+
+    async def save_timezone(self, chat_id: int, timezone: str) -> None:
+        """Set the timezone of a chat and commit it."""
+        database.save_timezone(self._conn, chat_id, timezone)
+        self._conn.commit()
+
+    async def deactivate_chat(self, chat_id: int) -> None:
+        """Deactivate a chat and commit it."""
+        database.deactivate_chat(self._conn, chat_id)
+        self._conn.commit()
+
+
+class SQLiteChatStore(ChatStoreInterface):
+    """Store the chats in SQLite, keeping the database off the event loop."""
+
+    def __init__(self, writer: DatabaseWriter):
+        """
+        Initialize the store.
+
+        :param writer: The writer running the queries on the database.
+        """
+        self._writer = writer
+
+    def read_chats(self) -> list[DatabaseChat]:
+        """Return all chats, except the dev chat."""
+        return self._writer.read_now(database.list_chats)
+
+    def read_dev_chat(self) -> Optional[DatabaseChat]:
+        """Return the dev chat, if any."""
+        return self._writer.read_now(_dev_chat)
+
+    async def list_chats(self) -> list[DatabaseChat]:
+        """Return all chats, except the dev chat."""
+        return await self._writer.read(database.list_chats)
+
+    async def save_chat(
+        self, chat: DatabaseChat, is_dev: bool = False
+    ) -> Optional[str]:
+        """Insert or update a chat, returning its timezone once committed."""
+        return await self._writer.write(
+            lambda conn: database.save_chat(conn, chat, is_dev)
+        )
+
+    async def save_timezone(self, chat_id: int, timezone: str) -> None:
+        """Set the timezone of a chat, returning once it is committed."""
+        await self._writer.write(
+            lambda conn: database.save_timezone(conn, chat_id, timezone)
+        )
+
+    async def deactivate_chat(self, chat_id: int) -> None:
+        """Deactivate a chat, returning once it is committed."""
+        await self._writer.write(
+            lambda conn: database.deactivate_chat(conn, chat_id)
+        )
+
+    async def close(self) -> None:
+        """Commit the queued writes and close the database."""
+        await self._writer.close()
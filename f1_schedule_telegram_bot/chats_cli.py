@@ -0,0 +1,116 @@
+"""
+Import and export the registered chats as CSV.
+
+The chats are written and read as rows of chat_id, type, name and timezone,
+with a header row. The timezone is empty for chats in the default timezone,
+and files without the timezone column are read as well. A row without a
+type or name, or with an unknown timezone, is rejected along with its line
+number, and the whole file is read before the first chat is imported, so a
+file with an invalid row imports nothing. The dev chat is
+never exported, it is registered from the CHAT_ID_DEV environment variable,
+and neither are the chats that were deactivated because they blocked the bot.
+Imported chats are committed in batched transactions, and chats that are
+already registered are updated. A running bot only broadcasts to the
+imported chats after it is restarted.
+
+    poetry run chats export chats.csv
+    poetry run chats import chats.csv
+"""
+import argparse
+import contextlib
+import csv
+import logging
+import sys
+from typing import ContextManager, Iterator, Optional, Sequence, TextIO
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.consts import DATABASE_PATH, IMPORT_BATCH_SIZE
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.timezones import resolve_timezone
+
+HEADER = ("chat_id", "type", "name", "timezone")
+
+
+def write_chats(conn, output: TextIO) -> int:
+    """Write all chats, except the dev chat, returning the amount written."""
+    writer = csv.writer(output)
+    writer.writerow(HEADER)
+    written = 0
+    for chat in database.iter_chats(conn):
+        writer.writerow(chat)
+        written += 1
+    return written
+
+
+def read_chats(source: TextIO) -> Iterator[DatabaseChat]:
+    """Yield the chats of a CSV file written by write_chats."""
+    reader = csv.reader(source)
+    header = tuple(next(reader, HEADER))
+    if header not in (HEADER, HEADER[:3]):
+        raise ValueError(f"Expected the header {','.join(HEADER)}")
+    for line, row in enumerate(reader, start=2):
+        if len(row) != len(header) or not row[0].lstrip("-").isdigit():
+            raise ValueError(f"Invalid chat on line {line}")
+        if not row[1] or not row[2]:
+            raise ValueError(f"Missing type or name on line {line}")
+        timezone = None
+        if len(row) > 3 and row[3]:
+            # An unknown timezone would fail every weekend calendar broadcast
+            timezone = resolve_timezone(row[3])
+            if timezone is None:
+                raise ValueError(f"Unknown timezone {row[3]} on line {line}")
+        yield DatabaseChat(int(row[0]), row[1], row[2], timezone)
+
+
+def _open(path: str, mode: str) -> ContextManager[TextIO]:
+    if path == "-":
+        # The standard streams are not closed along with the file
+        return contextlib.nullcontext(sys.stdout if mode == "w" else sys.stdin)
+    # pylint: disable=consider-using-with
+    return open(path, mode, encoding="UTF-8", newline="")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the import or export command."""
+    parser = argparse.ArgumentParser(
+        description="Import and export the registered chats as CSV."
+    )
+    parser.add_argument(
+        "--database", default=DATABASE_PATH, help="The database file."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser(
+        "export", help="Write all chats, except the dev chat."
+    )
+    export_parser.add_argument("file", help="The CSV file, or - for stdout.")
+    import_parser = commands.add_parser(
+        "import", help="Insert or update the chats of a CSV file."
+    )
+    import_parser.add_argument("file", help="The CSV file, or - for stdin.")
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help="The amount of chats committed per transaction.",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    conn = database.connect(args.database)
+    try:
+        if args.command == "export":
+            with _open(args.file, "w") as output:
+                amount = write_chats(conn, output)
+            logging.info("Exported %d chats", amount)
+        else:
+            # Every row is validated before any chat is imported
+            with _open(args.file, "r") as source:
+                chats = list(read_chats(source))
+            amount = database.import_chats(conn, chats, args.batch_size)
+            logging.info("Imported %d chats", amount)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
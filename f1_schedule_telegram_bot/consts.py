@@ -2,8 +2,73 @@
 import datetime
 
 CHECK_INTERVAL = datetime.timedelta(minutes=60)
+# Shorter than the check interval, so every sync retrieves a fresh calendar
+CALENDAR_CACHE_TTL = datetime.timedelta(minutes=30)
 DEV_CHAT_NAME = "DEV"
+# Notifications are sent this long before an event begins
+NOTIFICATION_OFFSETS = (
+    datetime.timedelta(minutes=60),
+    datetime.timedelta(minutes=5),
+)
 
 ICAL_URL = "https://files-f1.motorsportcalendars.com/f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics"
 
 TIMEZONE = "Europe/Amsterdam"
+
+# Telegram allows bots roughly 30 messages per second in total and 20 messages
+# per minute to the same group, see https://core.telegram.org/bots/faq
+BROADCAST_CONCURRENCY = 20
+GLOBAL_RATE_LIMIT = 30
+GROUP_RATE_LIMIT = 20 / 60
+GROUP_BURST_LIMIT = 20
+# The amount of group rate limiters kept before the idle ones are dropped
+GROUP_BUCKETS_EVICT_AT = 1_000
+
+# The amount of rendered standings images kept in memory
+STANDINGS_CACHE_SIZE = 8
+
+# The maximum time in seconds to wait for a single Ergast API call
+ERGAST_TIMEOUT = 10
+
+# The amount of worker processes rendering the standings images
+RENDER_WORKERS = 2
+
+# The standings images are encoded as PNG or WEBP, with a palette of this
+# amount of colours, or None to keep all colours
+STANDINGS_IMAGE_FORMAT = "PNG"
+STANDINGS_IMAGE_COLORS = 16
+
+# The amount of chats read from the database at once
+CHAT_BATCH_SIZE = 1000
+
+# The maximum amount of queued database writes committed in one transaction
+WRITE_BATCH_SIZE = 500
+
+# The amount of chats committed in one transaction by a bulk import
+IMPORT_BATCH_SIZE = 10_000
+
+DATABASE_PATH = "./data/f1.db"
+
+# The address and port the webhook server listens on, when the bot runs with
+# a webhook instead of polling
+WEBHOOK_LISTEN = "0.0.0.0"
+WEBHOOK_PORT = 8443
+
+# The amount of updates that are handled at the same time
+CONCURRENT_UPDATES = 16
+
+# How often the outbox is checked for messages that are due to be retried
+OUTBOX_INTERVAL = datetime.timedelta(seconds=5)
+# The amount of outbox messages delivered at once
+OUTBOX_BATCH_SIZE = 500
+# A message is retried after 2, 4, 8 and 16 seconds, up to 5 minutes, until
+# it failed this many times
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 2
+OUTBOX_MAX_RETRY_DELAY = 300
+# Messages that are delivered this much later than the backlog ahead of them
+# allows at GLOBAL_RATE_LIMIT are no longer sent, as the notifications would
+# be outdated
+OUTBOX_MAX_AGE = datetime.timedelta(hours=1)
+# The failed messages are kept this long for inspection, then deleted
+OUTBOX_RETENTION = datetime.timedelta(days=7)
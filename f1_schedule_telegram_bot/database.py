@@ -1,45 +1,224 @@
 """The database module contains functions for interacting with the database."""
+import datetime
+import itertools
+import logging
 import sqlite3
-from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
 
-from f1_schedule_telegram_bot.consts import DEV_CHAT_NAME
+from f1_schedule_telegram_bot.consts import (
+    CHAT_BATCH_SIZE,
+    DEV_CHAT_NAME,
+    IMPORT_BATCH_SIZE,
+)
+from f1_schedule_telegram_bot.sessions import Session, SessionKind
 
 
-@dataclass
-class DatabaseChat:
+class DatabaseChat(NamedTuple):
     """A class representing a chat row in the database table chats."""
 
-    def __init__(self, chat_id: int, chat_type: str, name: str):
-        """Initialize the DatabaseChat object."""
-        self.chat_id = chat_id
-        self.chat_type = chat_type
-        self.name = name
-
-    def __repr__(self):
-        """Return a string representation of the DatabaseChat object."""
-        return f"DatabaseChat(chat_id={self.chat_id}, type={self.chat_type}, name={self.name})"
+    chat_id: int
+    chat_type: str
+    name: str
+    # The timezone the times are shown in, None for the default timezone
+    timezone: Optional[str] = None
 
 
 class NoDevChatException(Exception):
     """Raised when the dev chat is not found in the database."""
 
 
-# Retrieves all non-dev chats from the database
-def list_chats(conn: sqlite3.Connection) -> list[DatabaseChat]:
-    """Return a list of all chats in the database, except the dev chat."""
-    cur = conn.cursor()
-    res = cur.execute(
-        "SELECT chat_id, type, name FROM chats WHERE name!=:name",
-        {"name": DEV_CHAT_NAME},
+# Every migration upgrades the schema by one version, the version of the
+# database is kept in its user_version pragma
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    (
+        """
+        CREATE TABLE IF NOT EXISTS chats (
+            chat_id INTEGER PRIMARY KEY,
+            type TEXT NOT NULL CHECK (type <> ''),
+            name TEXT NOT NULL CHECK (name <> '')
+        )
+        """,
+    ),
+    (
+        """
+        ALTER TABLE chats
+        ADD COLUMN is_dev INTEGER NOT NULL DEFAULT 0 CHECK (is_dev IN (0, 1))
+        """,
+        "UPDATE chats SET is_dev = 1 WHERE name = :dev_chat_name",
+        # There is at most one dev chat, which is found through this index
+        "CREATE UNIQUE INDEX chats_dev ON chats (is_dev) WHERE is_dev",
+    ),
+    ("ALTER TABLE chats ADD COLUMN timezone TEXT CHECK (timezone <> '')",),
+    (
+        # The pending notifications, with the session they notify about
+        """
+        CREATE TABLE notifications (
+            uid TEXT NOT NULL,
+            due REAL NOT NULL,
+            name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            label TEXT NOT NULL,
+            grand_prix TEXT NOT NULL,
+            begins REAL NOT NULL,
+            ends REAL NOT NULL,
+            sequence TEXT,
+            PRIMARY KEY (uid, due)
+        )
+        """,
+    ),
+    (
+        # Chats the bot can no longer send to are kept, but skipped
+        "ALTER TABLE chats ADD COLUMN active INTEGER NOT NULL DEFAULT TRUE",
+        # The messages that are yet to be delivered, and those that failed
+        """
+        CREATE TABLE outbox (
+            id INTEGER PRIMARY KEY,
+            chat_id INTEGER NOT NULL,
+            chat_type TEXT NOT NULL,
+            text TEXT NOT NULL,
+            parse_mode TEXT,
+            state TEXT NOT NULL DEFAULT 'pending'
+                CHECK (state IN ('pending', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created REAL NOT NULL,
+            next_attempt REAL NOT NULL,
+            expires REAL NOT NULL,
+            error TEXT
+        )
+        """,
+        "CREATE INDEX outbox_due ON outbox (state, next_attempt)",
+    ),
+)
+
+# Tuned for a single writer: the write-ahead log lets readers continue while
+# a transaction commits, and in that mode NORMAL synchronization is safe
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+)
+
+SAVE_CHAT = """
+    INSERT INTO chats (chat_id, type, name, timezone, is_dev)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (chat_id) DO UPDATE
+    SET type=excluded.type, name=excluded.name,
+        timezone=coalesce(excluded.timezone, timezone),
+        is_dev=is_dev OR excluded.is_dev, active=TRUE
+"""
+
+
+# Upgrades the schema of the database to the latest version
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply the migrations the database is missing, returning its version."""
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    for number, statements in enumerate(
+        MIGRATIONS[version:], start=version + 1
+    ):
+        # A savepoint, unlike BEGIN, also works within an open transaction
+        conn.execute("SAVEPOINT migrate")
+        try:
+            for statement in statements:
+                conn.execute(statement, {"dev_chat_name": DEV_CHAT_NAME})
+            conn.execute(f"PRAGMA user_version = {number}")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO migrate")
+            conn.execute("RELEASE migrate")
+            raise
+        conn.execute("RELEASE migrate")
+        logging.info("Migrated the database to version %d", number)
+    return max(version, len(MIGRATIONS))
+
+
+# Opens the database with the pragmas of the bot and the latest schema
+def connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open and migrate the database at the given path."""
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    migrate(conn)
+    conn.commit()
+    return conn
+
+
+# Inserts a chat, or updates the type and name of a registered chat
+def save_chat(
+    conn: sqlite3.Connection, chat: DatabaseChat, is_dev: bool = False
+) -> Optional[str]:
+    """
+    Insert or update a chat, without committing the transaction.
+
+    Returns the timezone the chat is stored with, which an update keeps
+    unless the chat has a timezone of its own.
+    """
+    (timezone,) = conn.execute(
+        f"{SAVE_CHAT} RETURNING timezone", (*chat, is_dev)
+    ).fetchone()
+    return timezone
+
+
+# Sets the timezone of a chat
+def save_timezone(
+    conn: sqlite3.Connection, chat_id: int, timezone: str
+) -> None:
+    """Set the timezone of a chat, without committing the transaction."""
+    conn.execute(
+        "UPDATE chats SET timezone=:timezone WHERE chat_id=:chat_id",
+        {"timezone": timezone, "chat_id": chat_id},
     )
-    rows = res.fetchall()
-    cur.close()
-    return list(
-        map(
-            lambda row: DatabaseChat(chat_id=row[0], chat_type=row[1], name=row[2]),
-            rows,
+
+
+# Inserts or updates many chats, committing them in batches
+def import_chats(
+    conn: sqlite3.Connection,
+    chats: Iterable[DatabaseChat],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> int:
+    """Insert or update the chats, returning the amount of imported chats."""
+    chats = iter(chats)
+    imported = 0
+    while batch := list(itertools.islice(chats, batch_size)):
+        with conn:
+            conn.executemany(SAVE_CHAT, ((*chat, False) for chat in batch))
+        imported += len(batch)
+    return imported
+
+
+# Streams all active non-dev chats from the database
+def iter_chats(
+    conn: sqlite3.Connection, batch_size: int = CHAT_BATCH_SIZE
+) -> Iterator[DatabaseChat]:
+    """
+    Yield all chats in the database, except the dev chat, in batches.
+
+    The chats that were deactivated are skipped, until they are saved again.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT chat_id, type, name, timezone FROM chats "
+            "WHERE NOT is_dev AND active"
         )
+        while rows := cur.fetchmany(batch_size):
+            yield from map(DatabaseChat._make, rows)
+    finally:
+        cur.close()
+
+
+# Retrieves all active non-dev chats from the database
+def list_chats(conn: sqlite3.Connection) -> list[DatabaseChat]:
+    """Return a list of all chats in the database, except the dev chat."""
+    return list(iter_chats(conn))
+
+
+# Stops sending to a chat, until it is saved again
+def deactivate_chat(conn: sqlite3.Connection, chat_id: int) -> None:
+    """Deactivate a chat, without committing the transaction."""
+    conn.execute(
+        "UPDATE chats SET active=FALSE WHERE chat_id=:chat_id",
+        {"chat_id": chat_id},
     )
 
 
@@ -47,15 +226,14 @@ def list_chats(conn: sqlite3.Connection) -> list[DatabaseChat]:
 def get_chat_dev(conn: sqlite3.Connection) -> DatabaseChat:
     """Return the dev chat from the database."""
     cur = conn.cursor()
-    res = cur.execute(
-        "SELECT chat_id, type, name FROM chats WHERE name=:name",
-        {"name": DEV_CHAT_NAME},
-    )
+    res = cur.execute("SELECT chat_id, type, name FROM chats WHERE is_dev")
     rows = res.fetchall()
     if len(rows) == 0:
         raise NoDevChatException("DEV chat id does not exist in database")
 
-    return DatabaseChat(chat_id=rows[0][0], chat_type=rows[0][1], name=rows[0][2])
+    return DatabaseChat(
+        chat_id=rows[0][0], chat_type=rows[0][1], name=rows[0][2]
+    )
 
 
 # Retrieves the dev chat from the database
@@ -63,11 +241,238 @@ def get_chat(conn: sqlite3.Connection, chat_id: int) -> Optional[DatabaseChat]:
     """Return the chat with the given chat_id from the database."""
     cur = conn.cursor()
     res = cur.execute(
-        "SELECT chat_id, type, name FROM chats WHERE chat_id=:chat_id",
+        "SELECT chat_id, type, name, timezone FROM chats "
+        "WHERE chat_id=:chat_id",
         {"chat_id": chat_id},
     )
     rows = res.fetchall()
     if len(rows) == 0:
         return None
 
-    return DatabaseChat(chat_id=rows[0][0], chat_type=rows[0][1], name=rows[0][2])
+    return DatabaseChat._make(rows[0])
+
+
+class PendingNotification(NamedTuple):
+    """A notification about a session that is yet to be sent."""
+
+    session: Session
+    # The time the notification is sent, as a UNIX timestamp
+    due: float
+
+
+# Retrieves all pending notifications, in the order they are due
+def list_notifications(conn: sqlite3.Connection) -> list[PendingNotification]:
+    """Return all notifications that are yet to be sent."""
+    rows = conn.execute(
+        """
+        SELECT uid, name, kind, label, grand_prix, begins, ends, sequence, due
+        FROM notifications ORDER BY due
+        """
+    ).fetchall()
+    utc = datetime.timezone.utc
+    return [
+        PendingNotification(
+            Session(
+                uid=row[0],
+                name=row[1],
+                kind=SessionKind(row[2]),
+                label=row[3],
+                grand_prix=row[4],
+                begin=datetime.datetime.fromtimestamp(row[5], utc),
+                end=datetime.datetime.fromtimestamp(row[6], utc),
+                sequence=row[7],
+                canceled=False,
+            ),
+            due=row[8],
+        )
+        for row in rows
+    ]
+
+
+# Replaces all pending notifications
+def replace_notifications(
+    conn: sqlite3.Connection, notifications: Iterable[PendingNotification]
+) -> None:
+    """Replace the pending notifications, without committing."""
+    conn.execute("DELETE FROM notifications")
+    conn.executemany(
+        "INSERT INTO notifications VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                session.uid,
+                due,
+                session.name,
+                session.kind.value,
+                session.label,
+                session.grand_prix,
+                session.begin.timestamp(),
+                session.end.timestamp(),
+                session.sequence,
+            )
+            for session, due in notifications
+        ),
+    )
+
+
+# Removes the notifications of a session that are due by the given time
+def remove_notifications(
+    conn: sqlite3.Connection, uid: str, due: float
+) -> None:
+    """Remove the sent notifications, without committing the transaction."""
+    conn.execute(
+        "DELETE FROM notifications WHERE uid=:uid AND due<=:due",
+        {"uid": uid, "due": due},
+    )
+
+
+class OutboxMessage(NamedTuple):
+    """A message in the outbox, waiting to be delivered."""
+
+    message_id: int
+    chat_id: int
+    chat_type: str
+    text: str
+    parse_mode: Optional[str]
+    # The amount of failed attempts to deliver the message
+    attempts: int
+
+
+class OutboxCounts(NamedTuple):
+    """The amount of messages in the outbox, per state."""
+
+    # Pending messages that are due to be delivered
+    due: int
+    # Pending messages that wait for their next attempt
+    waiting: int
+    failed: int
+
+
+# Adds messages to the outbox, due to be delivered at once
+def enqueue_messages(
+    conn: sqlite3.Connection,
+    messages: Iterable[tuple[int, str, str, Optional[str], float]],
+    now: float,
+) -> int:
+    """
+    Add the messages to the outbox, without committing the transaction.
+
+    :param messages: The chat id, chat type, text, parse mode and expiry time
+        of each message.
+    :param now: The current time, as a UNIX timestamp.
+    """
+    cur = conn.executemany(
+        """
+        INSERT INTO outbox (
+            chat_id, chat_type, text, parse_mode, expires, created,
+            next_attempt
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        ((*message, now, now) for message in messages),
+    )
+    return cur.rowcount
+
+
+# Retrieves the pending messages that are due, the oldest first
+def due_messages(
+    conn: sqlite3.Connection, now: float, limit: int
+) -> list[OutboxMessage]:
+    """Return at most limit pending messages that are due at now."""
+    rows = conn.execute(
+        """
+        SELECT id, chat_id, chat_type, text, parse_mode, attempts FROM outbox
+        WHERE state = 'pending' AND next_attempt <= :now
+        ORDER BY next_attempt, id LIMIT :limit
+        """,
+        {"now": now, "limit": limit},
+    ).fetchall()
+    return [OutboxMessage._make(row) for row in rows]
+
+
+# Records the outcome of delivering messages from the outbox
+def record_deliveries(
+    conn: sqlite3.Connection,
+    delivered: Iterable[int],
+    retried: Iterable[tuple[int, float, str]],
+    failed: Iterable[tuple[int, str]],
+    postponed: Iterable[tuple[int, float]] = (),
+) -> None:
+    """
+    Update the outbox after a delivery, without committing the transaction.
+
+    The delivered messages are removed, the retried messages are due again
+    at their next attempt, and the failed messages are kept as failed. The
+    postponed messages are due again later as well, but without counting
+    an attempt, as they were not sent.
+
+    :param delivered: The ids of the delivered messages.
+    :param retried: The id, next attempt and error of each retried message.
+    :param failed: The id and error of each failed message.
+    :param postponed: The id and next attempt of each postponed message.
+    """
+    conn.executemany(
+        "DELETE FROM outbox WHERE id = ?",
+        ((message_id,) for message_id in delivered),
+    )
+    conn.executemany(
+        """
+        UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, error = ?
+        WHERE id = ?
+        """,
+        (
+            (next_attempt, error, message_id)
+            for message_id, next_attempt, error in retried
+        ),
+    )
+    conn.executemany(
+        """
+        UPDATE outbox SET state = 'failed', attempts = attempts + 1, error = ?
+        WHERE id = ?
+        """,
+        ((error, message_id) for message_id, error in failed),
+    )
+    conn.executemany(
+        "UPDATE outbox SET next_attempt = ? WHERE id = ?",
+        ((next_attempt, message_id) for message_id, next_attempt in postponed),
+    )
+
+
+# Gives up on the pending messages that expired before the given time
+def expire_messages(conn: sqlite3.Connection, now: float) -> int:
+    """Fail the messages that expired before now, without committing."""
+    return conn.execute(
+        """
+        UPDATE outbox SET state = 'failed', error = 'expired'
+        WHERE state = 'pending' AND expires < :now
+        """,
+        {"now": now},
+    ).rowcount
+
+
+# Deletes the failed messages that were created before the given time
+def prune_messages(conn: sqlite3.Connection, before: float) -> int:
+    """Delete the failed messages created before, without committing."""
+    return conn.execute(
+        "DELETE FROM outbox WHERE state = 'failed' AND created < :before",
+        {"before": before},
+    ).rowcount
+
+
+# Counts the messages in the outbox per state
+def count_outbox(conn: sqlite3.Connection, now: float) -> OutboxCounts:
+    """Return the amount of due, waiting and failed messages."""
+    row = conn.execute(
+        """
+        SELECT
+            count(*) FILTER (
+                WHERE state = 'pending' AND next_attempt <= :now
+            ),
+            count(*) FILTER (
+                WHERE state = 'pending' AND next_attempt > :now
+            ),
+            count(*) FILTER (WHERE state = 'failed')
+        FROM outbox
+        """,
+        {"now": now},
+    ).fetchone()
+    return OutboxCounts._make(row)
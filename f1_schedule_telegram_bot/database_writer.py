@@ -0,0 +1,168 @@
+"""The database_writer module contains the DatabaseWriter class."""
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Callable, NamedTuple, Optional, TypeVar
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.consts import WRITE_BATCH_SIZE
+
+Result = TypeVar("Result")
+
+
+@dataclass
+class WriterStats:
+    """The amount of writes and the transactions they were committed in."""
+
+    writes: int = 0
+    commits: int = 0
+
+
+class _Operation(NamedTuple):
+    call: Callable[[sqlite3.Connection], object]
+    future: concurrent.futures.Future
+    write: bool
+
+
+class DatabaseWriter:
+    """
+    Run the queries on the database off the event loop.
+
+    A dedicated thread owns the connection and runs all queries in the order
+    they were submitted. The writes queued while a transaction commits are
+    committed together in the next transaction, so a burst of writes costs a
+    few commits instead of one per write. Every write runs in a savepoint,
+    so a write that fails leaves no changes behind in the transaction. The
+    stores share a single writer.
+    """
+
+    def __init__(self, path: str, batch_size: int = WRITE_BATCH_SIZE):
+        """
+        Open the database, migrating it if needed.
+
+        :param path: The path of the database file.
+        :param batch_size: The maximum amount of writes per transaction.
+        """
+        # The connection is only used by the thread after it is opened
+        self._conn = database.connect(path, check_same_thread=False)
+
+        self._batch_size = batch_size
+        self._queue: queue.SimpleQueue[
+            Optional[_Operation]
+        ] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="database-writer", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+        self.stats = WriterStats()
+
+    def _submit(
+        self, call: Callable[[sqlite3.Connection], Result], write: bool
+    ) -> "concurrent.futures.Future[Result]":
+        if self._closed:
+            raise RuntimeError("The database writer is closed")
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put(_Operation(call, future, write))
+        return future
+
+    def _next_batch(self) -> tuple[list[_Operation], bool]:
+        operation = self._queue.get()
+        if operation is None:
+            return [], True
+        batch = [operation]
+        while len(batch) < self._batch_size:
+            try:
+                operation = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if operation is None:
+                return batch, True
+            batch.append(operation)
+        return batch, False
+
+    def _call(self, operation: _Operation) -> object:
+        if not operation.write:
+            return operation.call(self._conn)
+        # Every write runs in a savepoint within the transaction of the
+        # batch, such that a write that fails halfway leaves no changes
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._conn.execute("SAVEPOINT operation")
+        try:
+            result = operation.call(self._conn)
+        except BaseException:
+            self._conn.execute("ROLLBACK TO operation")
+            raise
+        finally:
+            self._conn.execute("RELEASE operation")
+        return result
+
+    def _execute(self, batch: list[_Operation]) -> None:
+        results: list[tuple[concurrent.futures.Future, object, bool]] = []
+        writes = []
+        for operation in batch:
+            try:
+                result = self._call(operation)
+            except Exception as err:  # pylint: disable=broad-except
+                operation.future.set_exception(err)
+                continue
+            results.append((operation.future, result, operation.write))
+            if operation.write:
+                writes.append(operation.future)
+
+        if writes:
+            try:
+                self._conn.commit()
+            except sqlite3.Error as err:
+                logging.error(
+                    "Unable to commit %d writes: %s", len(writes), err
+                )
+                self._conn.rollback()
+                for future, _, write in results:
+                    if write:
+                        future.set_exception(err)
+                results = [result for result in results if not result[2]]
+            else:
+                self.stats.writes += len(writes)
+                self.stats.commits += 1
+        elif self._conn.in_transaction:
+            # All writes failed, end the transaction they began
+            self._conn.rollback()
+
+        for future, result, _ in results:
+            future.set_result(result)
+
+    def _run(self) -> None:
+        closed = False
+        while not closed:
+            batch, closed = self._next_batch()
+            self._execute(batch)
+        self._conn.close()
+
+    def read_now(self, call: Callable[[sqlite3.Connection], Result]) -> Result:
+        """Run a query on the thread, blocking until it returns its result."""
+        return self._submit(call, write=False).result()
+
+    async def read(
+        self, call: Callable[[sqlite3.Connection], Result]
+    ) -> Result:
+        """Run a query on the thread, returning its result."""
+        return await asyncio.wrap_future(self._submit(call, write=False))
+
+    async def write(
+        self, call: Callable[[sqlite3.Connection], Result]
+    ) -> Result:
+        """Run a write on the thread, returning its result once committed."""
+        return await asyncio.wrap_future(self._submit(call, write=True))
+
+    async def close(self) -> None:
+        """Commit the queued writes and close the database."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            await asyncio.to_thread(self._thread.join)
@@ -0,0 +1,165 @@
+"""
+Draw a titled line chart and render it to an image.
+
+The `draw_chart` module draws a line for every series of a matrix, with a
+column per point on the x axis, and a legend listing every series with its
+last value. It shares the font and colours of the `draw_table` module.
+"""
+import math
+from typing import Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw  # type: ignore
+
+from f1_schedule_telegram_bot.draw_table import (
+    BACKGROUND,
+    HEADER_FILL,
+    PADDING,
+    TEXT_FILL,
+    TITLE_FILL,
+    load_font,
+)
+from f1_schedule_telegram_bot.image_encoding import (
+    EncodedImage,
+    EncodingOptions,
+    encode_image,
+)
+
+PLOT_WIDTH = 600
+PLOT_HEIGHT = 360
+GRID_FILL = (210, 210, 210)
+LINE_WIDTH = 2
+# Distinct colours for the series, the chart shows at most this many series
+SERIES_FILLS = (
+    (30, 65, 255),
+    (230, 0, 45),
+    (0, 160, 120),
+    (255, 135, 0),
+    (110, 30, 180),
+    (0, 150, 220),
+    (190, 150, 0),
+    (240, 80, 170),
+    (100, 100, 100),
+    (0, 90, 40),
+)
+GRID_LINES = 5
+
+
+def _grid_step(maximum: float) -> float:
+    """Return a round step between the horizontal grid lines."""
+    if maximum <= 0:
+        return 1
+    raw_step = maximum / GRID_LINES
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    for factor in (1, 2, 5, 10):
+        if raw_step <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def draw_chart(
+    title: str,
+    names: Sequence[str],
+    values: np.ndarray,
+    encoding: EncodingOptions = EncodingOptions(),
+) -> EncodedImage:
+    """
+    Draw a line chart below a title; returns the encoded canvas.
+
+    :param title: The title drawn above the chart.
+    :param names: The names of the series, in the order of the rows.
+    :param values: The values to draw, with a row per series and a column per
+        point on the x axis.
+    :param encoding: How to encode the rendered canvas.
+    """
+    font = load_font()
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+
+    names = names[: len(SERIES_FILLS)]
+    values = values[: len(SERIES_FILLS)]
+    points = values.shape[1]
+    step = _grid_step(float(values.max(initial=0)))
+    maximum = step * max(1, math.ceil(values.max(initial=0) / step))
+
+    labels = [f"{value:g}" for value in np.arange(0, maximum + step, step)]
+    label_width = max(font.getlength(label) for label in labels)
+    legend = [f"{name}  {values[row, -1]:g}" for row, name in enumerate(names)]
+    legend_width = max(
+        (font.getlength(text) for text in legend), default=0
+    ) + (line_height + PADDING)
+
+    plot_left = PADDING + label_width + PADDING
+    plot_top = PADDING + line_height + 2 * PADDING
+    plot_right = plot_left + PLOT_WIDTH
+    plot_bottom = plot_top + PLOT_HEIGHT
+
+    width = round(
+        max(
+            plot_right + 2 * PADDING + legend_width,
+            PADDING + font.getlength(title),
+        )
+        + PADDING
+    )
+    height = plot_bottom + PADDING + line_height + PADDING
+
+    img = Image.new("RGB", (width, height), BACKGROUND)
+    drawing = ImageDraw.Draw(img)
+    drawing.text((PADDING, PADDING), title, font=font, fill=TITLE_FILL)
+
+    def x_of(column):
+        if points == 1:
+            return plot_left
+        return plot_left + column * PLOT_WIDTH / (points - 1)
+
+    def y_of(value):
+        return plot_bottom - value * PLOT_HEIGHT / maximum
+
+    # The horizontal grid lines, labelled with their value
+    for index, label in enumerate(labels):
+        y = y_of(index * step)
+        drawing.line((plot_left, y, plot_right, y), fill=GRID_FILL)
+        drawing.text(
+            (plot_left - PADDING - font.getlength(label), y - line_height / 2),
+            label,
+            font=font,
+            fill=HEADER_FILL,
+        )
+
+    # The x axis, labelled with the round numbers
+    for column in range(points):
+        label = f"{column + 1}"
+        drawing.text(
+            (x_of(column) - font.getlength(label) / 2, plot_bottom + PADDING),
+            label,
+            font=font,
+            fill=HEADER_FILL,
+        )
+
+    # Draw the leading series last, such that they are on top
+    for row in reversed(range(len(names))):
+        xy = [
+            (x_of(column), y_of(value))
+            for column, value in enumerate(values[row])
+        ]
+        fill = SERIES_FILLS[row]
+        if len(xy) > 1:
+            drawing.line(xy, fill=fill, width=LINE_WIDTH, joint="curve")
+        else:
+            drawing.point(xy, fill=fill)
+
+    legend_left = plot_right + 2 * PADDING
+    for row, text in enumerate(legend):
+        y = plot_top + row * (line_height + PADDING)
+        drawing.rectangle(
+            (legend_left, y, legend_left + line_height, y + line_height),
+            fill=SERIES_FILLS[row],
+        )
+        drawing.text(
+            (legend_left + line_height + PADDING, y),
+            text,
+            font=font,
+            fill=TEXT_FILL,
+        )
+
+    return encode_image(img, encoding)
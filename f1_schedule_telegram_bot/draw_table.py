@@ -0,0 +1,98 @@
+"""
+Draw a titled table and render it to an image.
+
+The `draw_table` module lays out a table from a list of columns, sizing the
+canvas and every column from the measured extents of the text, rather than
+from an estimated character width. Fonts are loaded once per process.
+"""
+import functools
+import pathlib
+from dataclasses import dataclass
+from typing import Callable, Generic, Sequence, TypeVar
+
+from PIL import Image, ImageDraw, ImageFont  # type: ignore
+
+from f1_schedule_telegram_bot.image_encoding import (
+    EncodedImage,
+    EncodingOptions,
+    encode_image,
+)
+
+FONT_PATH = (
+    pathlib.Path(__file__).resolve().parent.parent
+    / "font"
+    / "Rubik-Regular.ttf"
+)
+FONT_SIZE = 14
+
+PADDING = 10
+BACKGROUND = (240, 240, 240)
+TITLE_FILL = (188, 0, 3)
+HEADER_FILL = (120, 110, 110)
+TEXT_FILL = (0, 0, 0)
+
+Row = TypeVar("Row")
+
+
+@dataclass(frozen=True)
+class Column(Generic[Row]):
+    """A column of a table, with the text shown for every row."""
+
+    header: str
+    text: Callable[[Row], str]
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size: int = FONT_SIZE) -> ImageFont.FreeTypeFont:
+    """Load the font of the given size, once per process."""
+    return ImageFont.truetype(str(FONT_PATH), size)
+
+
+def draw_table(
+    title: str,
+    columns: Sequence[Column[Row]],
+    rows: Sequence[Row],
+    encoding: EncodingOptions = EncodingOptions(),
+) -> EncodedImage:
+    """
+    Draw a table below a title; returns the encoded canvas.
+
+    :param title: The title drawn above the table.
+    :param columns: The columns of the table, from left to right.
+    :param rows: The rows of the table, from top to bottom.
+    :param encoding: How to encode the rendered canvas.
+    """
+    font = load_font()
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+
+    lines = [[column.header for column in columns]] + [
+        [column.text(row) for column in columns] for row in rows
+    ]
+    column_widths = [
+        max(font.getlength(line[index]) for line in lines)
+        for index in range(len(columns))
+    ]
+
+    width = PADDING + max(
+        font.getlength(title) + PADDING,
+        sum(column_width + PADDING for column_width in column_widths),
+    )
+    # 1 line for the title + 1 for the table heading + 1 for each row
+    height = PADDING + (len(lines) + 1) * (line_height + PADDING)
+
+    img = Image.new("RGB", (round(width), height), BACKGROUND)
+    drawing = ImageDraw.Draw(img)
+
+    y = PADDING
+    drawing.text((PADDING, y), title, font=font, fill=TITLE_FILL)
+
+    for index, line in enumerate(lines):
+        y += line_height + PADDING
+        fill = HEADER_FILL if index == 0 else TEXT_FILL
+        x = PADDING
+        for text, column_width in zip(line, column_widths):
+            drawing.text((x, y), text, font=font, fill=fill)
+            x += column_width + PADDING
+
+    return encode_image(img, encoding)
@@ -0,0 +1,72 @@
+"""The event_index module contains the EventIndex class, to query events by their begin time."""
+import bisect
+import operator
+from typing import Callable, Hashable, Iterable, Iterator
+
+
+def _timestamp(moment) -> float:
+    # Both arrow.Arrow and datetime.datetime provide timestamp()
+    return moment.timestamp()
+
+
+class EventIndex:
+    """
+    The events of a calendar sorted by begin time.
+
+    The index is built once per calendar snapshot. All queries use binary
+    search on the begin times, so their cost does not grow with the amount of
+    events in the calendar.
+    """
+
+    def __init__(
+        self,
+        events: Iterable,
+        kind_of: Callable[..., Hashable] = operator.attrgetter("kind"),
+    ):
+        """
+        Build the index.
+
+        :param events: The events to index, which need a `begin` attribute.
+        :param kind_of: Returns the kind of session an event is.
+        """
+        self._events = sorted(
+            events, key=lambda event: _timestamp(event.begin)
+        )
+        self._begins = [_timestamp(event.begin) for event in self._events]
+
+        self._by_kind: dict[Hashable, tuple[list[float], list]] = {}
+        for begin, event in zip(self._begins, self._events):
+            begins, events_of_kind = self._by_kind.setdefault(
+                kind_of(event), ([], [])
+            )
+            begins.append(begin)
+            events_of_kind.append(event)
+
+    def __len__(self) -> int:
+        """Return the amount of indexed events."""
+        return len(self._events)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over all events, ordered by begin time."""
+        return iter(self._events)
+
+    def between(self, start, end) -> list:
+        """Return the events beginning between start and end, both inclusive."""
+        low = bisect.bisect_left(self._begins, _timestamp(start))
+        high = bisect.bisect_right(self._begins, _timestamp(end))
+        return self._events[low:high]
+
+    def next_of_type(self, kind: Hashable, after):
+        """Return the first event of the given kind beginning after `after`."""
+        begins, events = self._by_kind.get(kind, ([], []))
+        position = bisect.bisect_right(begins, _timestamp(after))
+        if position == len(events):
+            return None
+        return events[position]
+
+    def last_of_type(self, kind: Hashable):
+        """Return the last event of the given kind in the calendar."""
+        _, events = self._by_kind.get(kind, ([], []))
+        if not events:
+            return None
+        return events[-1]
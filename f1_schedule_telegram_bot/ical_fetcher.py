@@ -1,41 +1,119 @@
 """The ical_fetcher module contains the ICalFetcher class."""
 import abc
+from typing import Optional
 
-import requests
-from ics import Calendar  # type: ignore
+import httpx
 
 from f1_schedule_telegram_bot.consts import ICAL_URL
-
+from f1_schedule_telegram_bot.ics_parser import (
+    ICalCalendar,
+    ICalParseError,
+    parse_calendar,
+)
 
 # pylint: disable=too-few-public-methods
 
 
+class ICalFetchError(Exception):
+    """Raised when the calendar cannot be retrieved from its host."""
+
+
 class ICalFetcherInterface:
     """The ICalFetcherInterface class provides an interface for ICalFetcher."""
 
-    @staticmethod
     @abc.abstractmethod
-    async def fetch() -> Calendar:
-        """Retrieve Formula 1 events calendar."""
+    async def fetch(self) -> ICalCalendar:
+        """
+        Retrieve Formula 1 events calendar.
+
+        Raises ICalFetchError when the calendar cannot be retrieved or
+        parsed.
+        """
         raise NotImplementedError
 
+    async def close(self) -> None:
+        """Release any resources held by the fetcher."""
 
-class ICalFetcher(
-    ICalFetcherInterface
-):  # pylint: disable=too-few-public-methods
+
+class ICalFetcher(ICalFetcherInterface):
     """
     Production implementation of the ICalFetcherInterface to retrieve the Formula 1 events
     from `f1_schedule_telegram_bot.consts.ICAL_URL`.
+
+    The calendar is downloaded with a persistent, pooled HTTP client. The
+    `ETag` and `Last-Modified` headers of the previous response are sent
+    along, so an unchanged calendar is neither downloaded nor parsed again.
     """
 
-    @staticmethod
-    async def fetch() -> Calendar:
+    def __init__(self, url: str = ICAL_URL, timeout: float = 30):
+        """
+        Initialize the fetcher.
+
+        :param url: The url of the iCal feed.
+        :param timeout: The timeout of a single request, in seconds.
+        """
+        self._url = url
+        self._timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._calendar: Optional[ICalCalendar] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # The client is created lazily, such that its connection pool belongs
+        # to the event loop the bot is running on
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=1),
+            )
+        return self._client
+
+    def _conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self._calendar is None:
+            return headers
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified is not None:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    async def fetch(self) -> ICalCalendar:
         """Retrieve Formula 1 events calendar."""
         try:
-            return Calendar(requests.get(ICAL_URL, timeout=30).text)
-        except requests.exceptions.Timeout as err:
-            raise TimeoutError("timeout of 30s exceeded") from err
-        except requests.exceptions.RequestException as err:
-            raise SystemExit(
-                "A request exception occurred whilst attempting to get ical"
+            response = await self._get_client().get(
+                self._url, headers=self._conditional_headers()
+            )
+        except httpx.TimeoutException as err:
+            raise ICalFetchError(
+                f"timeout of {self._timeout}s exceeded"
+            ) from err
+        except httpx.RequestError as err:
+            raise ICalFetchError(f"request failed: {err}") from err
+
+        if (
+            response.status_code == httpx.codes.NOT_MODIFIED
+            and self._calendar is not None
+        ):
+            return self._calendar
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as err:
+            raise ICalFetchError(
+                f"unexpected status {response.status_code}"
             ) from err
+        try:
+            self._calendar = parse_calendar(response.text)
+        except ICalParseError as err:
+            raise ICalFetchError(f"malformed calendar: {err}") from err
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        return self._calendar
+
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,139 @@
+"""
+Parse the events of an iCalendar feed into compact records.
+
+The `ics_parser` module contains a streaming parser that only extracts the
+properties of each VEVENT the bot needs, instead of building the full object
+graph `ics.Calendar` creates for every property in the feed.
+"""
+import datetime
+import re
+import zoneinfo
+from dataclasses import dataclass
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+_CONTENT_LINE = re.compile(
+    r'(?P<name>[A-Za-z0-9-]+)(?P<params>(?:;[^:;=]+=(?:"[^"]*"|[^:;]*))*):'
+    r"(?P<value>.*)"
+)
+_TZID = re.compile(r';TZID=(?:"([^"]*)"|([^:;]*))')
+_TEXT_ESCAPE = re.compile(r"\\([\\;,nN])")
+
+_PROPERTIES = frozenset(
+    ("UID", "SUMMARY", "DTSTART", "DTEND", "STATUS", "SEQUENCE")
+)
+
+
+class ICalEvent(NamedTuple):
+    """The properties of a single VEVENT used by the bot."""
+
+    uid: str
+    name: str
+    begin: datetime.datetime
+    end: datetime.datetime
+    status: Optional[str]
+    sequence: Optional[str]
+
+
+@dataclass(frozen=True)
+class ICalCalendar:
+    """A parsed iCalendar feed."""
+
+    events: tuple[ICalEvent, ...]
+
+
+class ICalParseError(Exception):
+    """Raised when the feed contains an event that cannot be parsed."""
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    # Long lines are folded by inserting a line break followed by a space or
+    # a tab, see RFC 5545 section 3.1
+    current: Optional[str] = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _unescape(text: str) -> str:
+    return _TEXT_ESCAPE.sub(
+        lambda match: "\n" if match[1] in "nN" else match[1], text
+    )
+
+
+def _parse_datetime(params: str, value: str) -> datetime.datetime:
+    if "VALUE=DATE" in params.upper() and "T" not in value:
+        date = datetime.datetime.strptime(value, "%Y%m%d")
+        return date.replace(tzinfo=datetime.timezone.utc)
+
+    if value.endswith("Z"):
+        tzinfo: datetime.tzinfo = datetime.timezone.utc
+        value = value[:-1]
+    elif tzid := _TZID.search(params):
+        tzinfo = zoneinfo.ZoneInfo(tzid[1] or tzid[2])
+    else:
+        # Floating times are interpreted as UTC, like ics.Calendar does
+        tzinfo = datetime.timezone.utc
+
+    moment = datetime.datetime.strptime(value, "%Y%m%dT%H%M%S")
+    return moment.replace(tzinfo=tzinfo)
+
+
+def _to_event(properties: dict[str, tuple[str, str]]) -> ICalEvent:
+    try:
+        begin = _parse_datetime(*properties["DTSTART"])
+        end = (
+            _parse_datetime(*properties["DTEND"])
+            if "DTEND" in properties
+            else begin
+        )
+        status = properties.get("STATUS")
+        sequence = properties.get("SEQUENCE")
+        return ICalEvent(
+            uid=properties["UID"][1],
+            name=_unescape(properties.get("SUMMARY", ("", ""))[1]),
+            begin=begin,
+            end=end,
+            status=status[1].upper() if status else None,
+            sequence=sequence[1] if sequence else None,
+        )
+    except (KeyError, ValueError, zoneinfo.ZoneInfoNotFoundError) as err:
+        raise ICalParseError(f"unable to parse event: {err}") from err
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[ICalEvent]:
+    """Parse the lines of an iCalendar feed, yielding its events one by one."""
+    properties: Optional[dict[str, tuple[str, str]]] = None
+    # Nested components, such as VALARM, have properties of their own
+    depth = 0
+
+    for line in _unfold(lines):
+        if line.startswith("BEGIN:"):
+            if line == "BEGIN:VEVENT":
+                properties = {}
+            elif properties is not None:
+                depth += 1
+        elif line.startswith("END:") and properties is not None:
+            if line == "END:VEVENT":
+                yield _to_event(properties)
+                properties = None
+            else:
+                depth -= 1
+        elif properties is not None and depth == 0:
+            match = _CONTENT_LINE.match(line)
+            if match and match["name"].upper() in _PROPERTIES:
+                properties[match["name"].upper()] = (
+                    match["params"],
+                    match["value"],
+                )
+
+
+def parse_calendar(text: str) -> ICalCalendar:
+    """Parse an iCalendar feed."""
+    return ICalCalendar(events=tuple(parse_events(text.splitlines())))
@@ -0,0 +1,73 @@
+"""
+Encode rendered images into compact files.
+
+The standings images consist of a few flat colours and anti-aliased text, so
+they are quantized to a small palette before being encoded, which makes the
+files several times smaller than a plain RGB PNG without visible changes.
+"""
+import enum
+import io
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from f1_schedule_telegram_bot.consts import (
+    STANDINGS_IMAGE_COLORS,
+    STANDINGS_IMAGE_FORMAT,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image  # type: ignore
+
+
+class ImageFormat(enum.Enum):
+    """The file formats images can be encoded to."""
+
+    PNG = "PNG"
+    WEBP = "WEBP"
+
+
+@dataclass(frozen=True)
+class EncodingOptions:
+    """How to encode an image."""
+
+    image_format: ImageFormat = ImageFormat(STANDINGS_IMAGE_FORMAT)
+    # The amount of colours of the palette, None keeps the full RGB colours
+    colors: Optional[int] = STANDINGS_IMAGE_COLORS
+    # Spend more time compressing PNG files, WebP files are always lossless
+    optimize: bool = True
+
+
+class EncodedImage(NamedTuple):
+    """An encoded image, with the time it took to encode it."""
+
+    data: bytes
+    # The time spent quantizing and encoding, in seconds
+    encode_time: float
+
+
+def encode_image(
+    img: "Image.Image", options: EncodingOptions = EncodingOptions()
+) -> EncodedImage:
+    """
+    Encode the image according to the options.
+
+    :param img: The image to encode.
+    :param options: The format and compression of the encoded image.
+    """
+    # Pillow is only imported where images are drawn, not when the bot starts
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    from PIL import Image  # type: ignore
+
+    started = time.perf_counter()
+    if options.colors is not None:
+        img = img.quantize(
+            colors=options.colors, method=Image.Quantize.FASTOCTREE
+        )
+
+    with io.BytesIO() as output:
+        if options.image_format is ImageFormat.WEBP:
+            img.save(output, format="WEBP", lossless=True)
+        else:
+            img.save(output, format="PNG", optimize=options.optimize)
+        return EncodedImage(output.getvalue(), time.perf_counter() - started)
@@ -1,36 +1,95 @@
-"""Main file for the bot, which sets up all requirements and starts running the main event loop."""
+"""
+Main file for the bot, which sets up all requirements and starts running the main event loop.
+
+The Ergast client, Pillow and NumPy are only imported once a command or job
+needs them, which keeps the start of the bot fast.
+"""
+from __future__ import annotations
+
+import asyncio
 import datetime
 import logging
 import os
 import sqlite3
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import arrow
-import ergast_py  # type: ignore
 import pytz  # type: ignore
-import requests
 import telegram
 from dotenv import load_dotenv
-from telegram import Update
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
-
-from f1_schedule_telegram_bot import database, helpers
+from telegram import InputMediaPhoto, Update
+from telegram.ext import (
+    Application,
+    ApplicationBuilder,
+    CommandHandler,
+    ContextTypes,
+)
+from telegram.request import BaseRequest
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.broadcaster import Broadcaster, Recipient
+from f1_schedule_telegram_bot.calendar_cache import CalendarCache
+from f1_schedule_telegram_bot.chat_registry import ChatRegistry
+from f1_schedule_telegram_bot.chat_store import (
+    ChatStoreInterface,
+    SQLiteChatStore,
+)
 from f1_schedule_telegram_bot.consts import (
     CHECK_INTERVAL,
+    CONCURRENT_UPDATES,
+    DATABASE_PATH,
     DEV_CHAT_NAME,
+    OUTBOX_INTERVAL,
     TIMEZONE,
 )
-from f1_schedule_telegram_bot.draw_standings import (
-    draw_constructor_standings,
-    draw_driver_standings,
-)
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
 from f1_schedule_telegram_bot.ical_fetcher import (
     ICalFetcher,
     ICalFetcherInterface,
+    ICalFetchError,
 )
 from f1_schedule_telegram_bot.message_handler import (
     MessageHandler,
     MessageHandlerInterface,
 )
+from f1_schedule_telegram_bot.notification_schedule import NotificationSchedule
+from f1_schedule_telegram_bot.notification_store import (
+    NotificationStoreInterface,
+    SQLiteNotificationStore,
+)
+from f1_schedule_telegram_bot.outbox import Outbox
+from f1_schedule_telegram_bot.outbox_store import (
+    ConnectionOutboxStore,
+    OutboxStoreInterface,
+    SQLiteOutboxStore,
+)
+from f1_schedule_telegram_bot.points_progression import (
+    RoundResultsCache,
+    constructor_progression,
+    driver_progression,
+)
+from f1_schedule_telegram_bot.sessions import SessionKind
+from f1_schedule_telegram_bot.standings_cache import (
+    ImageKey,
+    ImageKind,
+    StandingsImage,
+    StandingsImageCache,
+    StandingsImages,
+)
+from f1_schedule_telegram_bot.standings_data import (
+    constructor_standings_from_ergast,
+    driver_standings_from_ergast,
+)
+from f1_schedule_telegram_bot.standings_fetcher import StandingsFetcher
+from f1_schedule_telegram_bot.standings_renderer import StandingsRenderer
+from f1_schedule_telegram_bot.timezones import (
+    render_per_timezone,
+    resolve_timezone,
+)
+from f1_schedule_telegram_bot.webhook import read_webhook_settings
+
+if TYPE_CHECKING:
+    import ergast_py  # type: ignore
 
 # Load environment variables
 load_dotenv()
@@ -47,28 +106,58 @@ class F1ScheduleTelegramBot:
 
     def __init__(
         self,
-        dbconn: sqlite3.Connection,
-        ergast: ergast_py.Ergast,
+        chat_store: ChatStoreInterface,
+        ergast: Optional[ergast_py.Ergast],
         message_handler: MessageHandlerInterface,
         ical_fetcher: ICalFetcherInterface,
+        notification_store: Optional[NotificationStoreInterface] = None,
+        outbox_store: Optional[OutboxStoreInterface] = None,
+        broadcaster: Optional[Broadcaster] = None,
     ):
         """
         Initialize the bot.
 
-        :param dbconn: The database connection to use.
-        :param ergast: The Ergast API client to use, for fetching race data.
+        :param chat_store: The store the registered chats are kept in.
+        :param ergast: The Ergast API client to use, for fetching race data,
+            None to create a client once the race data is first needed.
+        :param notification_store: The store the pending notifications are
+            kept in, such that a restart does not wait for the calendar.
+        :param outbox_store: The store the undelivered messages are kept in,
+            by default they are kept in memory until the bot stops.
+        :param broadcaster: The broadcaster sending the broadcasts through
+            the message handler, by default within the rate limits Telegram
+            imposes on bots.
         """
-        self._dbconn = dbconn
-        self._ergast = ergast
+        self._chat_store = chat_store
+        self._notification_store = notification_store
+        self._chats = ChatRegistry(chat_store)
+        self._chat_id_dev: Optional[int] = None
+        self._standings_fetcher = StandingsFetcher(ergast)
         self._message_handler = message_handler
-        self._ical_fetcher = ical_fetcher
+        self._broadcaster = broadcaster or Broadcaster(message_handler)
+        self._outbox = Outbox(
+            outbox_store or ConnectionOutboxStore(sqlite3.connect(":memory:")),
+            self._broadcaster,
+            self._chats.deactivate,
+        )
+        self._calendar_cache = CalendarCache(ical_fetcher)
+        self._notification_schedule = NotificationSchedule(
+            self.send_notifications
+        )
+        self._standings_images = StandingsImageCache()
+        self._renderer = StandingsRenderer()
+        self._round_results = RoundResultsCache()
+        self._standings_in_flight: Optional[asyncio.Task] = None
+        self._standings_upload_lock = asyncio.Lock()
 
     def main(self):
         """
         Start the main event loop for the bot.
 
-        It verifies all required env variables are set, connects to the
-        database and starts up the bots main event loop.
+        It verifies all required env variables are set and starts up the bots
+        main event loop, the dev chat is registered before polling starts.
+        The updates are received through a webhook instead of polling when
+        WEBHOOK_URL is set.
         """
         # Read all env variables
         bot_token = os.getenv("BOT_TOKEN")
@@ -77,51 +166,75 @@ class F1ScheduleTelegramBot:
         chat_id_dev = os.getenv("CHAT_ID_DEV")
         if chat_id_dev is None or len(chat_id_dev) <= 0:
             raise EnvironmentError("No CHAT_ID_DEV in environment!")
+        webhook = read_webhook_settings()
 
-        cur = self._dbconn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS chats (
-                chat_id INTEGER PRIMARY KEY,
-                type TEXT NOT NULL CHECK (type <> ''),
-                name TEXT NOT NULL CHECK (name <> '')
-            )
-            """
-        )
+        application = self.build_application(bot_token, int(chat_id_dev))
+        if webhook is None:
+            application.run_polling()
+        else:
+            application.run_webhook(**webhook.options())
 
-        # Check whether the DEV chatID exists within the DATABASE, if not, create it
-        try:
-            database.get_chat_dev(self._dbconn)
-        except database.NoDevChatException as no_dev_chat_exception:
-            logging.warning(no_dev_chat_exception)
-            logging.warning("No DEV chat found, creating one")
-            cur.execute(
-                "INSERT INTO chats VALUES (:chat_id, :type, :name)",
-                {
-                    "chat_id": chat_id_dev,
-                    "type": telegram.constants.ChatType.GROUP,
-                    "name": DEV_CHAT_NAME,
-                },
-            )
-            self._dbconn.commit()
+    def build_application(
+        self,
+        bot_token: str,
+        chat_id_dev: int,
+        request: Optional[BaseRequest] = None,
+    ) -> Application:
+        """
+        Build the application, with all handlers and jobs of the bot.
 
-        application = ApplicationBuilder().token(bot_token).build()
+        Nothing is sent to Telegram until the application is started. The
+        updates are handled concurrently, such that a slow command does not
+        hold up the commands of other chats.
+
+        :param bot_token: The token of the bot.
+        :param chat_id_dev: The id of the dev chat.
+        :param request: The request to call the Bot API with, by default a
+            pool of HTTP connections.
+        """
+        self._chat_id_dev = chat_id_dev
+
+        builder = (
+            ApplicationBuilder()
+            .token(bot_token)
+            .concurrent_updates(CONCURRENT_UPDATES)
+            .post_init(self.initialize)
+            .post_shutdown(self.shutdown)
+        )
+        if request is not None:
+            builder = builder.request(request).get_updates_request(request)
+        application = builder.build()
 
         start_handler = CommandHandler("start", self.handle_start)
         standings_handler = CommandHandler("standings", self.handle_standings)
+        progress_handler = CommandHandler("progress", self.handle_progress)
         schedule_handler = CommandHandler(
             "schedule", self.handle_list_schedule
         )
         chats_handler = CommandHandler("chats", self.handle_list_chats)
+        timezone_handler = CommandHandler("timezone", self.handle_timezone)
 
         application.add_handlers(
-            [start_handler, standings_handler, schedule_handler, chats_handler]
+            [
+                start_handler,
+                standings_handler,
+                progress_handler,
+                schedule_handler,
+                chats_handler,
+                timezone_handler,
+            ]
         )
 
         job_queue = application.job_queue
         job_queue.run_repeating(
             self.sync_ical, interval=CHECK_INTERVAL, first=1, name="sync_ical"
         )
+        job_queue.run_repeating(
+            self.deliver_outbox,
+            interval=OUTBOX_INTERVAL,
+            first=OUTBOX_INTERVAL,
+            name="deliver_outbox",
+        )
 
         job_queue.run_daily(
             self.check_rawe_ceek,
@@ -149,7 +262,41 @@ class F1ScheduleTelegramBot:
             name="send_weekend_calendar",
         )
 
-        application.run_polling()
+        return application
+
+    async def initialize(self, application: Application) -> None:
+        """
+        Prepare the bot before the application starts polling.
+
+        The stored notifications are scheduled again and the dev chat is
+        registered, neither of which waits for the network.
+        """
+        if self._notification_store is not None:
+            restored = self._notification_schedule.restore(
+                application.job_queue,
+                self._notification_store.read_notifications(),
+                arrow.utcnow(),
+            )
+            logging.info("Restored notifications for %d sessions", restored)
+
+        # Check whether the DEV chatID exists within the DATABASE, if not, create it
+        try:
+            self._chats.dev_chat()
+        except database.NoDevChatException as no_dev_chat_exception:
+            logging.warning(no_dev_chat_exception)
+            logging.warning("No DEV chat found, creating one")
+            await self._chats.register(
+                self._chat_id_dev,
+                telegram.constants.ChatType.GROUP,
+                DEV_CHAT_NAME,
+                is_dev=True,
+            )
+
+    async def shutdown(self, _application: Application) -> None:
+        """Release the resources held by the bot once the application stops."""
+        await self._calendar_cache.close()
+        self._renderer.close()
+        await self._chat_store.close()
 
     async def handle_start(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -169,8 +316,7 @@ class F1ScheduleTelegramBot:
             name = update.effective_chat.title
 
         try:
-            chat = database.get_chat(self._dbconn, chat_id)
-            if chat is None:
+            if chat_id not in self._chats:
                 message = (
                     "Hello! I am F1ScheduleTelegramBot. I am currently mostly "
                     "hardcoded, but more features will be coming soon!\n\nYour "
@@ -180,16 +326,9 @@ class F1ScheduleTelegramBot:
                     context, chat_id, message
                 )
 
-                cur = self._dbconn.cursor()
-                cur.execute(
-                    "INSERT INTO chats VALUES (:chat_id, :type, :name)",
-                    {
-                        "chat_id": chat_id,
-                        "type": update.effective_chat.type,
-                        "name": name,
-                    },
+                await self._chats.register(
+                    chat_id, update.effective_chat.type, name
                 )
-                self._dbconn.commit()
                 return
 
             await self._message_handler.send_telegram_message(
@@ -200,43 +339,56 @@ class F1ScheduleTelegramBot:
                 "A fatal error occurred while reading from or writing to the database."
             ) from err
 
+    async def handle_timezone(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Handle the /timezone command, which shows or sets the timezone."""
+        chat_id = update.effective_chat.id
+        logging.info("Received /timezone command from chat_id: %s", chat_id)
+
+        current = self._chats.timezone(chat_id)
+        if current is None:
+            message = "Your chat is not registered yet, use /start first."
+        elif not context.args:
+            message = (
+                f"Times are shown in {current}. To change this, send "
+                "/timezone followed by a timezone, e.g. /timezone "
+                "Europe/London"
+            )
+        elif (timezone := resolve_timezone(context.args[0])) is None:
+            message = (
+                f"Unknown timezone: {context.args[0]}. Use a name like "
+                "Europe/London or America/New_York."
+            )
+        else:
+            await self._chats.set_timezone(chat_id, timezone)
+            message = f"Times are now shown in {timezone} 🕒"
+
+        await self._message_handler.send_telegram_message(
+            context, chat_id, message
+        )
+
     async def send_notifications(self, context: ContextTypes.DEFAULT_TYPE):
         """
         Send a notification to all chats in the database.
 
-        The notification content is based on event and message that was stored in the
+        The notification content is based on the session that was stored in the
         job data.
         """
         job = context.job
-        event = job.data
+        session = job.data
 
-        message = (
-            f"{event.name} will begin {event.begin.to(TIMEZONE).humanize()}"
-        )
+        begin = arrow.get(session.begin).to(TIMEZONE)
+        message = f"{session.name} will begin {begin.humanize()}"
 
-        chats = database.list_chats(self._dbconn)
-        for chat in chats:
-            chat_id = chat.chat_id
-            await self._message_handler.send_telegram_message(
-                context, chat_id, message
+        await self._broadcast(
+            context, ((chat, message) for chat in self._chats.recipients())
+        )
+        if self._notification_store is not None:
+            await self._notification_store.remove_notifications(
+                session.uid, arrow.utcnow().timestamp()
             )
 
-    @staticmethod
-    def remove_job_if_exists(
-        uid: str, context: ContextTypes.DEFAULT_TYPE
-    ) -> bool:
-        """Remove job with given uid. Returns whether job was removed."""
-
-        current_jobs = context.job_queue.get_jobs_by_name(uid)
-
-        if not current_jobs:
-            return False
-
-        for job in current_jobs:
-            job.schedule_removal()
-
-        return True
-
     async def handle_standings(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -251,22 +403,204 @@ class F1ScheduleTelegramBot:
             update.effective_chat.id,
         )
 
-        constructor_standing = self._ergast.season().get_constructor_standing()
-        driver_standing = self._ergast.season().get_driver_standing()
-        races = self._ergast.season().get_races()
+        if self._standings_in_flight is None:
+            self._standings_in_flight = asyncio.create_task(
+                self._render_standings()
+            )
+        else:
+            logging.info("Waiting for the standings already being rendered")
+
+        # Shield the shared render, such that a cancelled request does not
+        # cancel it for all others
+        images = await asyncio.shield(self._standings_in_flight)
+
+        await self._reply_with_images(update, context, images)
+
+    async def handle_progress(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """
+        Handle the /progress command.
+
+        The progress command returns the points of the leading drivers and
+        teams after every round of the season, as line charts.
+        """
+        logging.info(
+            "Received /progress command from chat_id: %s",
+            update.effective_chat.id,
+        )
+
+        images = await self._render_progress()
+        await self._reply_with_images(update, context, images)
+
+    async def _reply_with_images(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        images: StandingsImages,
+    ) -> None:
+        """Send the available images, and mention the unavailable ones."""
+        available = [image for image in images if image is not None]
+        if any(
+            self._standings_images.file_id(image.key) is None
+            for image in available
+        ):
+            # Only one chat uploads the new images, the others wait and send
+            # them by their file_id
+            async with self._standings_upload_lock:
+                await self._send_standings(
+                    context, update.effective_chat.id, available
+                )
+        else:
+            await self._send_standings(
+                context, update.effective_chat.id, available
+            )
 
-        driver_standing_image = draw_driver_standings(driver_standing, races)
-        await context.bot.send_photo(
-            chat_id=update.effective_chat.id,
-            photo=driver_standing_image,
+        if len(available) < len(images):
+            await self._message_handler.send_telegram_message(
+                context,
+                update.effective_chat.id,
+                "Some of the images are unavailable right now, please try "
+                "again later.",
+            )
+
+    async def _send_standings(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        images: list[StandingsImage],
+    ) -> None:
+        """
+        Send the standings images, as a single media group when possible.
+
+        :param context: The context of the telegram bot.
+        :param chat_id: The chat id to send the images to.
+        :param images: The images to send.
+        """
+        media = [
+            self._standings_images.file_id(image.key) or image.image
+            for image in images
+        ]
+        if len(media) > 1:
+            messages = await context.bot.send_media_group(
+                chat_id=chat_id,
+                media=[InputMediaPhoto(photo) for photo in media],
+            )
+        elif media:
+            messages = (
+                await context.bot.send_photo(chat_id=chat_id, photo=media[0]),
+            )
+        else:
+            return
+
+        # The largest size of a photo is the one that was uploaded
+        for image, message in zip(images, messages):
+            self._standings_images.remember_file_id(
+                image.key, message.photo[-1].file_id
+            )
+
+    async def _render_standings(self) -> StandingsImages:
+        """Fetch the latest standings and render them as images."""
+        try:
+            return await self._fetch_and_render_standings()
+        finally:
+            self._standings_in_flight = None
+
+    async def _fetch_and_render_standings(self) -> StandingsImages:
+        (
+            constructor_standing,
+            driver_standing,
+            races,
+        ) = await self._standings_fetcher.fetch()
+
+        # Both images are titled after the last race, so nothing can be drawn
+        # without the races
+        if races is None:
+            return StandingsImages(None, None)
+
+        driver_standing_image = None
+        if driver_standing is not None:
+            drivers = driver_standings_from_ergast(driver_standing, races)
+            key = ImageKey(drivers.season, drivers.round_no, ImageKind.DRIVERS)
+            driver_standing_image = StandingsImage(
+                key,
+                await self._standings_images.get_or_render(
+                    key, lambda: self._renderer.render_drivers(drivers)
+                ),
+            )
+
+        constructor_standing_image = None
+        if constructor_standing is not None:
+            constructors = constructor_standings_from_ergast(
+                constructor_standing, races
+            )
+            key = ImageKey(
+                constructors.season,
+                constructors.round_no,
+                ImageKind.CONSTRUCTORS,
+            )
+            constructor_standing_image = StandingsImage(
+                key,
+                await self._standings_images.get_or_render(
+                    key,
+                    lambda: self._renderer.render_constructors(constructors),
+                ),
+            )
+
+        stats = self._standings_images.stats
+        logging.info(
+            "Standings image cache hit ratio: %.2f, last render took %.3fs",
+            stats.hit_ratio,
+            stats.last_render_time,
+        )
+        return StandingsImages(
+            driver_standing_image, constructor_standing_image
         )
 
-        constructor_standing_image = draw_constructor_standings(
-            constructor_standing, races
+    async def _render_progress(self) -> StandingsImages:
+        """Fetch the results of every round and render the progression."""
+        driver_standing = await self._standings_fetcher.fetch_driver_standing()
+        if driver_standing is None:
+            return StandingsImages(None, None)
+        season = driver_standing.season
+        round_no = driver_standing.round_no
+
+        # Only the rounds that were not fetched before are fetched
+        for results in await asyncio.gather(
+            *(
+                self._standings_fetcher.fetch_round(season, number)
+                for number in self._round_results.missing(season, round_no)
+            )
+        ):
+            if results is not None:
+                self._round_results.add(results)
+        if self._round_results.missing(season, round_no):
+            return StandingsImages(None, None)
+        rounds = self._round_results.rounds(season, round_no)
+
+        key = ImageKey(season, round_no, ImageKind.DRIVER_PROGRESS)
+        driver_progress_image = StandingsImage(
+            key,
+            await self._standings_images.get_or_render(
+                key,
+                lambda: self._renderer.render_driver_progress(
+                    driver_progression(rounds)
+                ),
+            ),
         )
-        await context.bot.send_photo(
-            chat_id=update.effective_chat.id,
-            photo=constructor_standing_image,
+
+        key = ImageKey(season, round_no, ImageKind.CONSTRUCTOR_PROGRESS)
+        constructor_progress_image = StandingsImage(
+            key,
+            await self._standings_images.get_or_render(
+                key,
+                lambda: self._renderer.render_constructor_progress(
+                    constructor_progression(rounds)
+                ),
+            ),
+        )
+        return StandingsImages(
+            driver_progress_image, constructor_progress_image
         )
 
     async def send_weekend_calendar(
@@ -274,122 +608,119 @@ class F1ScheduleTelegramBot:
     ) -> None:
         """Send a message with the calendar for the current weekend."""
         try:
-            cal = await self._ical_fetcher.fetch()
-        except requests.exceptions.Timeout as err:
+            snapshot = await self._calendar_cache.snapshot()
+        except ICalFetchError as err:
             logging.warning("unable to get iCal: %s", err)
             return
 
-        # Order the events such that the quali is listed before the race
-        events = sorted(cal.events)
         utcnow = arrow.utcnow()
-        message = ""
-
-        for event in events:
-            # Get the quali and race for this weekend
-            if utcnow < event.begin <= utcnow.shift(days=4) and (
-                helpers.is_race(event.name)
-                or helpers.is_qualifying(event.name)
-            ):
-                race_name = event.name.split("(")[1].split(")")[0]
-                event_name = event.name.split("F1:")[1].split("(")[0].strip()
-
-                # If message is empty, start with the name of the race
-                if message == "":
-                    message += f"<b>{race_name}</b>\n"
-
-                message += f"{event_name}: {event.begin.to(TIMEZONE).format('HH:mm')}\n"
 
-        if message == "":
+        # Get the quali and race for this weekend, the index orders the
+        # sessions such that the quali is listed before the race
+        sessions = [
+            session
+            for session in snapshot.index.between(utcnow, utcnow.shift(days=4))
+            if session.kind in (SessionKind.QUALIFYING, SessionKind.RACE)
+        ]
+        if not sessions:
             return
 
-        chats = database.list_chats(self._dbconn)
-        for chat in chats:
-            chat_id = chat.chat_id
-            await self._message_handler.send_telegram_message(
-                context,
-                chat_id,
-                message,
-                parse_mode=telegram.constants.ParseMode.HTML,
-            )
+        def render(timezone: str) -> str:
+            message = f"<b>{sessions[0].grand_prix}</b>\n"
+            for session in sessions:
+                begin = arrow.get(session.begin).to(timezone)
+                message += f"{session.label}: {begin.format('HH:mm')}\n"
+            return message
 
-        return
+        await self._broadcast(
+            context,
+            render_per_timezone(self._chats.by_timezone(), render),
+            parse_mode=telegram.constants.ParseMode.HTML,
+        )
 
     async def check_rawe_ceek(
         self, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Notify channels if there is a race this week."""
         try:
-            cal = await self._ical_fetcher.fetch()
-        except requests.exceptions.Timeout as err:
+            snapshot = await self._calendar_cache.snapshot()
+        except ICalFetchError as err:
             logging.warning("unable to get iCal: %s", err)
             return
 
         utcnow = arrow.utcnow()
 
-        sorted_events = sorted(cal.events)
-
-        for event in sorted_events:
-            # Get the first grand prix in the calendar
-            if utcnow < event.begin and helpers.is_race(event.name):
-                next_race_name = event.name.split("(")[1].split(")")[0]
-                # Check if it's in 7 days
-                if event.begin <= utcnow.shift(days=7):
-                    message = (
-                        f"""It's rawe ceek!\n\n""" f"""{next_race_name}"""
-                    )
-                else:
-                    message = f"{next_race_name} is {event.begin.to(TIMEZONE).humanize()}"
-
-                chats = database.list_chats(self._dbconn)
-                for chat in chats:
-                    chat_id = chat.chat_id
-                    await self._message_handler.send_telegram_message(
-                        context, chat_id, message
-                    )
+        # Get the first grand prix in the calendar
+        next_race = snapshot.index.next_of_type(SessionKind.RACE, utcnow)
+        if next_race is not None:
+            next_race_name = next_race.grand_prix
+            # Check if it's in 7 days
+            if next_race.begin <= utcnow.shift(days=7):
+                message = f"""It's rawe ceek!\n\n""" f"""{next_race_name}"""
+            else:
+                begin = arrow.get(next_race.begin).to(TIMEZONE)
+                message = f"{next_race_name} is {begin.humanize()}"
+
+            await self._broadcast(
+                context,
+                ((chat, message) for chat in self._chats.recipients()),
+            )
 
-                return
+            return
 
         # Get the last race and announce offseason
-        last_race = sorted_events[-1]
+        last_race = snapshot.index.last_of_type(SessionKind.RACE)
         # If the last race of the calendar was last weekend
-        if utcnow.shift(days=-7) < last_race:
-            chats = database.list_chats(self._dbconn)
-            for chat in chats:
-                chat_id = chat.chat_id
-                await self._message_handler.send_telegram_message(
-                    context, chat_id, "Welcome to offseason! 🤪"
-                )
+        if last_race is not None and utcnow.shift(days=-7) < last_race.begin:
+            await self._broadcast(
+                context,
+                (
+                    (chat, "Welcome to offseason! 🤪")
+                    for chat in self._chats.recipients()
+                ),
+            )
+
+    async def _broadcast(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        messages: Iterable[tuple[Recipient, str]],
+        parse_mode: Optional[str] = None,
+    ) -> None:
+        """Store a message for every chat in the outbox and deliver them."""
+        await self._outbox.enqueue(messages, parse_mode)
+        await self._outbox.deliver(context)
+
+    async def deliver_outbox(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Deliver the messages in the outbox that are due to be retried."""
+        await self._outbox.deliver(context)
 
     async def sync_ical(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Synchronize the ical link, store all events in job queue."""
         try:
-            cal = await self._ical_fetcher.fetch()
-        except requests.exceptions.Timeout as err:
+            snapshot = await self._calendar_cache.snapshot()
+        except ICalFetchError as err:
             logging.warning("unable to get iCal: %s", err)
             return
 
         utcnow = arrow.utcnow()
 
-        for event in cal.events:
-            # If the event is cancelled, don't add a job for it.
-            if "canceled" in event.name.lower():
-                continue
-            # First, check if the event is in the next 7 days
-            if utcnow <= event.begin <= utcnow.shift(days=7):
-                # For now reschedule all events
-                self.remove_job_if_exists(event.uid, context)
-                context.job_queue.run_once(
-                    self.send_notifications,
-                    event.begin.shift(minutes=-60).datetime,
-                    name=event.uid,
-                    data=event,
-                )
-                context.job_queue.run_once(
-                    self.send_notifications,
-                    event.begin.shift(minutes=-5).datetime,
-                    name=event.uid,
-                    data=event,
-                )
+        # Only schedule the events in the next 7 days
+        result = self._notification_schedule.sync(
+            context.job_queue,
+            snapshot.index.between(utcnow, utcnow.shift(days=7)),
+            utcnow,
+        )
+        logging.info(
+            "Synchronized iCal: %d added, %d moved, %d removed, %d unchanged",
+            result.added,
+            result.moved,
+            result.removed,
+            result.unchanged,
+        )
+        if self._notification_store is not None:
+            await self._notification_store.replace_notifications(
+                self._notification_schedule.notifications(utcnow)
+            )
 
     async def handle_list_schedule(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -400,7 +731,7 @@ class F1ScheduleTelegramBot:
             update.effective_chat.id,
         )
 
-        chat_dev = database.get_chat_dev(self._dbconn)
+        chat_dev = self._chats.dev_chat()
 
         logging.debug(
             "Chat id dev: %s equals user chat_id: %s",
@@ -419,6 +750,22 @@ class F1ScheduleTelegramBot:
                 f"{job.next_t.strftime('%-d %b, %H:%M:%S')}: {job_name}\n"
             )
 
+        stats = self._calendar_cache.stats
+        message += (
+            f"\nCalendar cache: {stats.hits} hits, {stats.misses} misses, "
+            f"{stats.coalesced} coalesced, {stats.stale} stale\n"
+        )
+        counts = await self._outbox.counts()
+        delivery = self._outbox.stats
+        message += (
+            f"Outbox: {counts.due} due, {counts.waiting} waiting to retry, "
+            f"{counts.failed} failed\n"
+            f"Since start: {delivery.delivered} delivered, "
+            f"{delivery.retried} retried, {delivery.failed} failed, "
+            f"{delivery.deactivated} chats deactivated, "
+            f"{delivery.throughput:.1f} messages/s\n"
+        )
+
         await self._message_handler.send_telegram_message(
             context, chat_dev.chat_id, message
         )
@@ -432,7 +779,7 @@ class F1ScheduleTelegramBot:
             update.effective_chat.id,
         )
 
-        chat_dev = database.get_chat_dev(self._dbconn)
+        chat_dev = self._chats.dev_chat()
 
         logging.debug(
             "Chat id dev: %s equals user chat_id: %s",
@@ -443,7 +790,7 @@ class F1ScheduleTelegramBot:
             return
 
         message = "Registered chats: \n"
-        for chat in database.list_chats(self._dbconn):
+        for chat in await self._chat_store.list_chats():
             message += f"{chat.name} ({chat.chat_type}, <code>{chat.chat_id}</code>)\n"
 
         await self._message_handler.send_telegram_message(
@@ -454,11 +801,20 @@ class F1ScheduleTelegramBot:
         )
 
 
-if __name__ == "__main__":
+def main():
+    """Run the bot with the production implementations."""
+    # The stores share the connection and its writer thread
+    writer = DatabaseWriter(DATABASE_PATH)
     bot = F1ScheduleTelegramBot(
-        dbconn=sqlite3.connect("./data/f1.db"),
-        ergast=ergast_py.Ergast(),
+        chat_store=SQLiteChatStore(writer),
+        ergast=None,
         message_handler=MessageHandler(),
         ical_fetcher=ICalFetcher(),
+        notification_store=SQLiteNotificationStore(writer),
+        outbox_store=SQLiteOutboxStore(writer),
     )
     bot.main()
+
+
+if __name__ == "__main__":
+    main()
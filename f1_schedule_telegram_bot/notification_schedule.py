@@ -0,0 +1,218 @@
+"""The notification_schedule module keeps the notification jobs in sync with the calendar."""
+import datetime
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+from telegram.ext import Job, JobQueue
+
+from f1_schedule_telegram_bot.consts import NOTIFICATION_OFFSETS
+from f1_schedule_telegram_bot.database import PendingNotification
+from f1_schedule_telegram_bot.sessions import Session
+
+
+@dataclass(frozen=True)
+class ScheduledSession:
+    """The version of a session for which notification jobs are scheduled."""
+
+    begin: float
+    name: str
+    sequence: Optional[str]
+    session: Session
+    # The times the notifications are sent, as UNIX timestamps
+    dues: tuple[float, ...]
+    jobs: tuple[Job, ...]
+
+    def matches(self, session: Session) -> bool:
+        """Check whether the jobs were scheduled for this version of session."""
+        return (self.begin, self.name, self.sequence) == (
+            session.begin.timestamp(),
+            session.name,
+            session.sequence,
+        )
+
+
+@dataclass
+class SyncResult:
+    """Summary of the changes a synchronisation made to the scheduled jobs."""
+
+    added: int = 0
+    moved: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def _cancel(jobs: Iterable[Job]) -> None:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for job in jobs:
+        # Jobs that already ran are no longer in the job queue
+        if not job.removed and job.next_t is not None and job.next_t > now:
+            job.schedule_removal()
+
+
+class NotificationSchedule:
+    """
+    Track the notification jobs that are scheduled for each session.
+
+    Every synchronisation compares the upcoming sessions to what is already
+    scheduled, and only adds, moves or removes the jobs of sessions that
+    actually changed.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        offsets: Iterable[datetime.timedelta] = NOTIFICATION_OFFSETS,
+    ):
+        """
+        Initialize an empty schedule.
+
+        :param callback: The job callback sending the notification.
+        :param offsets: How long before a session each notification is sent.
+        """
+        self._callback = callback
+        self._offsets = tuple(offsets)
+        self._scheduled: dict[str, ScheduledSession] = {}
+
+    def __len__(self) -> int:
+        """Return the amount of sessions notifications are scheduled for."""
+        return len(self._scheduled)
+
+    def _schedule(
+        self, job_queue: JobQueue, session: Session
+    ) -> ScheduledSession:
+        jobs = tuple(
+            job_queue.run_once(
+                self._callback,
+                session.begin - offset,
+                name=session.uid,
+                data=session,
+            )
+            for offset in self._offsets
+        )
+        return ScheduledSession(
+            begin=session.begin.timestamp(),
+            name=session.name,
+            sequence=session.sequence,
+            session=session,
+            dues=tuple(
+                (session.begin - offset).timestamp()
+                for offset in self._offsets
+            ),
+            jobs=jobs,
+        )
+
+    def notifications(self, now) -> Iterator[PendingNotification]:
+        """
+        Return the scheduled notifications that are yet to be sent.
+
+        :param now: The current time, notifications before it have been sent.
+        """
+        for scheduled in self._scheduled.values():
+            for due in scheduled.dues:
+                if due > now.timestamp():
+                    yield PendingNotification(scheduled.session, due)
+
+    def restore(
+        self,
+        job_queue: JobQueue,
+        notifications: Iterable[PendingNotification],
+        now,
+    ) -> int:
+        """
+        Schedule the stored notifications, returning the amount of sessions.
+
+        The notifications that were missed while the bot was not running are
+        sent at once, as a single notification per session, unless the
+        session has already begun. Sessions that are already scheduled are
+        left alone, so the stored notifications never replace a newer sync.
+
+        :param job_queue: The job queue to schedule the notifications on.
+        :param notifications: The stored notifications that are yet to be sent.
+        :param now: The current time, notifications before it were missed.
+        """
+        sessions: dict[str, tuple[Session, list[float]]] = {}
+        for session, due in notifications:
+            sessions.setdefault(session.uid, (session, []))[1].append(due)
+
+        restored = 0
+        for uid, (session, dues) in sessions.items():
+            if (
+                uid in self._scheduled
+                or session.begin.timestamp() <= now.timestamp()
+            ):
+                continue
+            upcoming = tuple(
+                sorted(due for due in dues if due > now.timestamp())
+            )
+            jobs = [
+                job_queue.run_once(
+                    self._callback,
+                    datetime.datetime.fromtimestamp(
+                        due, datetime.timezone.utc
+                    ),
+                    name=uid,
+                    data=session,
+                )
+                for due in upcoming
+            ]
+            if len(upcoming) < len(dues):
+                # One notification that the session begins soon covers all
+                # the notifications that were missed
+                jobs.insert(
+                    0,
+                    job_queue.run_once(
+                        self._callback, 0, name=uid, data=session
+                    ),
+                )
+            self._scheduled[uid] = ScheduledSession(
+                begin=session.begin.timestamp(),
+                name=session.name,
+                sequence=session.sequence,
+                session=session,
+                dues=upcoming,
+                jobs=tuple(jobs),
+            )
+            restored += 1
+        return restored
+
+    def sync(
+        self, job_queue: JobQueue, sessions: Iterable[Session], now
+    ) -> SyncResult:
+        """
+        Update the scheduled jobs to match the given sessions.
+
+        :param job_queue: The job queue to schedule the notifications on.
+        :param sessions: All sessions that should have notifications.
+        :param now: The current time, sessions before it have already begun.
+        """
+        result = SyncResult()
+        upcoming = {
+            session.uid: session
+            for session in sessions
+            # If the session is cancelled, don't add a job for it.
+            if not session.canceled
+        }
+
+        for uid in list(self._scheduled):
+            if uid in upcoming:
+                continue
+            scheduled = self._scheduled.pop(uid)
+            # Sessions that have begun simply leave the schedule, the others
+            # disappeared from the calendar, were cancelled or moved away
+            if scheduled.begin > now.timestamp():
+                _cancel(scheduled.jobs)
+                result.removed += 1
+
+        for uid, session in upcoming.items():
+            scheduled = self._scheduled.get(uid)
+            if scheduled is None:
+                result.added += 1
+            elif scheduled.matches(session):
+                result.unchanged += 1
+                continue
+            else:
+                _cancel(scheduled.jobs)
+                result.moved += 1
+            self._scheduled[uid] = self._schedule(job_queue, session)
+
+        return result
@@ -0,0 +1,94 @@
+"""The notification_store module contains the classes that store the notifications."""
+import abc
+import sqlite3
+from typing import Iterable
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.database import PendingNotification
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+
+
+class NotificationStoreInterface:
+    """The NotificationStoreInterface class provides an interface for the notification stores."""
+
+    @abc.abstractmethod
+    def read_notifications(self) -> list[PendingNotification]:
+        """
+        Return all pending notifications, in the order they are due.
+
+        This blocks until the notifications are read, it is meant to be called
+        once while the bot starts.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def replace_notifications(
+        self, notifications: Iterable[PendingNotification]
+    ) -> None:
+        """Replace all pending notifications, returning once committed."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def remove_notifications(self, uid: str, due: float) -> None:
+        """Remove the notifications of a session due by the given time."""
+        raise NotImplementedError
+
+
+class ConnectionNotificationStore(NotificationStoreInterface):
+    """Store the notifications using a connection on the calling thread."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the store, migrating the database if needed.
+
+        :param conn: The database connection the notifications are stored in.
+        """
+        self._conn = conn
+        database.migrate(conn)
+
+    def read_notifications(self) -> list[PendingNotification]:
+        """Return all pending notifications, in the order they are due."""
+        return database.list_notifications(self._conn)
+
+    async def replace_notifications(
+        self, notifications: Iterable[PendingNotification]
+    ) -> None:
+        """Replace all pending notifications and commit them."""
+        database.replace_notifications(self._conn, notifications)
+        self._conn.commit()
+
+    async def remove_notifications(self, uid: str, due: float) -> None:
+        """Remove the notifications of a session due by the given time."""
+        database.remove_notifications(self._conn, uid, due)
+        self._conn.commit()
+
+
+class SQLiteNotificationStore(NotificationStoreInterface):
+    """Store the notifications in SQLite, off the event loop."""
+
+    def __init__(self, writer: DatabaseWriter):
+        """
+        Initialize the store.
+
+        :param writer: The writer running the queries on the database.
+        """
+        self._writer = writer
+
+    def read_notifications(self) -> list[PendingNotification]:
+        """Return all pending notifications, in the order they are due."""
+        return self._writer.read_now(database.list_notifications)
+
+    async def replace_notifications(
+        self, notifications: Iterable[PendingNotification]
+    ) -> None:
+        """Replace all pending notifications, returning once committed."""
+        notifications = tuple(notifications)
+        await self._writer.write(
+            lambda conn: database.replace_notifications(conn, notifications)
+        )
+
+    async def remove_notifications(self, uid: str, due: float) -> None:
+        """Remove the notifications of a session due by the given time."""
+        await self._writer.write(
+            lambda conn: database.remove_notifications(conn, uid, due)
+        )
@@ -0,0 +1,279 @@
+"""
+Deliver the broadcasts through a durable outbox.
+
+Every broadcast is stored in the outbox first, as a message per chat, after
+which the outbox is drained. The messages that fail are kept, so they survive
+a restart of the bot:
+
+- when Telegram asks the bot to slow down, the delivery pauses for as long
+  as Telegram asks, and the remaining messages are sent afterwards, without
+  counting this as a failed attempt;
+- when the network fails, the message is retried with an exponential backoff,
+  until it failed OUTBOX_MAX_ATTEMPTS times;
+- when the chat blocked or removed the bot, or no longer exists, the message
+  fails at once and the chat is deactivated, so it is skipped from then on.
+
+A message expires when it is OUTBOX_MAX_AGE later than the backlog ahead of
+it allows, as the notification would be outdated. The failed messages are
+deleted once they are older than OUTBOX_RETENTION.
+"""
+import asyncio
+import datetime
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional
+
+import telegram
+
+from f1_schedule_telegram_bot.broadcaster import Broadcaster, Recipient
+from f1_schedule_telegram_bot.consts import (
+    BROADCAST_CONCURRENCY,
+    GLOBAL_RATE_LIMIT,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_AGE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_RETRY_DELAY,
+    OUTBOX_RETENTION,
+    OUTBOX_RETRY_DELAY,
+)
+from f1_schedule_telegram_bot.database import OutboxCounts, OutboxMessage
+from f1_schedule_telegram_bot.outbox_store import OutboxStoreInterface
+
+
+@dataclass
+class DeliveryResult:
+    """The outcome of delivering the messages in the outbox."""
+
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    deactivated: int = 0
+    # The time spent delivering, in seconds
+    duration: float = field(default=0.0, compare=False)
+
+    @property
+    def throughput(self) -> float:
+        """Return the amount of messages delivered per second."""
+        if self.duration <= 0:
+            return float(self.delivered)
+        return self.delivered / self.duration
+
+
+@dataclass(frozen=True)
+class OutboxSettings:
+    """How the outbox delivers its messages."""
+
+    # The amount of messages delivered at once
+    batch_size: int = OUTBOX_BATCH_SIZE
+    # The maximum amount of messages in flight
+    concurrency: int = BROADCAST_CONCURRENCY
+    # The amount of times a message may fail
+    max_attempts: int = OUTBOX_MAX_ATTEMPTS
+    # How late a message may be, on top of the time the backlog ahead of it
+    # takes at rate messages per second
+    max_age: datetime.timedelta = OUTBOX_MAX_AGE
+    rate: float = GLOBAL_RATE_LIMIT
+    # How long the failed messages are kept
+    retention: datetime.timedelta = OUTBOX_RETENTION
+    # Returns the current time, as a UNIX timestamp
+    clock: Callable[[], float] = time.time
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(OUTBOX_MAX_RETRY_DELAY, OUTBOX_RETRY_DELAY * 2**attempts)
+
+
+def _is_transient(err: telegram.error.TelegramError) -> bool:
+    # Requests Telegram rejected fail again, the network may recover
+    return isinstance(err, telegram.error.NetworkError) and not isinstance(
+        err, telegram.error.BadRequest
+    )
+
+
+def _is_dead_chat(err: telegram.error.TelegramError) -> bool:
+    # The bot was blocked or removed from the chat, or the chat was deleted
+    return isinstance(err, telegram.error.Forbidden) or (
+        isinstance(err, telegram.error.BadRequest)
+        and "chat not found" in err.message.lower()
+    )
+
+
+class Outbox:
+    """Store the broadcasts and deliver them, retrying what failed."""
+
+    def __init__(
+        self,
+        store: OutboxStoreInterface,
+        broadcaster: Broadcaster,
+        deactivate: Callable[[int], Awaitable[object]],
+        settings: OutboxSettings = OutboxSettings(),
+    ):
+        """
+        Initialize the outbox.
+
+        :param store: The store the messages are kept in.
+        :param broadcaster: The broadcaster sending the messages.
+        :param deactivate: Deactivates the chat with the given id.
+        :param settings: How the messages are delivered.
+        """
+        self._store = store
+        self._broadcaster = broadcaster
+        self._deactivate = deactivate
+        self._settings = settings
+        self._lock = asyncio.Lock()
+        # No messages are sent until this time, as asked by Telegram
+        self._paused_until = 0.0
+        self.stats = DeliveryResult()
+
+    async def enqueue(
+        self,
+        messages: Iterable[tuple[Recipient, str]],
+        parse_mode: Optional[str] = None,
+    ) -> int:
+        """
+        Add a message for every chat, returning the amount added.
+
+        Every message expires max_age after the time it is expected to be
+        sent, such that the tail of a large broadcast is sent as well.
+
+        :param messages: Every chat, with its own message.
+        :param parse_mode: How Telegram parses the messages, e.g. "HTML".
+        """
+        now = self._settings.clock()
+        counts = await self._store.counts(now)
+        expires = now + self._settings.max_age.total_seconds()
+        backlog = counts.due + counts.waiting
+        return await self._store.enqueue(
+            (
+                (
+                    chat.chat_id,
+                    chat.chat_type,
+                    message,
+                    parse_mode,
+                    expires + (backlog + position) / self._settings.rate,
+                )
+                for position, (chat, message) in enumerate(messages)
+            ),
+            now,
+        )
+
+    async def counts(self) -> OutboxCounts:
+        """Return the amount of messages in the outbox, per state."""
+        return await self._store.counts(self._settings.clock())
+
+    async def _deliver_batch(
+        self, context, batch: list[OutboxMessage], result: DeliveryResult
+    ) -> None:
+        delivered: list[int] = []
+        retried: list[tuple[int, float, str]] = []
+        failed: list[tuple[int, str]] = []
+        postponed: list[tuple[int, float]] = []
+        dead_chats: set[int] = set()
+        pending = iter(batch)
+
+        async def worker():
+            # All workers share the iterator, so every message is sent once
+            for message in pending:
+                # The messages are left for later while delivery is paused
+                if self._paused_until > self._settings.clock():
+                    continue
+                kwargs = {}
+                if message.parse_mode is not None:
+                    kwargs["parse_mode"] = message.parse_mode
+                try:
+                    await self._broadcaster.send(
+                        context, message, message.text, **kwargs
+                    )
+                except telegram.error.RetryAfter as err:
+                    self._paused_until = max(
+                        self._paused_until,
+                        self._settings.clock() + err.retry_after,
+                    )
+                    # Slowing down is no failure of the message itself
+                    postponed.append((message.message_id, self._paused_until))
+                except telegram.error.TelegramError as err:
+                    if (
+                        _is_transient(err)
+                        and message.attempts + 1 < self._settings.max_attempts
+                    ):
+                        next_attempt = self._settings.clock() + _retry_delay(
+                            message.attempts
+                        )
+                        retried.append(
+                            (message.message_id, next_attempt, str(err))
+                        )
+                        continue
+                    if _is_dead_chat(err):
+                        dead_chats.add(message.chat_id)
+                    logging.warning(
+                        "Unable to send message to chat_id %s: %s",
+                        message.chat_id,
+                        err,
+                    )
+                    failed.append((message.message_id, str(err)))
+                else:
+                    delivered.append(message.message_id)
+
+        await asyncio.gather(
+            *(worker() for _ in range(self._settings.concurrency))
+        )
+        await self._store.record(delivered, retried, failed, postponed)
+        for chat_id in dead_chats:
+            await self._deactivate(chat_id)
+
+        result.delivered += len(delivered)
+        result.retried += len(retried) + len(postponed)
+        result.failed += len(failed)
+        result.deactivated += len(dead_chats)
+
+    async def deliver(self, context) -> DeliveryResult:
+        """
+        Send the messages that are due, returning how the delivery went.
+
+        The messages are sent until none are due, or until Telegram asks the
+        bot to slow down. Only a single delivery runs at a time: while one
+        runs, this returns at once, as the running delivery also sends the
+        messages that are added meanwhile, and the next tick the rest.
+        """
+        if self._lock.locked():
+            return DeliveryResult()
+        async with self._lock:
+            started = time.monotonic()
+            result = DeliveryResult()
+            now = self._settings.clock()
+            expired = await self._store.expire(now)
+            if expired:
+                logging.warning(
+                    "%d messages expired before they could be delivered",
+                    expired,
+                )
+            result.failed += expired
+            await self._store.prune(
+                now - self._settings.retention.total_seconds()
+            )
+            while self._paused_until <= now:
+                batch = await self._store.due(now, self._settings.batch_size)
+                if not batch:
+                    break
+                await self._deliver_batch(context, batch, result)
+                now = self._settings.clock()
+            result.duration = time.monotonic() - started
+
+        if result != DeliveryResult():
+            logging.info(
+                "Delivered the outbox in %.2fs: %d delivered, %d retried, "
+                "%d failed, %d chats deactivated (%.1f messages/s)",
+                result.duration,
+                result.delivered,
+                result.retried,
+                result.failed,
+                result.deactivated,
+                result.throughput,
+            )
+        self.stats.delivered += result.delivered
+        self.stats.retried += result.retried
+        self.stats.failed += result.failed
+        self.stats.deactivated += result.deactivated
+        self.stats.duration += result.duration
+        return result
@@ -0,0 +1,166 @@
+"""The outbox_store module contains the classes that store the outbox."""
+import abc
+import sqlite3
+from typing import Iterable, Optional
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.database import OutboxCounts, OutboxMessage
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+
+# The chat id, chat type, text, parse mode and expiry time of a message
+NewMessage = tuple[int, str, str, Optional[str], float]
+
+
+class OutboxStoreInterface:
+    """The OutboxStoreInterface class provides an interface for the outbox stores."""
+
+    @abc.abstractmethod
+    async def enqueue(self, messages: Iterable[NewMessage], now: float) -> int:
+        """Add the messages to the outbox, returning the amount added."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def due(self, now: float, limit: int) -> list[OutboxMessage]:
+        """Return at most limit pending messages that are due at now."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def record(
+        self,
+        delivered: Iterable[int],
+        retried: Iterable[tuple[int, float, str]],
+        failed: Iterable[tuple[int, str]],
+        postponed: Iterable[tuple[int, float]] = (),
+    ) -> None:
+        """Record the outcome of a delivery, returning once committed."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def expire(self, now: float) -> int:
+        """Fail the pending messages that expired before now."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def prune(self, before: float) -> int:
+        """Delete the failed messages created before the given time."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def counts(self, now: float) -> OutboxCounts:
+        """Return the amount of messages in the outbox, per state."""
+        raise NotImplementedError
+
+
+class ConnectionOutboxStore(OutboxStoreInterface):
+    """Store the outbox using a connection on the calling thread."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the store, migrating the database if needed.
+
+        :param conn: The database connection the outbox is stored in.
+        """
+        self._conn = conn
+        database.migrate(conn)
+
+    async def enqueue(self, messages: Iterable[NewMessage], now: float) -> int:
+        """Add the messages to the outbox and commit them."""
+        added = database.enqueue_messages(self._conn, messages, now)
+        self._conn.commit()
+        return added
+
+    async def due(self, now: float, limit: int) -> list[OutboxMessage]:
+        """Return at most limit pending messages that are due at now."""
+        return database.due_messages(self._conn, now, limit)
+
+    async def record(
+        self,
+        delivered: Iterable[int],
+        retried: Iterable[tuple[int, float, str]],
+        failed: Iterable[tuple[int, str]],
+        postponed: Iterable[tuple[int, float]] = (),
+    ) -> None:
+        """Record the outcome of a delivery and commit it."""
+        database.record_deliveries(
+            self._conn, delivered, retried, failed, postponed
+        )
+        self._conn.commit()
+
+    async def expire(self, now: float) -> int:
+        """Fail the pending messages that expired before now."""
+        expired = database.expire_messages(self._conn, now)
+        self._conn.commit()
+        return expired
+
+    async def prune(self, before: float) -> int:
+        """Delete the failed messages created before the given time."""
+        pruned = database.prune_messages(self._conn, before)
+        self._conn.commit()
+        return pruned
+
+    async def counts(self, now: float) -> OutboxCounts:
+        """Return the amount of messages in the outbox, per state."""
+        return database.count_outbox(self._conn, now)
+
+
+class SQLiteOutboxStore(OutboxStoreInterface):
+    """Store the outbox in SQLite, off the event loop."""
+
+    def __init__(self, writer: DatabaseWriter):
+        """
+        Initialize the store.
+
+        :param writer: The writer running the queries on the database.
+        """
+        self._writer = writer
+
+    async def enqueue(self, messages: Iterable[NewMessage], now: float) -> int:
+        """Add the messages to the outbox, returning once committed."""
+        messages = tuple(messages)
+        return await self._writer.write(
+            lambda conn: database.enqueue_messages(conn, messages, now)
+        )
+
+    async def due(self, now: float, limit: int) -> list[OutboxMessage]:
+        """Return at most limit pending messages that are due at now."""
+        return await self._writer.read(
+            lambda conn: database.due_messages(conn, now, limit)
+        )
+
+    async def record(
+        self,
+        delivered: Iterable[int],
+        retried: Iterable[tuple[int, float, str]],
+        failed: Iterable[tuple[int, str]],
+        postponed: Iterable[tuple[int, float]] = (),
+    ) -> None:
+        """Record the outcome of a delivery, returning once committed."""
+        delivered, retried, failed, postponed = (
+            tuple(delivered),
+            tuple(retried),
+            tuple(failed),
+            tuple(postponed),
+        )
+        await self._writer.write(
+            lambda conn: database.record_deliveries(
+                conn, delivered, retried, failed, postponed
+            )
+        )
+
+    async def expire(self, now: float) -> int:
+        """Fail the pending messages that expired before now."""
+        return await self._writer.write(
+            lambda conn: database.expire_messages(conn, now)
+        )
+
+    async def prune(self, before: float) -> int:
+        """Delete the failed messages created before the given time."""
+        return await self._writer.write(
+            lambda conn: database.prune_messages(conn, before)
+        )
+
+    async def counts(self, now: float) -> OutboxCounts:
+        """Return the amount of messages in the outbox, per state."""
+        return await self._writer.read(
+            lambda conn: database.count_outbox(conn, now)
+        )
@@ -0,0 +1,162 @@
+"""
+Compute how the points of every driver and team progressed over a season.
+
+The results of every round are kept as small immutable records, which are
+turned into a dense (entries x rounds) matrix of points. The cumulative points
+are then computed with vectorized NumPy operations. NumPy is imported on the
+first computation, so the bot starts without it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, NamedTuple, Sequence
+
+if TYPE_CHECKING:
+    import ergast_py  # type: ignore
+    import numpy as np
+
+
+class RoundResult(NamedTuple):
+    """The points a driver scored for a team in a round."""
+
+    driver: str
+    constructor: str
+    points: float
+
+
+@dataclass(frozen=True)
+class RoundResults:
+    """The results of a round, including the sprint."""
+
+    season: int
+    round_no: int
+    race_name: str
+    results: tuple[RoundResult, ...]
+
+
+@dataclass(frozen=True)
+class Progression:
+    """The cumulative points of every entry after every round."""
+
+    season: int
+    # The rounds, in order
+    race_names: tuple[str, ...]
+    # The entries, ordered by their points after the last round
+    names: tuple[str, ...]
+    # The cumulative points, with a row per entry and a column per round
+    points: np.ndarray
+
+    @property
+    def round_no(self) -> int:
+        """Return the last round of the progression."""
+        return len(self.race_names)
+
+
+def round_results_from_ergast(
+    race: ergast_py.Race, sprints: Sequence[ergast_py.Race]
+) -> RoundResults:
+    """Convert the results of a race, and its sprint, from the Ergast API."""
+    results = [
+        result
+        for session in (
+            race.results,
+            *(sprint.sprint_results for sprint in sprints),
+        )
+        for result in session
+    ]
+    return RoundResults(
+        season=race.season,
+        round_no=race.round_no,
+        race_name=race.race_name,
+        results=tuple(
+            RoundResult(
+                driver=(
+                    f"{result.driver.given_name} "
+                    f"{result.driver.family_name}"
+                ),
+                constructor=result.constructor.name,
+                points=result.points,
+            )
+            for result in results
+        ),
+    )
+
+
+def _progression(
+    rounds: Sequence[RoundResults], name: Callable[[RoundResult], str]
+) -> Progression:
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    import numpy as np
+
+    names = sorted(
+        {name(result) for results in rounds for result in results.results}
+    )
+    rows = {entry: row for row, entry in enumerate(names)}
+
+    entries = [
+        (rows[name(result)], column, result.points)
+        for column, results in enumerate(rounds)
+        for result in results.results
+    ]
+    points = np.zeros((len(names), len(rounds)))
+    if entries:
+        row_index, column_index, round_points = np.array(entries).T
+        # Several drivers score for the same team in a round
+        np.add.at(
+            points,
+            (row_index.astype(int), column_index.astype(int)),
+            round_points,
+        )
+
+    cumulative = points.cumsum(axis=1)
+    totals = cumulative[:, -1] if len(rounds) else np.zeros(len(names))
+    order = np.argsort(-totals, kind="stable")
+    return Progression(
+        season=rounds[0].season if rounds else 0,
+        race_names=tuple(results.race_name for results in rounds),
+        names=tuple(names[row] for row in order),
+        points=cumulative[order],
+    )
+
+
+def driver_progression(rounds: Sequence[RoundResults]) -> Progression:
+    """Return the cumulative points of every driver after every round."""
+    return _progression(rounds, lambda result: result.driver)
+
+
+def constructor_progression(rounds: Sequence[RoundResults]) -> Progression:
+    """Return the cumulative points of every team after every round."""
+    return _progression(rounds, lambda result: result.constructor)
+
+
+class RoundResultsCache:
+    """
+    Keep the results of the rounds that were already fetched.
+
+    The results of a round do not change once it has been raced, so every
+    round is fetched only once.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._rounds: dict[tuple[int, int], RoundResults] = {}
+
+    def add(self, results: RoundResults) -> None:
+        """Keep the results of a round."""
+        self._rounds[(results.season, results.round_no)] = results
+
+    def missing(self, season: int, round_no: int) -> list[int]:
+        """Return the rounds up to round_no of which there are no results."""
+        return [
+            number
+            for number in range(1, round_no + 1)
+            if (season, number) not in self._rounds
+        ]
+
+    def rounds(self, season: int, round_no: int) -> list[RoundResults]:
+        """Return the known results of the rounds up to round_no, in order."""
+        return [
+            self._rounds[(season, number)]
+            for number in range(1, round_no + 1)
+            if (season, number) in self._rounds
+        ]
@@ -0,0 +1,77 @@
+"""
+Classify calendar events into typed sessions.
+
+The `sessions` module turns the events of the iCal feed, with summaries like
+"F1: Qualifying (Bahrain Grand Prix)", into `Session` records once per
+calendar snapshot, so the jobs never have to inspect event names themselves.
+"""
+import datetime
+import enum
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from f1_schedule_telegram_bot.ics_parser import ICalEvent
+
+_SUMMARY = re.compile(r"F1:\s*(?P<label>[^(]*?)\s*\((?P<grand_prix>[^)]*)\)")
+_CANCELED = re.compile(r"cancell?ed", re.IGNORECASE)
+
+
+class SessionKind(enum.Enum):
+    """The kinds of sessions during a race weekend."""
+
+    FP1 = "FP1"
+    FP2 = "FP2"
+    FP3 = "FP3"
+    SPRINT_SHOOTOUT = "Sprint Shootout"
+    SPRINT = "Sprint"
+    QUALIFYING = "Qualifying"
+    RACE = "Grand Prix"
+    OTHER = "Other"
+
+
+_KINDS = {kind.value.lower(): kind for kind in SessionKind}
+# The sprint shootout is called sprint qualifying since 2024
+_KINDS["sprint qualifying"] = SessionKind.SPRINT_SHOOTOUT
+
+
+class Session(NamedTuple):
+    """A single session of a race weekend, as listed in the calendar."""
+
+    uid: str
+    # The full summary of the event, e.g. "F1: FP1 (Bahrain Grand Prix)"
+    name: str
+    kind: SessionKind
+    # The session as named in the calendar, e.g. "FP1"
+    label: str
+    grand_prix: str
+    begin: datetime.datetime
+    end: datetime.datetime
+    sequence: Optional[str]
+    canceled: bool
+
+
+def classify(event: ICalEvent) -> Session:
+    """Turn a calendar event into a session."""
+    match = _SUMMARY.search(event.name)
+    if match is None:
+        label, grand_prix = event.name, ""
+    else:
+        label, grand_prix = match["label"], match["grand_prix"]
+
+    return Session(
+        uid=event.uid,
+        name=event.name,
+        kind=_KINDS.get(label.lower(), SessionKind.OTHER),
+        label=label,
+        grand_prix=grand_prix,
+        begin=event.begin,
+        end=event.end,
+        sequence=event.sequence,
+        canceled=event.status == "CANCELLED"
+        or _CANCELED.search(event.name) is not None,
+    )
+
+
+def classify_all(events: Iterable[ICalEvent]) -> tuple[Session, ...]:
+    """Turn all calendar events into sessions."""
+    return tuple(classify(event) for event in events)
@@ -0,0 +1,142 @@
+"""The standings_cache module contains the StandingsImageCache class."""
+import enum
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from f1_schedule_telegram_bot.consts import STANDINGS_CACHE_SIZE
+
+
+class ImageKind(enum.Enum):
+    """The kinds of standings images."""
+
+    DRIVERS = "drivers"
+    CONSTRUCTORS = "constructors"
+    DRIVER_PROGRESS = "driver progress"
+    CONSTRUCTOR_PROGRESS = "constructor progress"
+
+
+class ImageKey(NamedTuple):
+    """Identifies a rendered standings image."""
+
+    season: int
+    round_no: int
+    kind: ImageKind
+
+
+class StandingsImage(NamedTuple):
+    """A rendered standings image."""
+
+    key: ImageKey
+    image: bytes
+
+
+class StandingsImages(NamedTuple):
+    """
+    The images sent for /standings or /progress.
+
+    Images that are unavailable are None.
+    """
+
+    drivers: Optional[StandingsImage]
+    constructors: Optional[StandingsImage]
+
+
+@dataclass
+class StandingsCacheStats:
+    """Counters describing how the standings image cache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    # The time spent rendering images, in seconds
+    render_time: float = 0
+    last_render_time: float = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the fraction of requests served from the cache."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+
+class StandingsImageCache:
+    """
+    A bounded LRU cache of rendered standings images.
+
+    Standings only change once per race weekend, so the rendered images are
+    kept until a newer round is requested, at which point the images of all
+    older rounds are dropped. The cache also remembers the Telegram file_id of
+    every uploaded image, such that it can be sent again without uploading.
+    """
+
+    def __init__(self, max_size: int = STANDINGS_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        :param max_size: The maximum amount of images to keep.
+        """
+        self._max_size = max_size
+        self._images: OrderedDict[ImageKey, bytes] = OrderedDict()
+        self._file_ids: dict[ImageKey, str] = {}
+        self._latest: tuple[int, int] = (0, 0)
+        self.stats = StandingsCacheStats()
+
+    def __len__(self) -> int:
+        """Return the amount of cached images."""
+        return len(self._images)
+
+    def _invalidate_before(self, season: int, round_no: int) -> None:
+        self._latest = (season, round_no)
+        for key in list(self._images):
+            if (key.season, key.round_no) < self._latest:
+                del self._images[key]
+                self.stats.invalidations += 1
+        for key in list(self._file_ids):
+            if (key.season, key.round_no) < self._latest:
+                del self._file_ids[key]
+
+    def file_id(self, key: ImageKey) -> Optional[str]:
+        """Return the Telegram file_id of the image, if it was uploaded."""
+        return self._file_ids.get(key)
+
+    def remember_file_id(self, key: ImageKey, file_id: str) -> None:
+        """
+        Remember the file_id Telegram assigned to an uploaded image.
+
+        :param key: The season, round and kind of the image.
+        :param file_id: The file_id of the uploaded image.
+        """
+        # Do not resurrect the images of rounds that were already invalidated
+        if (key.season, key.round_no) >= self._latest:
+            self._file_ids[key] = file_id
+
+    async def get_or_render(
+        self, key: ImageKey, render: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Return the cached image for key, rendering it if it is not cached.
+
+        :param key: The season, round and kind of the image.
+        :param render: Renders the image when it is not in the cache.
+        """
+        if (key.season, key.round_no) > self._latest:
+            self._invalidate_before(key.season, key.round_no)
+
+        image = self._images.get(key)
+        if image is not None:
+            self.stats.hits += 1
+            self._images.move_to_end(key)
+            return image
+
+        self.stats.misses += 1
+        started = time.perf_counter()
+        image = await render()
+        self.stats.last_render_time = time.perf_counter() - started
+        self.stats.render_time += self.stats.last_render_time
+
+        self._images[key] = image
+        if len(self._images) > self._max_size:
+            self._images.popitem(last=False)
+        return image
@@ -0,0 +1,95 @@
+"""
+Plain standings data, as drawn by the draw_standings module.
+
+The ergast_py models are converted into these small immutable records once,
+such that the images can be drawn in another process without pickling the
+models of the Ergast client.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import ergast_py  # type: ignore
+
+
+class DriverRow(NamedTuple):
+    """A single driver in the driver standings."""
+
+    position: str
+    name: str
+    team: str
+    points: int
+
+
+class ConstructorRow(NamedTuple):
+    """A single team in the constructor standings."""
+
+    position: str
+    name: str
+    points: int
+    wins: int
+
+
+@dataclass(frozen=True)
+class DriverStandings:
+    """The driver standings after a round of a season."""
+
+    season: int
+    round_no: int
+    race_name: str
+    rows: tuple[DriverRow, ...]
+
+
+@dataclass(frozen=True)
+class ConstructorStandings:
+    """The constructor standings after a round of a season."""
+
+    season: int
+    round_no: int
+    race_name: str
+    rows: tuple[ConstructorRow, ...]
+
+
+def driver_standings_from_ergast(
+    standings_list: ergast_py.StandingsList, races: list[ergast_py.Race]
+) -> DriverStandings:
+    """Convert the driver standings returned by the Ergast API."""
+    return DriverStandings(
+        season=standings_list.season,
+        round_no=standings_list.round_no,
+        race_name=races[standings_list.round_no - 1].race_name,
+        rows=tuple(
+            DriverRow(
+                position=standing.position_text,
+                name=(
+                    f"{standing.driver.given_name} "
+                    f"{standing.driver.family_name}"
+                ),
+                team=standing.constructors[0].name,
+                points=int(standing.points),
+            )
+            for standing in standings_list.driver_standings
+        ),
+    )
+
+
+def constructor_standings_from_ergast(
+    standings_list: ergast_py.StandingsList, races: list[ergast_py.Race]
+) -> ConstructorStandings:
+    """Convert the constructor standings returned by the Ergast API."""
+    return ConstructorStandings(
+        season=standings_list.season,
+        round_no=standings_list.round_no,
+        race_name=races[standings_list.round_no - 1].race_name,
+        rows=tuple(
+            ConstructorRow(
+                position=standing.position_text,
+                name=standing.constructor.name,
+                points=int(standing.points),
+                wins=standing.wins,
+            )
+            for standing in standings_list.constructor_standings
+        ),
+    )
@@ -0,0 +1,126 @@
+"""The standings_fetcher module contains the StandingsFetcher class."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional, Union
+
+from f1_schedule_telegram_bot.consts import ERGAST_TIMEOUT
+from f1_schedule_telegram_bot.points_progression import (
+    RoundResults,
+    round_results_from_ergast,
+)
+
+if TYPE_CHECKING:
+    import ergast_py  # type: ignore
+
+
+class StandingsData(NamedTuple):
+    """The data needed to draw the standings, None for calls that failed."""
+
+    constructor_standing: Optional[ergast_py.StandingsList]
+    driver_standing: Optional[ergast_py.StandingsList]
+    races: Optional[list[ergast_py.Race]]
+
+
+class StandingsFetcher:
+    """
+    Fetch the current standings from the Ergast API without blocking the loop.
+
+    The ergast_py client is synchronous, so every call runs in a worker thread
+    and the calls are issued concurrently. A call that fails or takes longer
+    than the timeout results in None, rather than failing the whole request.
+    """
+
+    def __init__(
+        self,
+        ergast: Optional[ergast_py.Ergast] = None,
+        timeout: float = ERGAST_TIMEOUT,
+    ):
+        """
+        Initialize the fetcher.
+
+        :param ergast: The Ergast API client to use, by default a client is
+            created on the first call, such that ergast_py is only imported
+            once the standings are requested.
+        :param timeout: The maximum time in seconds to wait for a single call.
+        """
+        self._ergast = ergast
+        self._timeout = timeout
+        self._client_lock = threading.Lock()
+
+    def _client(self) -> ergast_py.Ergast:
+        # The first calls run concurrently in worker threads
+        with self._client_lock:
+            if self._ergast is None:
+                # pylint: disable=import-outside-toplevel,redefined-outer-name
+                import ergast_py  # type: ignore
+
+                self._ergast = ergast_py.Ergast()
+            return self._ergast
+
+    def _query(self, season: Union[int, str] = "current") -> ergast_py.Ergast:
+        # The client builds its queries in place, so every thread gets a copy
+        # with its own parameters
+        query = copy.copy(self._client())
+        query.reset()
+        return query.season(season)
+
+    async def _call(self, name: str, call: Callable[[], Any]) -> Optional[Any]:
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(call), timeout=self._timeout
+            )
+        except asyncio.TimeoutError:
+            logging.warning(
+                "Ergast %s timed out after %ss", name, self._timeout
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            logging.warning("Ergast %s failed: %s", name, err)
+        return None
+
+    async def fetch(self) -> StandingsData:
+        """Fetch the standings and races of the current season concurrently."""
+        constructor_standing, driver_standing, races = await asyncio.gather(
+            self._call(
+                "get_constructor_standing",
+                lambda: self._query().get_constructor_standing(),
+            ),
+            self._call(
+                "get_driver_standing",
+                lambda: self._query().get_driver_standing(),
+            ),
+            self._call("get_races", lambda: self._query().get_races()),
+        )
+        return StandingsData(constructor_standing, driver_standing, races)
+
+    async def fetch_driver_standing(self) -> Optional[ergast_py.StandingsList]:
+        """Fetch the driver standings of the current season."""
+        return await self._call(
+            "get_driver_standing", lambda: self._query().get_driver_standing()
+        )
+
+    async def fetch_round(
+        self, season: int, round_no: int
+    ) -> Optional[RoundResults]:
+        """
+        Fetch the results of a round, including the sprint.
+
+        :param season: The season of the round.
+        :param round_no: The number of the round within the season.
+        """
+        race, sprints = await asyncio.gather(
+            self._call(
+                "get_result",
+                lambda: self._query(season).round(round_no).get_result(),
+            ),
+            self._call(
+                "get_sprints",
+                lambda: self._query(season).round(round_no).get_sprints(),
+            ),
+        )
+        if race is None or sprints is None:
+            return None
+        return round_results_from_ergast(race, sprints)
@@ -0,0 +1,148 @@
+"""The standings_renderer module contains the StandingsRenderer class."""
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
+from types import ModuleType
+from typing import Callable, Optional, TypeVar
+
+from f1_schedule_telegram_bot.consts import RENDER_WORKERS
+from f1_schedule_telegram_bot.image_encoding import (
+    EncodedImage,
+    EncodingOptions,
+)
+from f1_schedule_telegram_bot.points_progression import Progression
+from f1_schedule_telegram_bot.standings_data import (
+    ConstructorStandings,
+    DriverStandings,
+)
+
+Standings = TypeVar(
+    "Standings", DriverStandings, ConstructorStandings, Progression
+)
+
+
+def _draw_standings() -> ModuleType:
+    # Pillow and NumPy are imported on the first render, rather than when the
+    # bot starts
+    # pylint: disable=import-outside-toplevel
+    from f1_schedule_telegram_bot import draw_standings
+
+    return draw_standings
+
+
+class StandingsRenderer:
+    """
+    Render the standings images outside of the event loop.
+
+    Drawing and encoding the images is CPU bound, so the images are rendered
+    in a pool of worker processes. When no process pool can be started, or the
+    pool breaks, rendering falls back to a thread pool.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[concurrent.futures.Executor] = None,
+        max_workers: int = RENDER_WORKERS,
+        encoding: EncodingOptions = EncodingOptions(),
+    ):
+        """
+        Initialize the renderer, the pool is started on the first render.
+
+        :param executor: The executor to render in, by default a process pool.
+        :param max_workers: The amount of workers of the default pool.
+        :param encoding: How to encode the rendered images.
+        """
+        self._executor = executor
+        self._max_workers = max_workers
+        self._encoding = encoding
+
+    def _start_executor(self) -> concurrent.futures.Executor:
+        try:
+            # The bot runs threads, which should not be forked along
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        except (ImportError, NotImplementedError, OSError) as err:
+            logging.warning(
+                "Unable to start a process pool, rendering in threads: %s",
+                err,
+            )
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers
+            )
+        return self._executor
+
+    async def _run(
+        self,
+        draw: Callable[[Standings, EncodingOptions], EncodedImage],
+        standings: Standings,
+    ) -> EncodedImage:
+        executor = self._executor or self._start_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, draw, standings, self._encoding
+            )
+        except BrokenProcessPool as err:
+            logging.warning(
+                "The process pool broke, rendering in threads: %s", err
+            )
+            if executor is self._executor:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers
+                )
+            return await loop.run_in_executor(
+                self._executor, draw, standings, self._encoding
+            )
+
+    async def _render(
+        self,
+        draw: Callable[[Standings, EncodingOptions], EncodedImage],
+        standings: Standings,
+    ) -> bytes:
+        image = await self._run(draw, standings)
+        logging.info(
+            "Rendered %s of round %d: %d bytes, encoded in %.1f ms",
+            type(standings).__name__,
+            standings.round_no,
+            len(image.data),
+            image.encode_time * 1000,
+        )
+        return image.data
+
+    async def render_drivers(self, standings: DriverStandings) -> bytes:
+        """Render the driver standings as an image."""
+        return await self._render(
+            _draw_standings().draw_driver_standings, standings
+        )
+
+    async def render_constructors(
+        self, standings: ConstructorStandings
+    ) -> bytes:
+        """Render the constructor standings as an image."""
+        return await self._render(
+            _draw_standings().draw_constructor_standings, standings
+        )
+
+    async def render_driver_progress(self, progression: Progression) -> bytes:
+        """Render the points of the drivers after every round as a chart."""
+        return await self._render(
+            _draw_standings().draw_driver_progress, progression
+        )
+
+    async def render_constructor_progress(
+        self, progression: Progression
+    ) -> bytes:
+        """Render the points of the teams after every round as a chart."""
+        return await self._render(
+            _draw_standings().draw_constructor_progress, progression
+        )
+
+    def close(self) -> None:
+        """Shut down the workers of the pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
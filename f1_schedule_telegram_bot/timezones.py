@@ -0,0 +1,37 @@
+"""
+Resolve the timezones of the chats and render messages per timezone.
+
+Every chat can choose the timezone the times in the messages are shown in.
+A broadcast renders its message once for every timezone in use, and pairs
+that message with all chats in the timezone, so the cost of rendering grows
+with the amount of timezones instead of the amount of chats.
+"""
+from typing import Callable, Iterable, Iterator, Optional
+
+import pytz  # type: ignore
+
+from f1_schedule_telegram_bot.broadcaster import Recipient
+
+# The timezones by their lowercase name, such that the lookup ignores case
+_TIMEZONES = {name.lower(): name for name in pytz.all_timezones}
+
+
+def resolve_timezone(name: str) -> Optional[str]:
+    """Return the canonical name of a timezone, or None if it is unknown."""
+    return _TIMEZONES.get(name.strip().lower())
+
+
+def render_per_timezone(
+    groups: Iterable[tuple[str, Iterable[Recipient]]],
+    render: Callable[[str], str],
+) -> Iterator[tuple[Recipient, str]]:
+    """
+    Pair every chat with the message rendered for its timezone.
+
+    :param groups: The chats, grouped by their timezone.
+    :param render: Renders the message for the given timezone.
+    """
+    for timezone, chats in groups:
+        message = render(timezone)
+        for chat in chats:
+            yield chat, message
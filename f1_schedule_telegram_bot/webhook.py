@@ -0,0 +1,80 @@
+"""
+Read the settings of the webhook the bot can receive its updates through.
+
+By default the bot polls Telegram for updates. When WEBHOOK_URL is set, the
+bot starts an HTTP server instead, and Telegram posts every update to that
+URL as it happens. The URL is the public address of the server, e.g. behind a
+reverse proxy that terminates TLS, and its path is the path the server
+listens on. Telegram sends WEBHOOK_SECRET along with every update, so
+requests that do not come from Telegram are rejected.
+"""
+import os
+import re
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from f1_schedule_telegram_bot.consts import WEBHOOK_LISTEN, WEBHOOK_PORT
+
+# The characters Telegram allows in a secret token
+_SECRET_TOKEN = re.compile(r"[A-Za-z0-9_-]{1,256}")
+
+
+@dataclass(frozen=True)
+class WebhookSettings:
+    """The settings of the webhook server."""
+
+    # The public URL Telegram posts the updates to
+    url: str
+    secret_token: str
+    listen: str = WEBHOOK_LISTEN
+    port: int = WEBHOOK_PORT
+
+    @property
+    def url_path(self) -> str:
+        """Return the path the server receives the updates on."""
+        return urllib.parse.urlsplit(self.url).path.strip("/")
+
+    def options(self) -> dict[str, Any]:
+        """Return the arguments to start the webhook of an application."""
+        return {
+            "listen": self.listen,
+            "port": self.port,
+            "url_path": self.url_path,
+            "webhook_url": self.url,
+            "secret_token": self.secret_token,
+        }
+
+
+def read_webhook_settings(
+    environ: Mapping[str, str] = os.environ
+) -> Optional[WebhookSettings]:
+    """
+    Return the webhook settings, or None if the bot should poll for updates.
+
+    :param environ: The environment variables to read the settings from.
+    """
+    url = environ.get("WEBHOOK_URL")
+    if not url:
+        return None
+    if urllib.parse.urlsplit(url).scheme != "https":
+        raise EnvironmentError("WEBHOOK_URL must be an https URL!")
+
+    secret_token = environ.get("WEBHOOK_SECRET")
+    if not secret_token:
+        raise EnvironmentError("No WEBHOOK_SECRET in environment!")
+    if _SECRET_TOKEN.fullmatch(secret_token) is None:
+        raise EnvironmentError(
+            "WEBHOOK_SECRET must be 1-256 letters, digits, _ or -!"
+        )
+
+    port = environ.get("WEBHOOK_PORT") or str(WEBHOOK_PORT)
+    if not port.isdigit():
+        raise EnvironmentError("WEBHOOK_PORT must be a port number!")
+
+    return WebhookSettings(
+        url=url,
+        secret_token=secret_token,
+        listen=environ.get("WEBHOOK_LISTEN") or WEBHOOK_LISTEN,
+        port=int(port),
+    )
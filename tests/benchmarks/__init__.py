@@ -0,0 +1 @@
+"""Benchmarks for the hot paths of the bot, run from the tests directory."""
@@ -0,0 +1,65 @@
+"""
+Benchmark importing and exporting 200k chats with the chats command.
+
+Imports a CSV file of 200k chats into an empty database with several batch
+sizes, then exports them again. The database is a file with the pragmas the
+bot uses. Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_chat_import
+"""
+import os
+import tempfile
+import time
+
+from f1_schedule_telegram_bot.chats_cli import main as chats
+
+CHATS = 200_000
+BATCH_SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def write_csv(path: str) -> None:
+    """Write a CSV file with CHATS chats."""
+    with open(path, "w", encoding="UTF-8", newline="") as output:
+        output.write("chat_id,type,name\n")
+        for chat_id in range(1, CHATS + 1):
+            output.write(f"{chat_id},private,chat{chat_id}\n")
+
+
+def timed(args: list[str]) -> float:
+    """Run the chats command, returning the time it took in seconds."""
+    started = time.perf_counter()
+    chats(args)
+    return time.perf_counter() - started
+
+
+def main():
+    """Print the import throughput per batch size, and the export time."""
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "chats.csv")
+        write_csv(source)
+
+        print(f"{'batch size':>10} {'import (ms)':>12} {'chats/s':>9}")
+        for batch_size in BATCH_SIZES:
+            database = os.path.join(directory, f"{batch_size}.db")
+            duration = timed(
+                [
+                    "--database",
+                    database,
+                    "import",
+                    source,
+                    "--batch-size",
+                    str(batch_size),
+                ]
+            )
+            print(
+                f"{batch_size:>10} {duration * 1000:>12.0f} "
+                f"{CHATS / duration:>9.0f}"
+            )
+
+        exported = os.path.join(directory, "exported.csv")
+        duration = timed(["--database", database, "export", exported])
+        print(f"export: {duration * 1000:.0f} ms, {CHATS / duration:.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark listing the recipients of a broadcast to 100k chats.
+
+Compares database.list_chats, which queries SQLite on every broadcast, with
+the in-memory ChatRegistry, by time per listing and by the memory that holds
+all chats. Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_chat_registry
+"""
+import timeit
+import tracemalloc
+
+from benchmarks.synthetic import database_with_chats
+
+from f1_schedule_telegram_bot.chat_registry import ChatRegistry
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.database import list_chats
+
+CHATS = 100_000
+REPEAT = 10
+
+
+def main():
+    """Print the time per listing and memory of both approaches."""
+    dbconn = database_with_chats(CHATS)
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    # The memory that stays in use to hold all chats
+    tracemalloc.start()
+    len(registry)
+    registry_memory, _ = tracemalloc.get_traced_memory()
+    chats = list_chats(dbconn)
+    list_memory = tracemalloc.get_traced_memory()[0] - registry_memory
+    tracemalloc.stop()
+    assert len(chats) == len(registry) == CHATS
+    del chats
+
+    list_time = timeit.timeit(lambda: list_chats(dbconn), number=REPEAT)
+    registry_time = timeit.timeit(
+        lambda: sum(1 for _ in registry.recipients()), number=REPEAT
+    )
+    print(f"{'approach':>14} {'listing (ms)':>13} {'memory (KiB)':>13}")
+    print(
+        f"{'list_chats':>14} {list_time / REPEAT * 1000:>13.1f} "
+        f"{list_memory / 1024:>13.0f}"
+    )
+    print(
+        f"{'ChatRegistry':>14} {registry_time / REPEAT * 1000:>13.1f} "
+        f"{registry_memory / 1024:>13.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark a burst of chat registrations written to SQLite.
+
+Compares committing every registration on its own, as the bot did before the
+SQLiteChatStore, with committing the queued registrations together. Both run
+on the thread of the DatabaseWriter, with the same pragmas. Run from the tests
+directory:
+
+    poetry run python -m benchmarks.bench_chat_store
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from f1_schedule_telegram_bot.chat_store import SQLiteChatStore
+from f1_schedule_telegram_bot.consts import WRITE_BATCH_SIZE
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+
+CHATS = 5_000
+
+
+async def register_all(path: str, batch_size: int) -> tuple[float, int]:
+    """Register all chats at once, returning the time and commits taken."""
+    writer = DatabaseWriter(path, batch_size=batch_size)
+    store = SQLiteChatStore(writer)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            store.save_chat(DatabaseChat(chat_id, "private", f"chat{chat_id}"))
+            for chat_id in range(1, CHATS + 1)
+        )
+    )
+    duration = time.perf_counter() - started
+    await store.close()
+    return duration, writer.stats.commits
+
+
+def main():
+    """Print the time and commits of both approaches."""
+    print(f"{'approach':>14} {'time (ms)':>10} {'commits':>8} {'chats/s':>9}")
+    for name, batch_size in (
+        ("commit each", 1),
+        ("group commit", WRITE_BATCH_SIZE),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            duration, commits = asyncio.run(
+                register_all(os.path.join(directory, "f1.db"), batch_size)
+            )
+        print(
+            f"{name:>14} {duration * 1000:>10.0f} {commits:>8} "
+            f"{CHATS / duration:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the memory used to read 1M chats from the database.
+
+Compares the previous list_chats, which fetched all rows and then mapped
+them onto chat objects with a __dict__ each, with the tuple-backed
+list_chats and with streaming the chats through iter_chats. Run from the
+tests directory:
+
+    poetry run python -m benchmarks.bench_database_chats
+"""
+import time
+import tracemalloc
+
+from benchmarks.synthetic import database_with_chats
+
+from f1_schedule_telegram_bot.consts import DEV_CHAT_NAME
+from f1_schedule_telegram_bot.database import iter_chats, list_chats
+
+CHATS = 1_000_000
+
+
+class DictChat:
+    """The chat record as it was, with an attribute dictionary per chat."""
+
+    def __init__(self, chat_id, chat_type, name):
+        self.chat_id = chat_id
+        self.chat_type = chat_type
+        self.name = name
+
+
+def fetchall_chats(conn):
+    """Read the chats the way list_chats did before iter_chats."""
+    cur = conn.cursor()
+    res = cur.execute(
+        "SELECT chat_id, type, name FROM chats WHERE name!=:name",
+        {"name": DEV_CHAT_NAME},
+    )
+    rows = res.fetchall()
+    cur.close()
+    return list(
+        map(
+            lambda row: DictChat(
+                chat_id=row[0], chat_type=row[1], name=row[2]
+            ),
+            rows,
+        )
+    )
+
+
+def count_chats(conn):
+    """Stream all chats without holding on to them."""
+    return sum(1 for _ in iter_chats(conn))
+
+
+def measure(read, conn):
+    """Return the time in seconds and peak memory in bytes of one read."""
+    started = time.perf_counter()
+    read(conn)
+    duration = time.perf_counter() - started
+
+    # Tracing slows down reading, so memory is measured in a separate run
+    tracemalloc.start()
+    read(conn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    """Print the time and peak memory of every way of reading the chats."""
+    conn = database_with_chats(CHATS)
+    print(f"{'approach':>16} {'time (ms)':>10} {'peak (MiB)':>11}")
+    for name, read in (
+        ("fetchall + map", fetchall_chats),
+        ("list_chats", list_chats),
+        ("iter_chats", count_chats),
+    ):
+        duration, peak = measure(read, conn)
+        print(f"{name:>16} {duration * 1000:>10.0f} {peak / 2**20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
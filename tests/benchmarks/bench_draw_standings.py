@@ -0,0 +1,84 @@
+"""
+Benchmark rendering the standings images.
+
+Reports the render time of both tables, the time it takes to load the font,
+which used to happen on every render, and the width of the images against
+the width estimated from a fixed character width. Then compares the size and
+encode time of the encodings of the driver standings. Run from the tests
+directory:
+
+    poetry run python -m benchmarks.bench_draw_standings
+"""
+import io
+import timeit
+
+from benchmarks.synthetic import constructor_standings, driver_standings
+from PIL import Image, ImageFont  # type: ignore
+
+from f1_schedule_telegram_bot.draw_standings import (
+    draw_constructor_standings,
+    draw_driver_standings,
+)
+from f1_schedule_telegram_bot.draw_table import FONT_PATH, FONT_SIZE
+from f1_schedule_telegram_bot.image_encoding import (
+    EncodingOptions,
+    ImageFormat,
+)
+
+REPEAT = 50
+# The character width the images used to be sized with
+CHAR_WIDTH = 8
+ENCODINGS = {
+    "RGB PNG": EncodingOptions(colors=None, optimize=False),
+    "optimized RGB PNG": EncodingOptions(colors=None),
+    "16 colour PNG": EncodingOptions(colors=16),
+    "64 colour PNG": EncodingOptions(colors=64),
+    "lossless WebP": EncodingOptions(
+        image_format=ImageFormat.WEBP, colors=None
+    ),
+}
+
+
+def main():
+    """Print the render time and image width of both tables."""
+    font_time = timeit.timeit(
+        lambda: ImageFont.truetype(str(FONT_PATH), FONT_SIZE), number=REPEAT
+    )
+    print(f"loading the font: {font_time / REPEAT * 1000:.2f} ms")
+
+    print(
+        f"{'table':>13} {'render (ms)':>12} "
+        f"{'width (px)':>11} {'estimated (px)':>15}"
+    )
+    for name, title, draw, standings in (
+        ("drivers", "Driver", draw_driver_standings, driver_standings()),
+        (
+            "constructors",
+            "Constructor",
+            draw_constructor_standings,
+            constructor_standings(),
+        ),
+    ):
+        draw(standings)
+        render_time = timeit.timeit(lambda: draw(standings), number=REPEAT)
+        width = Image.open(io.BytesIO(draw(standings).data)).width
+        title = f"{title} standing after the {standings.race_name}"
+        print(
+            f"{name:>13} {render_time / REPEAT * 1000:>12.2f} "
+            f"{width:>11} {len(title) * CHAR_WIDTH + 20:>15}"
+        )
+
+    print(f"\n{'encoding':>18} {'size (B)':>9} {'encode (ms)':>12}")
+    for name, encoding in ENCODINGS.items():
+        images = [
+            draw_driver_standings(driver_standings(), encoding)
+            for _ in range(REPEAT)
+        ]
+        encode_time = sum(image.encode_time for image in images) / REPEAT
+        print(
+            f"{name:>18} {len(images[0].data):>9} {encode_time * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
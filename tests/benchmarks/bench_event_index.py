@@ -0,0 +1,62 @@
+"""
+Benchmark the EventIndex queries against scanning the sorted calendar.
+
+Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_event_index
+"""
+import timeit
+
+import arrow
+from benchmarks.synthetic import multi_season_feed
+
+from f1_schedule_telegram_bot.event_index import EventIndex
+from f1_schedule_telegram_bot.ics_parser import parse_calendar
+from f1_schedule_telegram_bot.sessions import SessionKind, classify_all
+
+SEASONS = (1, 10, 50, 100)
+REPEAT = 20
+
+
+def scan(events, now):
+    """Query the calendar the way the jobs did before the index."""
+    sorted_events = sorted(events, key=lambda event: event.begin)
+    weekend = [
+        event
+        for event in sorted_events
+        if now < event.begin <= now.shift(days=4)
+    ]
+    for event in sorted_events:
+        if now < event.begin and "f1: grand prix" in event.name.lower():
+            return weekend, event
+    return weekend, None
+
+
+def query(index, now):
+    """Query the calendar using the index."""
+    return (
+        index.between(now, now.shift(days=4)),
+        index.next_of_type(SessionKind.RACE, now),
+    )
+
+
+def main():
+    """Print the time per query for a growing amount of seasons."""
+    now = arrow.get("2023-10-19T20:00:00+00:00")
+    print(f"{'seasons':>8} {'events':>8} {'scan (ms)':>10} {'index (ms)':>11}")
+    for seasons in SEASONS:
+        events = parse_calendar(multi_season_feed(seasons)).events
+        index = EventIndex(classify_all(events))
+        assert scan(events, now)[1].uid == query(index, now)[1].uid
+
+        scan_time = timeit.timeit(lambda: scan(events, now), number=REPEAT)
+        index_time = timeit.timeit(lambda: query(index, now), number=REPEAT)
+        print(
+            f"{seasons:>8} {len(events):>8} "
+            f"{scan_time / REPEAT * 1000:>10.3f} "
+            f"{index_time / REPEAT * 1000:>11.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
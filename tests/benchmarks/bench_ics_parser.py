@@ -0,0 +1,51 @@
+"""
+Benchmark the streaming ics_parser against ics.Calendar.
+
+Compares the parse time and the peak memory usage on the bundled calendar and
+on a feed 20 times its size. Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_ics_parser
+"""
+import time
+import tracemalloc
+
+from benchmarks.synthetic import multi_season_feed
+from ics import Calendar  # type: ignore
+
+from f1_schedule_telegram_bot.ics_parser import parse_calendar
+
+PARSERS = {
+    "ics.Calendar": Calendar,
+    "parse_calendar": parse_calendar,
+}
+
+
+def measure(parser, feed):
+    """Return the time in seconds and peak memory in bytes of one parse."""
+    started = time.perf_counter()
+    parser(feed)
+    duration = time.perf_counter() - started
+
+    # Tracing slows down parsing, so memory is measured in a separate run
+    tracemalloc.start()
+    parser(feed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    """Print the parse time and peak memory of both parsers."""
+    print(f"{'feed':>10} {'parser':>15} {'time (ms)':>10} {'peak (KiB)':>11}")
+    for seasons in (1, 20):
+        feed = multi_season_feed(seasons)
+        for name, parser in PARSERS.items():
+            duration, peak = measure(parser, feed)
+            print(
+                f"{seasons:>9}x {name:>15} "
+                f"{duration * 1000:>10.1f} {peak / 1024:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark the responsiveness of the event loop during a burst of renders.
+
+A ticker measures how late the event loop wakes it up, while a burst of
+standings images is rendered inline, in a thread pool and in a process pool.
+Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_standings_renderer
+"""
+import asyncio
+import concurrent.futures
+import os
+import time
+
+from benchmarks.synthetic import driver_standings
+
+from f1_schedule_telegram_bot.draw_standings import draw_driver_standings
+from f1_schedule_telegram_bot.standings_renderer import StandingsRenderer
+
+BURST = 32
+TICK = 0.005
+
+
+class InlineRenderer:
+    """Render on the event loop, as the bot did before the renderer."""
+
+    async def render_drivers(self, standings):
+        """Render the driver standings as an image."""
+        return draw_driver_standings(standings).data
+
+    def close(self):
+        """Nothing to shut down."""
+
+
+async def ticker(wakeups):
+    """Record every time the event loop resumes the ticker."""
+    while True:
+        wakeups.append(time.perf_counter())
+        await asyncio.sleep(TICK)
+
+
+async def measure(renderer):
+    """Return the duration of the burst and the worst loop lag in seconds."""
+    standings = driver_standings()
+    # Start the workers outside of the measurement
+    await renderer.render_drivers(standings)
+
+    wakeups = []
+    tick = asyncio.create_task(ticker(wakeups))
+    await asyncio.sleep(TICK)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(renderer.render_drivers(standings) for _ in range(BURST))
+    )
+    finished = time.perf_counter()
+    tick.cancel()
+    renderer.close()
+
+    # A ticker that is still waiting to be resumed is late as well
+    wakeups.append(finished)
+    lag = max(later - earlier for earlier, later in zip(wakeups, wakeups[1:]))
+    return finished - started, lag - TICK
+
+
+async def main():
+    """Print the burst duration and worst loop lag of each backend."""
+    workers = os.cpu_count() or 1
+    renderers = {
+        "inline": InlineRenderer(),
+        "threads": StandingsRenderer(
+            concurrent.futures.ThreadPoolExecutor(workers)
+        ),
+        "processes": StandingsRenderer(max_workers=workers),
+    }
+    print(f"{'backend':>10} {'burst (ms)':>11} {'max lag (ms)':>13}")
+    for name, renderer in renderers.items():
+        duration, lag = await measure(renderer)
+        print(f"{name:>10} {duration * 1000:>11.1f} {lag * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
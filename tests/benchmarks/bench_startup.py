@@ -0,0 +1,111 @@
+"""
+Benchmark the start of the bot, from a fresh interpreter until it is ready.
+
+Every run starts a new interpreter, which imports the bot, builds the
+application and runs its post_init, restoring the notifications and
+registering the dev chat. Polling would start with the first getUpdates
+call right after, so the measured time is all the time a deploy spends
+before the bot can respond. Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_startup
+"""
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import NamedTuple
+
+# The time a start may take, in seconds, as enforced by the test suite with
+# a generous margin, as the fastest of REPEAT starts
+STARTUP_BUDGET = 2.0
+# The dependencies that are imported once a command or job needs them
+LAZY_MODULES = ("ergast_py", "numpy", "PIL")
+REPEAT = 5
+
+_PROJECT = pathlib.Path(__file__).resolve().parents[2]
+
+
+class Startup(NamedTuple):
+    """The time spent starting the bot, in seconds."""
+
+    imported: float
+    ready: float
+    # The dependencies that are loaded while the bot is started
+    modules: tuple[str, ...]
+
+
+async def _start(path: str) -> None:
+    # pylint: disable=import-outside-toplevel
+    started = time.perf_counter()
+    from f1_schedule_telegram_bot import main
+    from f1_schedule_telegram_bot.chat_store import SQLiteChatStore
+    from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+    from f1_schedule_telegram_bot.ical_fetcher import ICalFetcher
+    from f1_schedule_telegram_bot.message_handler import MessageHandler
+    from f1_schedule_telegram_bot.notification_store import (
+        SQLiteNotificationStore,
+    )
+
+    imported = time.perf_counter() - started
+    writer = DatabaseWriter(path)
+    bot = main.F1ScheduleTelegramBot(
+        chat_store=SQLiteChatStore(writer),
+        ergast=None,
+        message_handler=MessageHandler(),
+        ical_fetcher=ICalFetcher(),
+        notification_store=SQLiteNotificationStore(writer),
+    )
+    application = bot.build_application("0:benchmark", -1)
+    await application.post_init(application)
+    ready = time.perf_counter() - started
+    await writer.close()
+    print(
+        json.dumps(
+            Startup(
+                imported,
+                ready,
+                tuple(name for name in LAZY_MODULES if name in sys.modules),
+            )
+        )
+    )
+
+
+def measure_startup() -> Startup:
+    """Start the bot in a fresh interpreter and return how long it took."""
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import asyncio, sys;"
+                "from benchmarks.bench_startup import _start;"
+                "asyncio.run(_start(sys.argv[1]))",
+                os.path.join(directory, "f1.db"),
+            ],
+            check=True,
+            capture_output=True,
+            cwd=pathlib.Path(__file__).parents[1],
+            env={**os.environ, "PYTHONPATH": str(_PROJECT)},
+            text=True,
+        ).stdout
+    imported, ready, modules = json.loads(output.splitlines()[-1])
+    return Startup(imported, ready, tuple(modules))
+
+
+def main():
+    """Print the median time to import the bot and to get it ready."""
+    runs = [measure_startup() for _ in range(REPEAT)]
+    imported = statistics.median(run.imported for run in runs)
+    ready = statistics.median(run.ready for run in runs)
+    print(f"{'stage':>8} {'time (ms)':>10}")
+    print(f"{'import':>8} {imported * 1000:>10.1f}")
+    print(f"{'ready':>8} {ready * 1000:>10.1f}")
+    print(f"lazy modules loaded: {', '.join(runs[0].modules) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark rendering the weekend calendar for 100k chats in 30 timezones.
+
+Compares rendering the message for every chat in its own timezone with
+rendering it once per timezone and sharing it between the chats in that
+timezone, by the time to pair every chat with its message and by the amount
+of rendered messages. Run from the tests directory:
+
+    poetry run python -m benchmarks.bench_timezone_broadcast
+"""
+import time
+
+import arrow
+import pytz  # type: ignore
+from benchmarks.synthetic import bundled_feed, database_with_chats
+
+from f1_schedule_telegram_bot.chat_registry import ChatRegistry
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.event_index import EventIndex
+from f1_schedule_telegram_bot.ics_parser import parse_calendar
+from f1_schedule_telegram_bot.sessions import SessionKind, classify_all
+from f1_schedule_telegram_bot.timezones import render_per_timezone
+
+CHATS = 100_000
+TIMEZONES = pytz.common_timezones[::10][:30]
+
+
+def weekend_sessions():
+    """Return the quali and race of the United States Grand Prix."""
+    index = EventIndex(classify_all(parse_calendar(bundled_feed()).events))
+    utcnow = arrow.get("2023-10-19T20:00:00+00:00")
+    return [
+        session
+        for session in index.between(utcnow, utcnow.shift(days=4))
+        if session.kind in (SessionKind.QUALIFYING, SessionKind.RACE)
+    ]
+
+
+def main():
+    """Print the time and rendered messages of both approaches."""
+    sessions = weekend_sessions()
+    registry = ChatRegistry(
+        ConnectionChatStore(database_with_chats(CHATS, TIMEZONES))
+    )
+    rendered = 0
+
+    def render(timezone: str) -> str:
+        nonlocal rendered
+        rendered += 1
+        message = f"<b>{sessions[0].grand_prix}</b>\n"
+        for session in sessions:
+            begin = arrow.get(session.begin).to(timezone)
+            message += f"{session.label}: {begin.format('HH:mm')}\n"
+        return message
+
+    def per_chat():
+        return (
+            (chat, render(chat.timezone)) for chat in registry.recipients()
+        )
+
+    def per_timezone():
+        return render_per_timezone(registry.by_timezone(), render)
+
+    len(registry)
+    print(f"{'approach':>13} {'time (ms)':>10} {'rendered':>9}")
+    for name, messages in (
+        ("per chat", per_chat),
+        ("per timezone", per_timezone),
+    ):
+        rendered = 0
+        started = time.perf_counter()
+        paired = sum(1 for _ in messages())
+        duration = time.perf_counter() - started
+        assert paired == CHATS
+        print(f"{name:>13} {duration * 1000:>10.1f} {rendered:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the results of the benchmark suite with the local baseline.
+
+Reads the JSON written by pytest-benchmark and compares the median round of
+every benchmark with the baseline, as the median also shows a benchmark
+that is slowed down in some of its rounds. Exits with status 1 when any
+benchmark is more than THRESHOLD slower than the baseline.
+
+The timings depend on the machine, so the baseline is recorded locally and
+not committed: pass --update to store the results as the baseline, first on
+a clean checkout and again after an intended change. Run from the tests
+directory:
+
+    poetry run pytest benchmarks --benchmark-only \\
+        --benchmark-json=benchmarks/results.json
+    poetry run python -m benchmarks.compare benchmarks/results.json
+"""
+import argparse
+import json
+import sys
+
+BASELINE = "benchmarks/baseline.json"
+THRESHOLD = 0.25
+
+
+def read_results(path: str) -> dict[str, float]:
+    """Return the median round in seconds of every benchmark."""
+    with open(path, "r", encoding="UTF-8") as results:
+        benchmarks = json.load(results)["benchmarks"]
+    return {
+        benchmark["name"]: benchmark["stats"]["median"]
+        for benchmark in benchmarks
+    }
+
+
+def read_baseline(path: str) -> dict[str, float]:
+    """Return the baseline, the median round in seconds of every benchmark."""
+    with open(path, "r", encoding="UTF-8") as baseline:
+        return json.load(baseline)
+
+
+def write_baseline(path: str, results: dict[str, float]) -> None:
+    """Store the results as the baseline."""
+    with open(path, "w", encoding="UTF-8") as baseline:
+        json.dump(results, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
+
+
+def regressions(
+    baseline: dict[str, float],
+    results: dict[str, float],
+    threshold: float = THRESHOLD,
+) -> list[str]:
+    """Return the benchmarks that are more than threshold slower."""
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def main():
+    """Print the change of every benchmark and flag the regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("results", help="the JSON written by the suite")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="store the results as the new baseline",
+    )
+    args = parser.parse_args()
+
+    results = read_results(args.results)
+    if args.update:
+        write_baseline(args.baseline, results)
+        print(f"Stored {len(results)} benchmarks in {args.baseline}")
+        return
+
+    try:
+        baseline = read_baseline(args.baseline)
+    except FileNotFoundError:
+        print(
+            f"No baseline in {args.baseline}, record it on this machine "
+            "with --update first"
+        )
+        sys.exit(1)
+    slower = regressions(baseline, results, args.threshold)
+    width = max(len(name) for name in results)
+    print(
+        f"{'benchmark':<{width}} {'baseline (ms)':>14} {'median (ms)':>13} "
+        f"{'change':>8}"
+    )
+    for name, seconds in sorted(results.items()):
+        if name not in baseline:
+            print(f"{name:<{width}} {'new':>14} {seconds * 1000:>13.3f}")
+            continue
+        change = seconds / baseline[name] - 1
+        flag = "  REGRESSED" if name in slower else ""
+        print(
+            f"{name:<{width}} {baseline[name] * 1000:>14.3f} "
+            f"{seconds * 1000:>13.3f} {change:>+8.0%}{flag}"
+        )
+
+    if slower:
+        print(
+            f"{len(slower)} benchmarks are more than {args.threshold:.0%} "
+            "slower than the baseline"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Only run the benchmark suite when it is asked for, with --benchmark-only."""
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks, unless pytest runs with --benchmark-only."""
+    if config.getoption("benchmark_only", False):
+        return
+    skip = pytest.mark.skip(reason="run with --benchmark-only")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
@@ -0,0 +1,119 @@
+"""Synthetic data for the benchmarks."""
+import re
+import sqlite3
+from typing import Sequence
+
+from f1_schedule_telegram_bot.database import migrate
+from f1_schedule_telegram_bot.standings_data import (
+    ConstructorRow,
+    ConstructorStandings,
+    DriverRow,
+    DriverStandings,
+)
+
+CALENDAR_FILE = "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics"
+
+_EVENT = re.compile(r"BEGIN:VEVENT\r?\n.*?END:VEVENT\r?\n", re.DOTALL)
+_YEAR = re.compile(r"^(DTSTART|DTEND|DTSTAMP)(.*?):(\d{4})", re.MULTILINE)
+
+
+def bundled_feed() -> str:
+    """Return the calendar bundled with the tests."""
+    with open(CALENDAR_FILE, "r", encoding="UTF-8") as ics:
+        return ics.read()
+
+
+def _shift_years(event: str, years: int) -> str:
+    return _YEAR.sub(
+        lambda match: f"{match[1]}{match[2]}:{int(match[3]) + years}", event
+    )
+
+
+def multi_season_feed(seasons: int) -> str:
+    """Return the bundled calendar repeated for the given amount of seasons."""
+    feed = bundled_feed()
+    events = _EVENT.findall(feed)
+    header = feed[: feed.index("BEGIN:VEVENT")]
+
+    parts = [header]
+    for season in range(seasons):
+        for event in events:
+            event = event.replace("UID:", f"UID:{season}-", 1)
+            parts.append(_shift_years(event, season))
+    parts.append("END:VCALENDAR\n")
+    return "".join(parts)
+
+
+def driver_standings(drivers: int = 22) -> DriverStandings:
+    """Return driver standings with the given amount of drivers."""
+    return DriverStandings(
+        season=2023,
+        round_no=18,
+        race_name="United States Grand Prix",
+        rows=tuple(
+            DriverRow(
+                str(position),
+                f"Driver Number{position}",
+                f"Team {position // 2}",
+                500 - position * 10,
+            )
+            for position in range(1, drivers + 1)
+        ),
+    )
+
+
+def constructor_standings(teams: int = 10) -> ConstructorStandings:
+    """Return constructor standings with the given amount of teams."""
+    return ConstructorStandings(
+        season=2023,
+        round_no=18,
+        race_name="United States Grand Prix",
+        rows=tuple(
+            ConstructorRow(
+                str(position), f"Team {position}", 700 - position * 50, 0
+            )
+            for position in range(1, teams + 1)
+        ),
+    )
+
+
+def database_with_chats(
+    chats: int, timezones: Sequence[str] = ()
+) -> sqlite3.Connection:
+    """
+    Return an in-memory database with the given amount of chats.
+
+    The chats are spread evenly over the given timezones, if any.
+    """
+    dbconn = sqlite3.connect(":memory:")
+    dbconn.execute(
+        """
+        CREATE TABLE chats (
+            chat_id INTEGER PRIMARY KEY,
+            type TEXT NOT NULL CHECK (type <> ''),
+            name TEXT NOT NULL CHECK (name <> '')
+        )
+        """
+    )
+    dbconn.executemany(
+        "INSERT INTO chats VALUES (?, ?, ?)",
+        (
+            (
+                -chat_id if chat_id % 4 == 0 else chat_id,
+                "group" if chat_id % 4 == 0 else "private",
+                f"chat{chat_id}",
+            )
+            for chat_id in range(1, chats + 1)
+        ),
+    )
+    dbconn.execute("INSERT INTO chats VALUES (-1, 'group', 'DEV')")
+    migrate(dbconn)
+    if timezones:
+        dbconn.executemany(
+            "UPDATE chats SET timezone = ? WHERE abs(chat_id) % ? = ?",
+            (
+                (timezone, len(timezones), index)
+                for index, timezone in enumerate(timezones)
+            ),
+        )
+    return dbconn
@@ -0,0 +1,195 @@
+"""
+Benchmark every hot path of the bot with pytest-benchmark.
+
+Covers parsing the bundled calendar, synchronizing the notifications with it,
+fanning out the weekend calendar and a notification to 1k and 100k chats,
+listing the chats and rendering both standings images. The suite is skipped
+unless it is asked for. Run it and compare the results with the baseline
+from the tests directory, after recording the baseline on this machine, as
+it is not committed, by passing --update to the comparison:
+
+    poetry run pytest benchmarks --benchmark-only \\
+        --benchmark-json=benchmarks/results.json
+    poetry run python -m benchmarks.compare benchmarks/results.json
+"""
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import arrow
+import pytest
+import pytz  # type: ignore
+from benchmarks.synthetic import (
+    bundled_feed,
+    constructor_standings,
+    database_with_chats,
+    driver_standings,
+)
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.broadcaster import Broadcaster
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.draw_standings import (
+    draw_constructor_standings,
+    draw_driver_standings,
+)
+from f1_schedule_telegram_bot.ical_fetcher import ICalFetcherInterface
+from f1_schedule_telegram_bot.ics_parser import ICalCalendar, parse_calendar
+from f1_schedule_telegram_bot.main import F1ScheduleTelegramBot
+from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
+
+# The amount of chats the bot broadcasts to, with the amount of rounds, as
+# fanning out to 100k chats takes seconds
+FAN_OUT_ROUNDS = {1_000: 30, 100_000: 3}
+CHATS = tuple(FAN_OUT_ROUNDS)
+TIMEZONES = pytz.common_timezones[::10][:30]
+# The Thursday before the United States Grand Prix
+NOW = arrow.get("2023-10-19T20:00:00+00:00")
+
+
+class MockMessageHandler(MessageHandlerInterface):
+    """Count the messages instead of sending them."""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_telegram_message(
+        self, context, chat_id, message, *args, **kwargs
+    ):
+        self.sent += 1
+
+
+class BundledICalFetcher(ICalFetcherInterface):
+    """Return the calendar bundled with the tests."""
+
+    def __init__(self):
+        self._feed = bundled_feed()
+
+    async def fetch(self) -> ICalCalendar:
+        return parse_calendar(self._feed)
+
+
+class MockJob:
+    def __init__(self, data):
+        self.data = data
+
+    def schedule_removal(self):
+        pass
+
+
+class MockJobQueue:
+    def run_once(self, callback, when, name, data):
+        return MockJob(data)
+
+
+@pytest.fixture(name="frozen_now")
+def fixture_frozen_now(monkeypatch):
+    monkeypatch.setattr(arrow, "utcnow", lambda: NOW)
+
+
+@pytest.fixture(name="loop")
+def fixture_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_bot(conn=None, handler=None) -> F1ScheduleTelegramBot:
+    """Return a bot broadcasting without rate limits to the given chats."""
+    handler = handler or MockMessageHandler()
+    # The global limit and the limit per group would both throttle the rounds
+    unlimited = Broadcaster(
+        handler, global_rate=1e9, group_rate=1e9, group_burst=1e9
+    )
+    return F1ScheduleTelegramBot(
+        chat_store=ConnectionChatStore(conn or sqlite3.connect(":memory:")),
+        ergast=None,
+        message_handler=handler,
+        ical_fetcher=BundledICalFetcher(),
+        broadcaster=unlimited,
+    )
+
+
+def test_parse_calendar(benchmark):
+    feed = bundled_feed()
+
+    calendar = benchmark(parse_calendar, feed)
+
+    assert calendar.events
+
+
+def test_sync_ical_first(benchmark, frozen_now, loop):
+    # Every round starts without a calendar and without scheduled jobs
+    def setup():
+        context = SimpleNamespace(job_queue=MockJobQueue())
+        return (make_bot(), context), {}
+
+    def sync(bot, context):
+        loop.run_until_complete(bot.sync_ical(context))
+
+    benchmark.pedantic(sync, setup=setup, rounds=50)
+
+
+def test_sync_ical_unchanged(benchmark, frozen_now, loop):
+    bot = make_bot()
+    context = SimpleNamespace(job_queue=MockJobQueue())
+    loop.run_until_complete(bot.sync_ical(context))
+
+    benchmark(lambda: loop.run_until_complete(bot.sync_ical(context)))
+
+
+@pytest.mark.parametrize("chats", CHATS)
+def test_send_weekend_calendar(benchmark, frozen_now, loop, chats):
+    handler = MockMessageHandler()
+    bot = make_bot(database_with_chats(chats, TIMEZONES), handler)
+
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(bot.send_weekend_calendar(None)),
+        rounds=FAN_OUT_ROUNDS[chats],
+        warmup_rounds=1,
+    )
+
+    assert handler.sent == chats * (FAN_OUT_ROUNDS[chats] + 1)
+
+
+@pytest.mark.parametrize("chats", CHATS)
+def test_send_notifications(benchmark, frozen_now, loop, chats):
+    handler = MockMessageHandler()
+    bot = make_bot(database_with_chats(chats), handler)
+    session = SimpleNamespace(
+        uid="race", name="Grand Prix", begin=NOW.shift(hours=1).datetime
+    )
+    context = SimpleNamespace(job=SimpleNamespace(data=session))
+
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(bot.send_notifications(context)),
+        rounds=FAN_OUT_ROUNDS[chats],
+        warmup_rounds=1,
+    )
+
+    assert handler.sent == chats * (FAN_OUT_ROUNDS[chats] + 1)
+
+
+@pytest.mark.parametrize("chats", CHATS)
+def test_list_chats(benchmark, chats):
+    conn = database_with_chats(chats)
+
+    listed = benchmark(database.list_chats, conn)
+
+    assert len(listed) == chats
+
+
+def test_draw_driver_standings(benchmark):
+    standings = driver_standings()
+
+    image = benchmark(draw_driver_standings, standings)
+
+    assert image.data
+
+
+def test_draw_constructor_standings(benchmark):
+    standings = constructor_standings()
+
+    image = benchmark(draw_constructor_standings, standings)
+
+    assert image.data
@@ -0,0 +1,94 @@
+"""The mocks shared by the tests of the command handlers of the bot."""
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.ical_fetcher import ICalFetcherInterface
+from f1_schedule_telegram_bot.main import F1ScheduleTelegramBot
+from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
+
+
+class MockMessageHandler(MessageHandlerInterface):
+    def __init__(self):
+        self.messages = []
+
+    async def send_telegram_message(
+        self, context, chat_id, message, *args, **kwargs
+    ):
+        self.messages.append((chat_id, message))
+
+
+class MockRenderer:
+    def __init__(self):
+        # The standings and progressions, in the order they were rendered
+        self.renders = []
+
+    async def _render(self, data, image):
+        self.renders.append(data)
+        return image
+
+    async def render_drivers(self, standings):
+        return await self._render(standings, b"drivers")
+
+    async def render_constructors(self, standings):
+        return await self._render(standings, b"constructors")
+
+    async def render_driver_progress(self, progression):
+        return await self._render(progression, b"drivers")
+
+    async def render_constructor_progress(self, progression):
+        return await self._render(progression, b"constructors")
+
+
+class MockBot:
+    def __init__(self):
+        self.media_groups = []
+        self.uploads = 0
+
+    async def send_media_group(self, chat_id, media):
+        self.media_groups.append(chat_id)
+        messages = []
+        for photo in media:
+            if isinstance(photo.media, str):
+                file_id = photo.media
+            else:
+                self.uploads += 1
+                file_id = f"file {self.uploads}"
+            messages.append(
+                SimpleNamespace(photo=(SimpleNamespace(file_id=file_id),))
+            )
+        await asyncio.sleep(0.01)
+        return tuple(messages)
+
+
+@pytest.fixture
+def message_handler():
+    return MockMessageHandler()
+
+
+@pytest.fixture
+def renderer():
+    return MockRenderer()
+
+
+@pytest.fixture
+def context():
+    return SimpleNamespace(bot=MockBot())
+
+
+@pytest.fixture
+def make_bot(message_handler, renderer):
+    def make_bot(ergast):
+        bot = F1ScheduleTelegramBot(
+            chat_store=ConnectionChatStore(sqlite3.connect(":memory:")),
+            ergast=ergast,
+            message_handler=message_handler,
+            ical_fetcher=ICalFetcherInterface(),
+        )
+        bot._renderer = renderer
+        return bot
+
+    return make_bot
@@ -0,0 +1,26 @@
+import json
+
+from benchmarks.compare import read_results, regressions
+
+
+def test_only_slower_benchmarks_regress():
+    baseline = {"parse": 0.010, "render": 0.020, "list": 0.030}
+    medians = {"parse": 0.012, "render": 0.026, "list": 0.020, "new": 1.0}
+
+    assert regressions(baseline, medians, threshold=0.25) == ["render"]
+
+
+def test_results_are_the_median_rounds(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(
+        json.dumps(
+            {
+                "benchmarks": [
+                    {"name": "parse", "stats": {"min": 0.001, "median": 0.01}}
+                ]
+            }
+        ),
+        encoding="UTF-8",
+    )
+
+    assert read_results(str(path)) == {"parse": 0.01}
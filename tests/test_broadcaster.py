@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+import telegram
+
+from f1_schedule_telegram_bot.broadcaster import Broadcaster, TokenBucket
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class SlowMessageHandler(MessageHandlerInterface):
+    def __init__(self, delay=0.0, failing_chat_ids=()):
+        self.delay = delay
+        self.failing_chat_ids = set(failing_chat_ids)
+        self.sent: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_telegram_message(
+        self, context, chat_id, message, *args, **kwargs
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if chat_id in self.failing_chat_ids:
+                raise telegram.error.Forbidden("bot was kicked")
+            self.sent.append(chat_id)
+        finally:
+            self.in_flight -= 1
+
+
+def private_chats(amount):
+    return [
+        DatabaseChat(chat_id=i, chat_type="private", name=f"user{i}")
+        for i in range(amount)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_respects_global_rate_limit():
+    handler = SlowMessageHandler()
+    broadcaster = Broadcaster(handler, global_rate=100)
+
+    started = time.monotonic()
+    for chat in private_chats(150):
+        await broadcaster.send(None, chat, "hi")
+
+    # The first 100 messages are a burst, the other 50 need half a second
+    assert time.monotonic() - started >= 0.45
+    assert handler.sent == list(range(150))
+
+
+@pytest.mark.asyncio
+async def test_send_passes_on_errors():
+    handler = SlowMessageHandler(failing_chat_ids={3})
+    broadcaster = Broadcaster(handler, global_rate=10_000)
+
+    with pytest.raises(telegram.error.Forbidden):
+        await broadcaster.send(None, private_chats(4)[3], "hi")
+
+
+def group_chats(amount):
+    return [
+        DatabaseChat(chat_id=-i, chat_type="group", name=f"group{i}")
+        for i in range(1, amount + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_idle_group_buckets_are_evicted():
+    now = 0.0
+    handler = SlowMessageHandler()
+    broadcaster = Broadcaster(handler, global_rate=10_000, clock=lambda: now)
+    groups = group_chats(1_001)
+    for chat in groups[:1_000]:
+        await broadcaster.send(None, chat, "hi")
+    await broadcaster.send(None, groups[0], "hi")
+    assert len(broadcaster._group_buckets) == 1_000
+
+    # A minute later the buckets of all groups are full again
+    now += 60
+    await broadcaster.send(None, groups[1_000], "hi")
+
+    assert list(broadcaster._group_buckets) == [groups[1_000].chat_id]
+    assert len(handler.sent) == 1_002
+
+
+def test_token_bucket_limits_group_bursts():
+    now = 0.0
+    bucket = TokenBucket(rate=20 / 60, capacity=20, clock=lambda: now)
+
+    assert all(bucket.try_acquire() == 0 for _ in range(20))
+    assert bucket.try_acquire() == pytest.approx(3)
+
+    now += 3
+    assert bucket.try_acquire() == 0
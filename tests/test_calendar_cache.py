@@ -0,0 +1,171 @@
+import asyncio
+import datetime
+
+import arrow
+import pytest
+
+from f1_schedule_telegram_bot.calendar_cache import CalendarCache
+from f1_schedule_telegram_bot.ical_fetcher import (
+    ICalFetcherInterface,
+    ICalFetchError,
+)
+from f1_schedule_telegram_bot.ics_parser import ICalCalendar, parse_calendar
+from f1_schedule_telegram_bot.notification_schedule import NotificationSchedule
+
+pytest_plugins = ("pytest_asyncio",)
+
+with open(
+    "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics", "r", encoding="UTF-8"
+) as calendar_file:
+    CALENDAR = calendar_file.read()
+
+
+class CountingICalFetcher(ICalFetcherInterface):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fetches = 0
+        self.timeout = False
+        self.feed = CALENDAR
+
+    async def fetch(self) -> ICalCalendar:
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        if self.timeout:
+            raise ICalFetchError("timeout of 30s exceeded")
+        return parse_calendar(self.feed)
+
+
+class MockJob:
+    def __init__(self, data):
+        self.data = data
+        self.removed = False
+        # The job is still waiting in the job queue
+        self.next_t = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=1)
+
+    def schedule_removal(self):
+        self.removed = True
+
+
+class MockJobQueue:
+    def __init__(self):
+        self.jobs: list[MockJob] = []
+
+    def run_once(self, callback, when, name, data):
+        job = MockJob(data)
+        self.jobs.append(job)
+        return job
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_reused_within_ttl():
+    fetcher = CountingICalFetcher()
+    clock = FakeClock()
+    cache = CalendarCache(
+        fetcher, ttl=datetime.timedelta(minutes=30), clock=clock
+    )
+
+    first = await cache.snapshot()
+    clock.now += 29 * 60
+    second = await cache.snapshot()
+
+    assert second is first
+    assert fetcher.fetches == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_calendar_keeps_parsed_snapshot():
+    fetcher = CountingICalFetcher()
+    clock = FakeClock()
+    cache = CalendarCache(
+        fetcher, ttl=datetime.timedelta(minutes=30), clock=clock
+    )
+
+    first = await cache.snapshot()
+    clock.now += 30 * 60
+    second = await cache.snapshot()
+
+    assert fetcher.fetches == 2
+    assert second.calendar is first.calendar
+    assert second.content_hash == first.content_hash
+    assert second.fetched_at == 30 * 60
+    assert cache.stats.changes == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_session_publishes_a_new_snapshot():
+    fetcher = CountingICalFetcher()
+    clock = FakeClock()
+    cache = CalendarCache(
+        fetcher, ttl=datetime.timedelta(minutes=30), clock=clock
+    )
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+    # The week before the first session, FP1 in Bahrain
+    now = arrow.get("2023-02-25T12:00:00Z")
+    first = await cache.snapshot()
+    schedule.sync(job_queue, first.index, now)
+
+    # Only the status and sequence of FP1 change
+    fetcher.feed = CALENDAR.replace(
+        "STATUS:CONFIRMED", "STATUS:CANCELLED", 1
+    ).replace("SEQUENCE:2023", "SEQUENCE:2024", 1)
+    clock.now += 30 * 60
+    second = await cache.snapshot()
+    result = schedule.sync(job_queue, second.index, now)
+
+    assert second is not first
+    assert cache.stats.changes == 1
+    assert result.removed == 1
+    assert [job.removed for job in job_queue.jobs[:2]] == [True, True]
+    assert job_queue.jobs[0].data.uid.endswith("#GP0_2023_fp1")
+    assert not any(job.removed for job in job_queue.jobs[2:])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch():
+    fetcher = CountingICalFetcher(delay=0.05)
+    cache = CalendarCache(fetcher)
+
+    snapshots = await asyncio.gather(*(cache.snapshot() for _ in range(10)))
+
+    assert fetcher.fetches == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert cache.stats.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_on_timeout():
+    fetcher = CountingICalFetcher()
+    clock = FakeClock()
+    cache = CalendarCache(
+        fetcher, ttl=datetime.timedelta(minutes=30), clock=clock
+    )
+
+    first = await cache.snapshot()
+    fetcher.timeout = True
+    clock.now += 60 * 60
+
+    assert await cache.snapshot() is first
+    assert cache.stats.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_without_snapshot_is_raised():
+    fetcher = CountingICalFetcher()
+    fetcher.timeout = True
+    cache = CalendarCache(fetcher)
+
+    with pytest.raises(ICalFetchError):
+        await cache.snapshot()
@@ -0,0 +1,147 @@
+import sqlite3
+
+import pytest
+
+from f1_schedule_telegram_bot.chat_registry import ChatRegistry, RegisteredChat
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.database import NoDevChatException, list_chats
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.fixture
+def dbconn():
+    dbconn = sqlite3.connect(":memory:")
+    dbconn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chats (
+            chat_id INTEGER PRIMARY KEY,
+            type TEXT NOT NULL CHECK (type <> ''),
+            name TEXT NOT NULL CHECK (name <> '')
+        )
+        """
+    )
+    dbconn.executemany(
+        "INSERT INTO chats VALUES (?, ?, ?)",
+        [
+            (-100, "group", "DEV"),
+            (3, "private", "user3"),
+            (-5, "group", "group5"),
+            (1, "private", "user1"),
+        ],
+    )
+    return dbconn
+
+
+def test_recipients_exclude_dev_chat(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    assert sorted(registry.recipients()) == [
+        RegisteredChat(-5, "group"),
+        RegisteredChat(1, "private"),
+        RegisteredChat(3, "private"),
+    ]
+    assert len(registry) == 3
+    assert registry.dev_chat().chat_id == -100
+
+
+def test_recipients_match_list_chats(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    assert sorted(registry.recipients()) == sorted(
+        RegisteredChat(chat.chat_id, chat.chat_type)
+        for chat in list_chats(dbconn)
+    )
+
+
+def test_recipients_do_not_query_the_database(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+    registry.dev_chat()
+    queries = []
+    dbconn.set_trace_callback(queries.append)
+
+    list(registry.recipients())
+    list(registry.recipients())
+    registry.dev_chat()
+
+    assert not queries
+
+
+@pytest.mark.asyncio
+async def test_register_writes_through(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    assert await registry.register(2, "private", "user2")
+    assert not await registry.register(2, "private", "user2")
+    assert not await registry.register(-100, "group", "DEV", is_dev=True)
+
+    assert 2 in registry
+    assert 4 not in registry
+    assert -100 in registry
+    assert RegisteredChat(2, "private") in list(registry.recipients())
+    # A new registry reads the chat from the database
+    assert 2 in ChatRegistry(ConnectionChatStore(dbconn))
+
+
+@pytest.mark.asyncio
+async def test_missing_dev_chat(dbconn):
+    dbconn.execute("DELETE FROM chats WHERE name = 'DEV'")
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    with pytest.raises(NoDevChatException):
+        registry.dev_chat()
+
+    await registry.register("-200", "group", "DEV", is_dev=True)
+
+    assert registry.dev_chat().chat_id == -200
+    assert len(registry) == 3
+
+
+@pytest.mark.asyncio
+async def test_set_timezone_moves_chat(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+
+    assert await registry.set_timezone(3, "Asia/Tokyo")
+    assert not await registry.set_timezone(4, "Asia/Tokyo")
+
+    assert registry.timezone(3) == "Asia/Tokyo"
+    assert registry.timezone(1) == "Europe/Amsterdam"
+    assert registry.timezone(4) is None
+    assert len(registry) == 3
+    # A new registry reads the timezone from the database
+    assert ChatRegistry(ConnectionChatStore(dbconn)).timezone(3) == (
+        "Asia/Tokyo"
+    )
+
+
+@pytest.mark.asyncio
+async def test_by_timezone_groups_chats(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+    await registry.set_timezone(3, "Asia/Tokyo")
+    await registry.set_timezone(-5, "Asia/Tokyo")
+
+    groups = {
+        timezone: sorted(chats) for timezone, chats in registry.by_timezone()
+    }
+
+    assert groups == {
+        "Europe/Amsterdam": [RegisteredChat(1, "private")],
+        "Asia/Tokyo": [
+            RegisteredChat(-5, "group", "Asia/Tokyo"),
+            RegisteredChat(3, "private", "Asia/Tokyo"),
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_reactivated_chat_keeps_its_timezone(dbconn):
+    registry = ChatRegistry(ConnectionChatStore(dbconn))
+    await registry.set_timezone(3, "Asia/Tokyo")
+    await registry.deactivate(3)
+
+    assert await registry.register(3, "private", "user3")
+
+    assert registry.timezone(3) == "Asia/Tokyo"
+    assert registry.timezone(3) == ChatRegistry(
+        ConnectionChatStore(dbconn)
+    ).timezone(3)
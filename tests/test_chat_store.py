@@ -0,0 +1,149 @@
+import asyncio
+import datetime
+import sqlite3
+
+import pytest
+
+from f1_schedule_telegram_bot.chat_store import SQLiteChatStore
+from f1_schedule_telegram_bot.database import DatabaseChat, PendingNotification
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+from f1_schedule_telegram_bot.notification_store import SQLiteNotificationStore
+from f1_schedule_telegram_bot.sessions import Session, SessionKind
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "f1.db")
+
+
+@pytest.mark.asyncio
+async def test_save_chat_upserts(path):
+    store = SQLiteChatStore(DatabaseWriter(path))
+
+    await store.save_chat(DatabaseChat(1, "private", "user1"))
+    await store.save_chat(DatabaseChat(-100, "group", "DEV"), is_dev=True)
+    await store.save_chat(DatabaseChat(1, "private", "renamed"))
+
+    assert store.read_chats() == [DatabaseChat(1, "private", "renamed")]
+    assert store.read_dev_chat() == DatabaseChat(-100, "group", "DEV")
+    assert await store.list_chats() == [DatabaseChat(1, "private", "renamed")]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_are_committed_together(path):
+    writer = DatabaseWriter(path, batch_size=100)
+    store = SQLiteChatStore(writer)
+
+    await asyncio.gather(
+        *(
+            store.save_chat(DatabaseChat(chat_id, "private", f"user{chat_id}"))
+            for chat_id in range(1, 301)
+        )
+    )
+    await store.close()
+
+    assert writer.stats.writes == 300
+    assert 3 <= writer.stats.commits < 300
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM chats").fetchone() == (300,)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_fail_the_batch(path):
+    store = SQLiteChatStore(DatabaseWriter(path))
+
+    results = await asyncio.gather(
+        store.save_chat(DatabaseChat(1, "private", "user1")),
+        store.save_chat(DatabaseChat(2, "private", "")),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert store.read_chats() == [DatabaseChat(1, "private", "user1")]
+    assert store.read_dev_chat() is None
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_close_commits_queued_writes(path):
+    store = SQLiteChatStore(DatabaseWriter(path))
+    saved = asyncio.ensure_future(
+        store.save_chat(DatabaseChat(1, "private", "user1"))
+    )
+    # Let the write be queued
+    await asyncio.sleep(0)
+
+    await store.close()
+
+    await saved
+    with pytest.raises(RuntimeError):
+        await store.save_chat(DatabaseChat(2, "private", "user2"))
+    assert SQLiteChatStore(DatabaseWriter(path)).read_chats() == [
+        DatabaseChat(1, "private", "user1")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_notifications_share_the_writer(path):
+    writer = DatabaseWriter(path)
+    chats = SQLiteChatStore(writer)
+    notifications = SQLiteNotificationStore(writer)
+    begin = datetime.datetime(2023, 10, 22, 19, tzinfo=datetime.timezone.utc)
+    session = Session(
+        "race",
+        "F1: Grand Prix (United States Grand Prix)",
+        SessionKind.RACE,
+        "Grand Prix",
+        "United States Grand Prix",
+        begin,
+        begin + datetime.timedelta(hours=2),
+        "2023",
+        False,
+    )
+
+    await chats.save_chat(DatabaseChat(1, "private", "user1"))
+    await notifications.replace_notifications(
+        [
+            PendingNotification(session, begin.timestamp() - 3600),
+            PendingNotification(session, begin.timestamp() - 300),
+        ]
+    )
+    await notifications.remove_notifications("race", begin.timestamp() - 3600)
+
+    assert notifications.read_notifications() == [
+        PendingNotification(session, begin.timestamp() - 300)
+    ]
+    await chats.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_no_partial_changes(path):
+    writer = DatabaseWriter(path)
+    chats = SQLiteChatStore(writer)
+    await chats.save_chat(DatabaseChat(1, "private", "user1"))
+
+    def failing_write(conn):
+        conn.execute("DELETE FROM chats")
+        raise sqlite3.OperationalError("disk I/O error")
+
+    results = await asyncio.gather(
+        chats.save_chat(DatabaseChat(2, "private", "user2")),
+        writer.write(failing_write),
+        chats.save_chat(DatabaseChat(3, "private", "user3")),
+        return_exceptions=True,
+    )
+    await chats.close()
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], sqlite3.OperationalError)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT chat_id FROM chats").fetchall() == [
+        (1,),
+        (2,),
+        (3,),
+    ]
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from f1_schedule_telegram_bot.chats_cli import main
+from f1_schedule_telegram_bot.database import DatabaseChat, connect, list_chats
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "f1.db")
+    conn = connect(path)
+    conn.executemany(
+        "INSERT INTO chats (chat_id, type, name, timezone, is_dev) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (-100, "group", "DEV", None, 1),
+            (1, "private", "user1", "Asia/Tokyo", 0),
+            (-2, "group", "Group, with a comma", None, 0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_export_and_import(database, tmp_path):
+    exported = str(tmp_path / "chats.csv")
+    other = str(tmp_path / "other.db")
+
+    main(["--database", database, "export", exported])
+    main(["--database", other, "import", exported, "--batch-size", "1"])
+
+    with open(exported, encoding="UTF-8") as csv:
+        assert csv.readline().strip() == "chat_id,type,name,timezone"
+    assert sorted(list_chats(sqlite3.connect(other))) == [
+        DatabaseChat(-2, "group", "Group, with a comma"),
+        DatabaseChat(1, "private", "user1", "Asia/Tokyo"),
+    ]
+
+
+def test_import_without_timezones(database, tmp_path):
+    legacy = tmp_path / "legacy.csv"
+    legacy.write_text("chat_id,type,name\n1,private,renamed\n3,group,group3\n")
+
+    main(["--database", database, "import", str(legacy)])
+
+    assert sorted(list_chats(sqlite3.connect(database))) == [
+        DatabaseChat(-2, "group", "Group, with a comma"),
+        # The timezone of a registered chat is kept
+        DatabaseChat(1, "private", "renamed", "Asia/Tokyo"),
+        DatabaseChat(3, "group", "group3"),
+    ]
+
+
+def test_import_rejects_invalid_rows(database, tmp_path):
+    invalid = tmp_path / "invalid.csv"
+    invalid.write_text(
+        "chat_id,type,name\n3,private,user3\nfour,private,user4\n"
+    )
+
+    with pytest.raises(ValueError, match="line 3"):
+        main(["--database", database, "import", str(invalid)])
+
+
+def test_import_rejects_unknown_timezones(database, tmp_path):
+    invalid = tmp_path / "invalid.csv"
+    invalid.write_text(
+        "chat_id,type,name,timezone\n"
+        "3,private,user3,asia/tokyo\n"
+        "4,private,user4,Mars/Olympus_Mons\n"
+    )
+
+    with pytest.raises(ValueError, match="line 3"):
+        main(["--database", database, "import", str(invalid)])
+
+
+def test_import_resolves_timezones(database, tmp_path):
+    chats = tmp_path / "chats.csv"
+    chats.write_text(
+        "chat_id,type,name,timezone\n3,private,user3,asia/tokyo\n"
+    )
+
+    main(["--database", database, "import", str(chats)])
+
+    assert DatabaseChat(3, "private", "user3", "Asia/Tokyo") in list_chats(
+        sqlite3.connect(database)
+    )
+
+
+@pytest.mark.parametrize("row", ["4,,user4", "4,private,", "four,private,x"])
+def test_import_with_an_invalid_row_imports_nothing(database, tmp_path, row):
+    invalid = tmp_path / "invalid.csv"
+    invalid.write_text(f"chat_id,type,name\n3,private,user3\n{row}\n")
+
+    with pytest.raises(ValueError, match="line 3"):
+        main(
+            ["--database", database, "import", str(invalid)]
+            + ["--batch-size", "1"]
+        )
+
+    assert 3 not in [
+        chat.chat_id for chat in list_chats(sqlite3.connect(database))
+    ]
@@ -0,0 +1,118 @@
+import sqlite3
+
+import pytest
+
+from f1_schedule_telegram_bot.database import (
+    MIGRATIONS,
+    DatabaseChat,
+    get_chat,
+    get_chat_dev,
+    import_chats,
+    iter_chats,
+    list_chats,
+    migrate,
+)
+
+
+@pytest.fixture
+def dbconn():
+    dbconn = sqlite3.connect(":memory:")
+    dbconn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chats (
+            chat_id INTEGER PRIMARY KEY,
+            type TEXT NOT NULL CHECK (type <> ''),
+            name TEXT NOT NULL CHECK (name <> '')
+        )
+        """
+    )
+    dbconn.execute("INSERT INTO chats VALUES (-100, 'group', 'DEV')")
+    dbconn.executemany(
+        "INSERT INTO chats VALUES (?, 'private', ?)",
+        [(chat_id, f"user{chat_id}") for chat_id in range(1, 6)],
+    )
+    migrate(dbconn)
+    return dbconn
+
+
+def test_iter_chats_streams_in_batches(dbconn):
+    fetched = []
+    dbconn.set_trace_callback(fetched.append)
+    chats = iter_chats(dbconn, batch_size=2)
+
+    assert next(chats) == DatabaseChat(1, "private", "user1")
+    assert len(fetched) == 1
+    assert [chat.chat_id for chat in chats] == [2, 3, 4, 5]
+
+
+def test_list_chats_excludes_dev_chat(dbconn):
+    assert list_chats(dbconn) == list(iter_chats(dbconn))
+    assert [chat.name for chat in list_chats(dbconn)] == [
+        "user1",
+        "user2",
+        "user3",
+        "user4",
+        "user5",
+    ]
+
+
+def test_database_chat_is_compact(dbconn):
+    chat = get_chat(dbconn, 3)
+
+    assert chat == DatabaseChat(chat_id=3, chat_type="private", name="user3")
+    assert not hasattr(chat, "__dict__")
+
+
+def test_migrate_flags_the_dev_chat(dbconn):
+    assert dbconn.execute("PRAGMA user_version").fetchone() == (
+        len(MIGRATIONS),
+    )
+    assert get_chat_dev(dbconn) == DatabaseChat(-100, "group", "DEV")
+    plan = dbconn.execute(
+        "EXPLAIN QUERY PLAN SELECT chat_id FROM chats WHERE is_dev"
+    ).fetchall()
+    assert "chats_dev" in plan[0][-1]
+
+
+def test_migrate_is_idempotent(dbconn):
+    queries = []
+    dbconn.set_trace_callback(queries.append)
+
+    assert migrate(dbconn) == len(MIGRATIONS)
+    assert queries == ["PRAGMA user_version"]
+
+
+def test_migrate_new_database():
+    dbconn = sqlite3.connect(":memory:")
+    migrate(dbconn)
+
+    assert list_chats(dbconn) == []
+    with pytest.raises(sqlite3.IntegrityError):
+        dbconn.executemany(
+            "INSERT INTO chats (chat_id, type, name, is_dev) "
+            "VALUES (?, 'group', 'DEV', 1)",
+            [(1,), (2,)],
+        )
+
+
+def test_import_chats_commits_in_batches(dbconn):
+    commits = []
+    dbconn.set_trace_callback(
+        lambda query: query == "COMMIT" and commits.append(query)
+    )
+
+    imported = import_chats(
+        dbconn,
+        (
+            DatabaseChat(chat_id, "group", f"group{chat_id}")
+            for chat_id in range(4, 11)
+        ),
+        batch_size=3,
+    )
+
+    assert imported == 7
+    assert len(commits) == 3
+    assert len(list_chats(dbconn)) == 10
+    # Registered chats are updated, and the dev chat is left alone
+    assert get_chat(dbconn, 4) == DatabaseChat(4, "group", "group4")
+    assert get_chat_dev(dbconn).chat_id == -100
@@ -0,0 +1,88 @@
+import io
+import os
+
+import pytest
+from PIL import Image, ImageChops
+
+from f1_schedule_telegram_bot.draw_standings import (
+    draw_constructor_standings,
+    draw_driver_standings,
+)
+from f1_schedule_telegram_bot.draw_table import load_font
+from f1_schedule_telegram_bot.standings_data import (
+    ConstructorRow,
+    ConstructorStandings,
+    DriverRow,
+    DriverStandings,
+)
+
+GOLDEN_DIR = "golden"
+# Font rasterization differs slightly between FreeType versions
+MAX_DIFFERENT_PIXELS = 0.01
+
+DRIVERS = DriverStandings(
+    season=2023,
+    round_no=18,
+    race_name="United States Grand Prix",
+    rows=(
+        DriverRow("1", "Max Verstappen", "Red Bull", 466),
+        DriverRow("2", "Sergio Pérez", "Red Bull", 240),
+        DriverRow("3", "Lewis Hamilton", "Mercedes", 220),
+        DriverRow("4", "Fernando Alonso", "Aston Martin", 183),
+        DriverRow("5", "Carlos Sainz", "Ferrari", 153),
+    ),
+)
+CONSTRUCTORS = ConstructorStandings(
+    season=2023,
+    round_no=18,
+    race_name="United States Grand Prix",
+    rows=(
+        ConstructorRow("1", "Red Bull", 706, 17),
+        ConstructorRow("2", "Mercedes", 371, 0),
+        ConstructorRow("3", "Ferrari", 326, 1),
+        ConstructorRow("4", "McLaren", 219, 0),
+    ),
+)
+
+
+def assert_matches_golden(png, name):
+    """Compare the image to the golden image, creating it when it is missing."""
+    path = os.path.join(GOLDEN_DIR, name)
+    if not os.path.exists(path):
+        with open(path, "wb") as golden:
+            golden.write(png)
+        pytest.fail(f"Created the missing golden image {path}")
+
+    actual = Image.open(io.BytesIO(png)).convert("RGB")
+    expected = Image.open(path).convert("RGB")
+    assert actual.size == expected.size
+
+    diff = ImageChops.difference(actual, expected).convert("L")
+    different = sum(1 for pixel in diff.getdata() if pixel > 32)
+    assert different <= MAX_DIFFERENT_PIXELS * actual.width * actual.height
+
+
+def test_driver_standings_golden_image():
+    assert_matches_golden(
+        draw_driver_standings(DRIVERS).data, "driver_standings.png"
+    )
+
+
+def test_constructor_standings_golden_image():
+    assert_matches_golden(
+        draw_constructor_standings(CONSTRUCTORS).data,
+        "constructor_standings.png",
+    )
+
+
+def test_image_fits_the_title():
+    font = load_font()
+    title = "Driver standing after the United States Grand Prix"
+    image = Image.open(io.BytesIO(draw_driver_standings(DRIVERS).data))
+
+    # The title is the widest line, with a padding on either side
+    assert image.width == round(font.getlength(title)) + 20
+
+
+def test_font_is_loaded_once():
+    assert load_font() is load_font()
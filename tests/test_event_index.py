@@ -0,0 +1,79 @@
+from typing import NamedTuple
+
+import arrow
+import pytest
+
+from f1_schedule_telegram_bot.event_index import EventIndex
+from f1_schedule_telegram_bot.sessions import SessionKind
+
+
+class Event(NamedTuple):
+    name: str
+    kind: SessionKind
+    begin: arrow.Arrow
+
+
+def event(kind, race, begin):
+    return Event(f"F1: {kind.value} ({race})", kind, arrow.get(begin))
+
+
+EVENTS = [
+    event(SessionKind.RACE, "Mexico City Grand Prix", "2023-10-29T20:00:00Z"),
+    event(
+        SessionKind.QUALIFYING,
+        "United States Grand Prix",
+        "2023-10-20T21:00:00Z",
+    ),
+    event(SessionKind.FP1, "United States Grand Prix", "2023-10-20T17:30:00Z"),
+    event(
+        SessionKind.RACE, "United States Grand Prix", "2023-10-22T19:00:00Z"
+    ),
+    event(
+        SessionKind.QUALIFYING,
+        "Mexico City Grand Prix",
+        "2023-10-28T21:00:00Z",
+    ),
+]
+
+
+@pytest.fixture(scope="function")
+def index():
+    return EventIndex(EVENTS)
+
+
+def test_events_are_ordered_by_begin(index):
+    begins = [event.begin for event in index]
+    assert begins == sorted(begins)
+    assert len(index) == len(EVENTS)
+
+
+def test_between_includes_both_bounds(index):
+    events = index.between(
+        arrow.get("2023-10-20T17:30:00Z"), arrow.get("2023-10-22T19:00:00Z")
+    )
+
+    assert [event.name for event in events] == [
+        "F1: FP1 (United States Grand Prix)",
+        "F1: Qualifying (United States Grand Prix)",
+        "F1: Grand Prix (United States Grand Prix)",
+    ]
+
+
+def test_between_accepts_datetimes(index):
+    start = arrow.get("2023-10-23T00:00:00Z").datetime
+    end = arrow.get("2023-10-30T00:00:00Z").datetime
+
+    assert len(index.between(start, end)) == 2
+
+
+def test_next_of_type(index):
+    after_first_race = arrow.get("2023-10-22T19:00:00Z")
+
+    assert index.next_of_type(SessionKind.RACE, after_first_race) == EVENTS[0]
+    assert index.next_of_type(SessionKind.RACE, EVENTS[0].begin) is None
+    assert index.next_of_type(SessionKind.SPRINT, after_first_race) is None
+
+
+def test_last_of_type(index):
+    assert index.last_of_type(SessionKind.QUALIFYING) == EVENTS[4]
+    assert index.last_of_type(SessionKind.SPRINT) is None
@@ -0,0 +1,173 @@
+import asyncio
+import datetime
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from f1_schedule_telegram_bot.calendar_cache import CalendarCache
+from f1_schedule_telegram_bot.ical_fetcher import ICalFetcher, ICalFetchError
+
+pytest_plugins = ("pytest_asyncio",)
+
+ETAG = '"f1-calendar-v1"'
+LAST_MODIFIED = "Fri, 04 Aug 2023 18:36:58 GMT"
+
+with open(
+    "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics", "rb"
+) as calendar_file:
+    CALENDAR = calendar_file.read()
+
+
+class CalendarRequestHandler(BaseHTTPRequestHandler):
+    """Serve the test calendar, honouring conditional requests."""
+
+    def do_GET(self):
+        self.server.received_headers.append(dict(self.headers))
+        time.sleep(self.server.delay)
+
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/calendar")
+        self.send_header("Content-Length", str(len(self.server.calendar)))
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(self.server.calendar)
+
+    def log_message(self, *args):
+        pass
+
+
+class CalendarServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # The client hanging up after a timeout is expected
+        pass
+
+
+@pytest.fixture(scope="function")
+def calendar_server():
+    server = CalendarServer(("127.0.0.1", 0), CalendarRequestHandler)
+    server.received_headers = []
+    server.delay = 0
+    server.status = 200
+    server.calendar = CALENDAR
+    server.etag = ETAG
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url_of(server):
+    host, port = server.server_address
+    return f"http://{host}:{port}/f1.ics"
+
+
+@pytest.mark.asyncio
+async def test_fetch_parses_calendar(calendar_server):
+    fetcher = ICalFetcher(url_of(calendar_server))
+
+    calendar = await fetcher.fetch()
+    await fetcher.close()
+
+    assert len(calendar.events) == 110
+    assert "If-None-Match" not in calendar_server.received_headers[0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_unchanged_calendar_is_not_parsed_again(calendar_server):
+    fetcher = ICalFetcher(url_of(calendar_server))
+
+    first = await fetcher.fetch()
+    second = await fetcher.fetch()
+    await fetcher.close()
+
+    assert second is first
+    headers = calendar_server.received_headers[1]
+    assert headers["If-None-Match"] == ETAG
+    assert headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_fetch_does_not_block_event_loop(calendar_server):
+    calendar_server.delay = 0.5
+    fetcher = ICalFetcher(url_of(calendar_server))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    await fetcher.fetch()
+    ticking.cancel()
+    await fetcher.close()
+
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeout(calendar_server):
+    calendar_server.delay = 0.5
+    fetcher = ICalFetcher(url_of(calendar_server), timeout=0.1)
+
+    with pytest.raises(ICalFetchError):
+        await fetcher.fetch()
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_server_error(calendar_server):
+    calendar_server.status = 503
+    fetcher = ICalFetcher(url_of(calendar_server))
+
+    with pytest.raises(ICalFetchError):
+        await fetcher.fetch()
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_stale_calendar_on_server_error(calendar_server):
+    fetcher = ICalFetcher(url_of(calendar_server))
+    cache = CalendarCache(fetcher, ttl=datetime.timedelta(0))
+    first = await cache.snapshot()
+
+    calendar_server.status = 502
+    second = await cache.snapshot()
+    await cache.close()
+
+    assert second is first
+    assert cache.stats.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_stale_calendar_on_malformed_feed(calendar_server):
+    fetcher = ICalFetcher(url_of(calendar_server))
+    cache = CalendarCache(fetcher, ttl=datetime.timedelta(0))
+    first = await cache.snapshot()
+
+    calendar_server.calendar = CALENDAR.replace(
+        b"DTSTART:20230303T113000Z", b"DTSTART:garbage", 1
+    )
+    calendar_server.etag = '"f1-calendar-v2"'
+    with pytest.raises(ICalFetchError):
+        await fetcher.fetch()
+    second = await cache.snapshot()
+    await cache.close()
+
+    assert second is first
+    assert cache.stats.stale == 1
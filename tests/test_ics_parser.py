@@ -0,0 +1,71 @@
+import datetime
+
+from ics import Calendar
+
+from f1_schedule_telegram_bot.ics_parser import parse_calendar
+
+with open(
+    "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics", "r", encoding="UTF-8"
+) as calendar_file:
+    CALENDAR = calendar_file.read()
+
+EDGE_CASES = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:test
+BEGIN:VEVENT
+UID:escaped\\,uid
+SUMMARY:F1: Grand Prix (São Paulo\\, Brazil\\; Interlagos)
+DTSTART;VALUE=DATE:20231105
+DTEND;TZID=America/Sao_Paulo:20231105T160000
+STATUS:cancelled
+BEGIN:VALARM
+ACTION:DISPLAY
+DESCRIPTION:Alarm
+TRIGGER:-PT15M
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+UID:folded
+SUMMARY:F1: Qualifying (A very long
+  folded name)
+DTSTART:20231104T180000
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def assert_same_events(text):
+    expected = sorted(
+        (
+            event.uid,
+            event.name,
+            event.begin.datetime,
+            event.end.datetime,
+            event.status,
+        )
+        for event in Calendar(text).events
+    )
+    actual = sorted(
+        (event.uid, event.name, event.begin, event.end, event.status)
+        for event in parse_calendar(text).events
+    )
+    assert actual == expected
+
+
+def test_parity_with_ics_calendar():
+    assert len(parse_calendar(CALENDAR).events) == 110
+    assert_same_events(CALENDAR)
+
+
+def test_parity_with_ics_calendar_edge_cases():
+    assert_same_events(EDGE_CASES)
+
+
+def test_parse_calendar_keeps_sequence_and_timezones():
+    escaped, folded = parse_calendar(EDGE_CASES).events
+
+    assert escaped.name == "F1: Grand Prix (São Paulo, Brazil; Interlagos)"
+    assert escaped.end.utcoffset() == datetime.timedelta(hours=-3)
+    assert folded.name == "F1: Qualifying (A very long folded name)"
+    assert folded.end == folded.begin
+    assert parse_calendar(CALENDAR).events[0].sequence == "2023"
@@ -0,0 +1,50 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from f1_schedule_telegram_bot.draw_table import load_font
+from f1_schedule_telegram_bot.image_encoding import (
+    EncodingOptions,
+    ImageFormat,
+    encode_image,
+)
+
+
+def table_image():
+    img = Image.new("RGB", (300, 200), (240, 240, 240))
+    drawing = ImageDraw.Draw(img)
+    for line in range(8):
+        drawing.text(
+            (10, 10 + line * 24),
+            f"{line + 1}  Max Verstappen  Red Bull  {466 - line}",
+            font=load_font(),
+            fill=(188, 0, 3) if line == 0 else (0, 0, 0),
+        )
+    return img
+
+
+def test_palette_png_is_smaller_than_rgb_png():
+    rgb = encode_image(table_image(), EncodingOptions(colors=None))
+    palette = encode_image(table_image(), EncodingOptions(colors=16))
+
+    assert len(palette.data) < len(rgb.data)
+    assert palette.encode_time > 0
+
+
+def test_palette_png_has_the_requested_colors():
+    encoded = encode_image(table_image(), EncodingOptions(colors=16))
+
+    with Image.open(io.BytesIO(encoded.data)) as img:
+        assert img.format == "PNG"
+        assert img.mode == "P"
+        assert len(img.getcolors()) <= 16
+
+
+def test_webp():
+    encoded = encode_image(
+        table_image(), EncodingOptions(image_format=ImageFormat.WEBP)
+    )
+
+    with Image.open(io.BytesIO(encoded.data)) as img:
+        assert img.format == "WEBP"
+        assert img.size == (300, 200)
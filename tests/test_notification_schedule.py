@@ -0,0 +1,264 @@
+import datetime
+import sqlite3
+from types import SimpleNamespace
+
+import arrow
+import pytest
+
+from f1_schedule_telegram_bot import database
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.ical_fetcher import ICalFetcherInterface
+from f1_schedule_telegram_bot.ics_parser import ICalEvent
+from f1_schedule_telegram_bot.main import F1ScheduleTelegramBot
+from f1_schedule_telegram_bot.notification_schedule import NotificationSchedule
+from f1_schedule_telegram_bot.notification_store import (
+    ConnectionNotificationStore,
+)
+from f1_schedule_telegram_bot.sessions import classify
+
+pytest_plugins = ("pytest_asyncio",)
+
+NOW = arrow.get("2023-10-19T20:00:00+00:00")
+
+
+class MockJob:
+    def __init__(self, when, name, data):
+        self.when = when
+        self.name = name
+        self.data = data
+        self.removed = False
+        self.next_t = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=1)
+
+    def schedule_removal(self):
+        self.removed = True
+
+
+class MockJobQueue:
+    def __init__(self):
+        self.jobs: list[MockJob] = []
+
+    def run_once(self, callback, when, name, data):
+        job = MockJob(when, name, data)
+        self.jobs.append(job)
+        return job
+
+    def pending(self):
+        return [job for job in self.jobs if not job.removed]
+
+
+def event(uid, name, begin):
+    begin = arrow.get(begin).datetime
+    return classify(ICalEvent(uid, name, begin, begin, "CONFIRMED", "2023"))
+
+
+@pytest.fixture(scope="function")
+def events():
+    return [
+        event(
+            "quali",
+            "F1: Qualifying (United States Grand Prix)",
+            "2023-10-20T21:00:00Z",
+        ),
+        event(
+            "race",
+            "F1: Grand Prix (United States Grand Prix)",
+            "2023-10-22T19:00:00Z",
+        ),
+    ]
+
+
+def test_first_sync_schedules_two_notifications_per_event(events):
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+
+    result = schedule.sync(job_queue, events, NOW)
+
+    assert result.added == 2
+    assert [job.when for job in job_queue.jobs[:2]] == [
+        arrow.get("2023-10-20T20:00:00Z").datetime,
+        arrow.get("2023-10-20T20:55:00Z").datetime,
+    ]
+    assert len(job_queue.pending()) == 4
+
+
+def test_unchanged_events_are_not_rescheduled(events):
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+
+    schedule.sync(job_queue, events, NOW)
+    result = schedule.sync(job_queue, events, NOW)
+
+    assert result.unchanged == 2
+    assert result.added == result.moved == result.removed == 0
+    assert len(job_queue.jobs) == 4
+
+
+def test_moved_event_is_rescheduled(events):
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(job_queue, events, NOW)
+
+    events[1] = event(
+        "race",
+        "F1: Grand Prix (United States Grand Prix)",
+        "2023-10-22T20:00:00Z",
+    )
+    result = schedule.sync(job_queue, events, NOW)
+
+    assert result.moved == 1
+    assert result.unchanged == 1
+    assert job_queue.jobs[2].removed and job_queue.jobs[3].removed
+    assert [job.when for job in job_queue.jobs[4:]] == [
+        arrow.get("2023-10-22T19:00:00Z").datetime,
+        arrow.get("2023-10-22T19:55:00Z").datetime,
+    ]
+
+
+def test_disappeared_and_cancelled_events_are_removed(events):
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(job_queue, events, NOW)
+
+    cancelled = event(
+        "quali",
+        "F1: Qualifying (United States Grand Prix) - Canceled",
+        "2023-10-20T21:00:00Z",
+    )
+    result = schedule.sync(job_queue, [cancelled], NOW)
+
+    assert result.removed == 2
+    assert not job_queue.pending()
+    assert len(schedule) == 0
+
+
+def test_begun_events_leave_the_schedule(events):
+    job_queue = MockJobQueue()
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(job_queue, events, NOW)
+
+    result = schedule.sync(
+        job_queue, events[1:], arrow.get("2023-10-21T00:00:00Z")
+    )
+
+    assert result.removed == 0
+    assert result.unchanged == 1
+    assert len(schedule) == 1
+
+
+def test_pending_notifications_survive_a_restart(events):
+    conn = sqlite3.connect(":memory:")
+    store = ConnectionNotificationStore(conn)
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(MockJobQueue(), events, NOW)
+    database.replace_notifications(conn, schedule.notifications(NOW))
+
+    job_queue = MockJobQueue()
+    restarted = NotificationSchedule(callback=None)
+    assert restarted.restore(job_queue, store.read_notifications(), NOW) == 2
+
+    assert [job.when for job in job_queue.jobs] == [
+        arrow.get("2023-10-20T20:00:00Z").datetime,
+        arrow.get("2023-10-20T20:55:00Z").datetime,
+        arrow.get("2023-10-22T18:00:00Z").datetime,
+        arrow.get("2023-10-22T18:55:00Z").datetime,
+    ]
+    assert [job.data for job in job_queue.jobs[::2]] == events
+    # The first sync after the restart finds the restored jobs up to date
+    result = restarted.sync(job_queue, events, NOW)
+    assert result.unchanged == 2
+    assert len(job_queue.jobs) == 4
+
+
+def test_missed_notifications_are_sent_once(events):
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(MockJobQueue(), events, NOW)
+    pending = list(schedule.notifications(NOW))
+
+    job_queue = MockJobQueue()
+    restarted = NotificationSchedule(callback=None)
+    # Both notifications of the qualifying were missed while it was down
+    restored = restarted.restore(
+        job_queue, pending, arrow.get("2023-10-20T20:58:00Z")
+    )
+
+    assert restored == 2
+    assert [(job.when, job.name) for job in job_queue.jobs] == [
+        (0, "quali"),
+        (arrow.get("2023-10-22T18:00:00Z").datetime, "race"),
+        (arrow.get("2023-10-22T18:55:00Z").datetime, "race"),
+    ]
+    assert list(restarted.notifications(NOW))[0].session.uid == "race"
+
+
+def test_begun_sessions_are_not_restored(events):
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(MockJobQueue(), events, NOW)
+
+    job_queue = MockJobQueue()
+    restarted = NotificationSchedule(callback=None)
+    restored = restarted.restore(
+        job_queue,
+        schedule.notifications(NOW),
+        arrow.get("2023-10-21T00:00:00Z"),
+    )
+
+    assert restored == 1
+    assert {job.name for job in job_queue.jobs} == {"race"}
+
+
+def test_sent_notifications_are_removed(events):
+    conn = sqlite3.connect(":memory:")
+    store = ConnectionNotificationStore(conn)
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(MockJobQueue(), events, NOW)
+    database.replace_notifications(conn, schedule.notifications(NOW))
+
+    database.remove_notifications(
+        conn, "quali", arrow.get("2023-10-20T20:00:00Z").timestamp()
+    )
+
+    assert [
+        (session.uid, due) for session, due in store.read_notifications()
+    ] == [
+        ("quali", arrow.get("2023-10-20T20:55:00Z").timestamp()),
+        ("race", arrow.get("2023-10-22T18:00:00Z").timestamp()),
+        ("race", arrow.get("2023-10-22T18:55:00Z").timestamp()),
+    ]
+
+
+class FailingICalFetcher(ICalFetcherInterface):
+    async def fetch(self):
+        raise AssertionError("The calendar is fetched during startup")
+
+
+@pytest.mark.asyncio
+async def test_warm_restart_schedules_without_the_calendar():
+    conn = sqlite3.connect(":memory:")
+    store = ConnectionNotificationStore(conn)
+    database.save_chat(conn, DatabaseChat(1, "group", "dev"), is_dev=True)
+    now = arrow.utcnow()
+    upcoming = [
+        event(f"session-{i}", f"F1: FP{i % 3 + 1} (Grand Prix {i})", begin)
+        for i, begin in enumerate(
+            now.shift(hours=hours) for hours in range(2, 170, 2)
+        )
+    ]
+    schedule = NotificationSchedule(callback=None)
+    schedule.sync(MockJobQueue(), upcoming, now)
+    await store.replace_notifications(schedule.notifications(now))
+
+    bot = F1ScheduleTelegramBot(
+        chat_store=ConnectionChatStore(conn),
+        ergast=None,
+        message_handler=None,
+        ical_fetcher=FailingICalFetcher(),
+        notification_store=store,
+    )
+    job_queue = MockJobQueue()
+    # The fetcher fails the test when startup waits for the calendar
+    await bot.initialize(SimpleNamespace(job_queue=job_queue))
+
+    assert len(job_queue.jobs) == 2 * len(upcoming)
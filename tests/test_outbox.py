@@ -0,0 +1,309 @@
+import asyncio
+import sqlite3
+
+import pytest
+import telegram
+
+from f1_schedule_telegram_bot.broadcaster import Broadcaster
+from f1_schedule_telegram_bot.chat_registry import ChatRegistry
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.database import DatabaseChat, OutboxCounts
+from f1_schedule_telegram_bot.database_writer import DatabaseWriter
+from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
+from f1_schedule_telegram_bot.outbox import (
+    DeliveryResult,
+    Outbox,
+    OutboxSettings,
+)
+from f1_schedule_telegram_bot.outbox_store import (
+    ConnectionOutboxStore,
+    SQLiteOutboxStore,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingMessageHandler(MessageHandlerInterface):
+    def __init__(self, errors=None):
+        # The errors to raise, per chat id, the first one first
+        self.errors = errors or {}
+        self.sent: list[tuple[int, str, dict]] = []
+
+    async def send_telegram_message(
+        self, context, chat_id, message, *args, **kwargs
+    ):
+        errors = self.errors.get(chat_id)
+        if errors:
+            raise errors.pop(0)
+        self.sent.append((chat_id, message, kwargs))
+
+
+class SlowMessageHandler(FailingMessageHandler):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_telegram_message(
+        self, context, chat_id, message, *args, **kwargs
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            await super().send_telegram_message(
+                context, chat_id, message, *args, **kwargs
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def private_chats(amount):
+    return [
+        DatabaseChat(chat_id, "private", f"user{chat_id}")
+        for chat_id in range(1, amount + 1)
+    ]
+
+
+def make_outbox(handler, clock, store=None, concurrency=1, rate=30):
+    conn = sqlite3.connect(":memory:")
+    registry = ChatRegistry(ConnectionChatStore(conn))
+    outbox = Outbox(
+        store or ConnectionOutboxStore(conn),
+        Broadcaster(handler, global_rate=10_000),
+        registry.deactivate,
+        OutboxSettings(concurrency=concurrency, rate=rate, clock=clock),
+    )
+    return outbox, registry
+
+
+@pytest.mark.asyncio
+async def test_delivered_messages_leave_the_outbox():
+    handler = FailingMessageHandler()
+    outbox, _ = make_outbox(handler, Clock())
+
+    await outbox.enqueue(
+        ((chat, f"hi {chat.name}") for chat in private_chats(10)), "HTML"
+    )
+    result = await outbox.deliver(None)
+
+    assert result.delivered == 10
+    assert handler.sent[0] == (1, "hi user1", {"parse_mode": "HTML"})
+    assert await outbox.counts() == OutboxCounts(0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_messages_are_delivered_concurrently():
+    handler = SlowMessageHandler(delay=0.01)
+    outbox, _ = make_outbox(handler, Clock(), concurrency=10)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(100))
+
+    result = await outbox.deliver(None)
+
+    assert result.delivered == 100
+    assert handler.max_in_flight == 10
+    # Serially this would take at least a second
+    assert result.duration < 0.5
+    assert outbox.stats.delivered == 100
+
+
+@pytest.mark.asyncio
+async def test_deliveries_do_not_wait_for_a_running_delivery():
+    handler = SlowMessageHandler(delay=0.01)
+    outbox, _ = make_outbox(handler, Clock())
+    await outbox.enqueue((chat, "hi") for chat in private_chats(20))
+
+    running = asyncio.create_task(outbox.deliver(None))
+    await asyncio.sleep(0)
+    assert await outbox.deliver(None) == DeliveryResult()
+    assert len(handler.sent) < 20
+
+    assert (await running).delivered == 20
+
+
+@pytest.mark.asyncio
+async def test_delivery_pauses_for_retry_after():
+    clock = Clock()
+    handler = FailingMessageHandler({3: [telegram.error.RetryAfter(30)]})
+    outbox, _ = make_outbox(handler, clock)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(10))
+
+    result = await outbox.deliver(None)
+    assert (result.delivered, result.retried) == (2, 1)
+    assert await outbox.counts() == OutboxCounts(7, 1, 0)
+
+    clock.now += 29
+    assert (await outbox.deliver(None)).delivered == 0
+
+    clock.now += 1
+    assert (await outbox.deliver(None)).delivered == 8
+    assert sorted(chat_id for chat_id, _, _ in handler.sent) == list(
+        range(1, 11)
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_after_does_not_count_as_an_attempt():
+    clock = Clock()
+    handler = FailingMessageHandler(
+        {
+            1: [telegram.error.RetryAfter(1)] * 10
+            + [telegram.error.NetworkError("reset")]
+        }
+    )
+    outbox, _ = make_outbox(handler, clock)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(1))
+
+    for _ in range(10):
+        assert (await outbox.deliver(None)).retried == 1
+        clock.now += 1
+    # The network error is the first failed attempt
+    assert (await outbox.deliver(None)).retried == 1
+
+    clock.now += 2
+    assert (await outbox.deliver(None)).delivered == 1
+    assert await outbox.counts() == OutboxCounts(0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_network_errors_are_retried_with_backoff():
+    clock = Clock()
+    handler = FailingMessageHandler(
+        {1: [telegram.error.NetworkError("reset")] * 5}
+    )
+    outbox, registry = make_outbox(handler, clock)
+    await registry.register(1, "private", "user1")
+    await outbox.enqueue((chat, "hi") for chat in private_chats(1))
+
+    attempts = [await outbox.deliver(None)]
+    for delay in (2, 4, 8, 16):
+        clock.now += delay - 1
+        assert await outbox.deliver(None) == DeliveryResult()
+        clock.now += 1
+        attempts.append(await outbox.deliver(None))
+
+    assert [result.retried for result in attempts] == [1, 1, 1, 1, 0]
+    assert attempts[-1].failed == 1
+    assert await outbox.counts() == OutboxCounts(0, 0, 1)
+    # The chat may be reachable again later, so it stays registered
+    assert 1 in registry
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        telegram.error.Forbidden("Forbidden: bot was blocked by the user"),
+        telegram.error.BadRequest("Chat not found"),
+    ],
+)
+async def test_unreachable_chats_are_deactivated(error):
+    handler = FailingMessageHandler({2: [error]})
+    outbox, registry = make_outbox(handler, Clock())
+    for chat in private_chats(3):
+        await registry.register(chat.chat_id, chat.chat_type, chat.name)
+    await outbox.enqueue((chat, "hi") for chat in registry.recipients())
+
+    result = await outbox.deliver(None)
+
+    assert (result.delivered, result.failed, result.deactivated) == (2, 1, 1)
+    assert 2 not in registry
+    assert [chat.chat_id for chat in registry.recipients()] == [1, 3]
+    # The chat is registered again once it sends /start
+    assert await registry.register(2, "private", "user2")
+    assert 2 in registry
+
+
+@pytest.mark.asyncio
+async def test_rejected_messages_fail_without_deactivating():
+    handler = FailingMessageHandler(
+        {2: [telegram.error.BadRequest("Message is too long")]}
+    )
+    outbox, registry = make_outbox(handler, Clock())
+    await registry.register(2, "private", "user2")
+    await outbox.enqueue((chat, "hi") for chat in private_chats(3))
+
+    result = await outbox.deliver(None)
+
+    assert (result.delivered, result.failed, result.deactivated) == (2, 1, 0)
+    assert 2 in registry
+
+
+@pytest.mark.asyncio
+async def test_outdated_messages_expire():
+    clock = Clock()
+    handler = FailingMessageHandler()
+    outbox, _ = make_outbox(handler, clock)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(3))
+
+    clock.now += 2 * 60 * 60
+    result = await outbox.deliver(None)
+
+    assert (result.delivered, result.failed) == (0, 3)
+    assert not handler.sent
+
+
+@pytest.mark.asyncio
+async def test_messages_expire_after_the_backlog_ahead_of_them():
+    clock = Clock()
+    handler = FailingMessageHandler()
+    outbox, _ = make_outbox(handler, clock, rate=1)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(5))
+    await outbox.enqueue((chat, "hi") for chat in private_chats(10)[5:])
+
+    # The last messages are expected to be sent after 10 seconds, at 1/s
+    clock.now += 60 * 60 + 5.5
+    result = await outbox.deliver(None)
+
+    assert (result.delivered, result.failed) == (4, 6)
+    assert [chat_id for chat_id, _, _ in handler.sent] == [7, 8, 9, 10]
+
+
+@pytest.mark.asyncio
+async def test_failed_messages_are_pruned_after_a_week():
+    clock = Clock()
+    handler = FailingMessageHandler(
+        {2: [telegram.error.BadRequest("Message is too long")]}
+    )
+    outbox, _ = make_outbox(handler, clock)
+    await outbox.enqueue((chat, "hi") for chat in private_chats(2))
+    await outbox.deliver(None)
+    assert await outbox.counts() == OutboxCounts(0, 0, 1)
+
+    clock.now += 6 * 24 * 60 * 60
+    await outbox.deliver(None)
+    assert await outbox.counts() == OutboxCounts(0, 0, 1)
+
+    clock.now += 25 * 60 * 60
+    await outbox.deliver(None)
+    assert await outbox.counts() == OutboxCounts(0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_pending_messages_survive_a_restart(tmp_path):
+    path = str(tmp_path / "f1.db")
+    clock = Clock()
+    writer = DatabaseWriter(path)
+    outbox, _ = make_outbox(
+        FailingMessageHandler(), clock, SQLiteOutboxStore(writer)
+    )
+    await outbox.enqueue((chat, "hi") for chat in private_chats(5))
+    await writer.close()
+
+    handler = FailingMessageHandler()
+    writer = DatabaseWriter(path)
+    outbox, _ = make_outbox(handler, clock, SQLiteOutboxStore(writer))
+    result = await outbox.deliver(None)
+    await writer.close()
+
+    assert result.delivered == 5
+    assert [chat_id for chat_id, _, _ in handler.sent] == [1, 2, 3, 4, 5]
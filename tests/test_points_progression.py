@@ -0,0 +1,198 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from f1_schedule_telegram_bot.points_progression import (
+    RoundResult,
+    RoundResults,
+    RoundResultsCache,
+    constructor_progression,
+    driver_progression,
+    round_results_from_ergast,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+ROUNDS = [
+    RoundResults(
+        2023,
+        1,
+        "Bahrain Grand Prix",
+        (
+            RoundResult("Max Verstappen", "Red Bull", 25),
+            RoundResult("Sergio Pérez", "Red Bull", 18),
+            RoundResult("Fernando Alonso", "Aston Martin", 15),
+        ),
+    ),
+    RoundResults(
+        2023,
+        2,
+        "Saudi Arabian Grand Prix",
+        (
+            RoundResult("Sergio Pérez", "Red Bull", 25),
+            RoundResult("Max Verstappen", "Red Bull", 19),
+            RoundResult("Fernando Alonso", "Aston Martin", 15),
+        ),
+    ),
+    RoundResults(
+        2023,
+        3,
+        "Australian Grand Prix",
+        (
+            RoundResult("Max Verstappen", "Red Bull", 25),
+            RoundResult("Lewis Hamilton", "Mercedes", 18),
+            # A sprint result of the same driver
+            RoundResult("Max Verstappen", "Red Bull", 8),
+        ),
+    ),
+]
+
+
+def test_driver_progression():
+    progression = driver_progression(ROUNDS)
+
+    assert progression.season == 2023
+    assert progression.round_no == 3
+    assert progression.names == (
+        "Max Verstappen",
+        "Sergio Pérez",
+        "Fernando Alonso",
+        "Lewis Hamilton",
+    )
+    np.testing.assert_array_equal(
+        progression.points,
+        [[25, 44, 77], [18, 43, 43], [15, 30, 30], [0, 0, 18]],
+    )
+
+
+def test_constructor_progression_adds_up_drivers():
+    progression = constructor_progression(ROUNDS)
+
+    assert progression.names == ("Red Bull", "Aston Martin", "Mercedes")
+    np.testing.assert_array_equal(
+        progression.points, [[43, 87, 120], [15, 30, 30], [0, 0, 18]]
+    )
+
+
+def test_progression_without_rounds():
+    progression = driver_progression([])
+
+    assert progression.names == ()
+    assert progression.points.shape == (0, 0)
+
+
+def test_round_results_from_ergast():
+    def result(given_name, family_name, team, points):
+        return SimpleNamespace(
+            driver=SimpleNamespace(
+                given_name=given_name, family_name=family_name
+            ),
+            constructor=SimpleNamespace(name=team),
+            points=points,
+        )
+
+    race = SimpleNamespace(
+        season=2023,
+        round_no=4,
+        race_name="Azerbaijan Grand Prix",
+        results=[result("Sergio", "Pérez", "Red Bull", 25)],
+    )
+    sprint = SimpleNamespace(
+        sprint_results=[result("Sergio", "Pérez", "Red Bull", 8)]
+    )
+
+    results = round_results_from_ergast(race, [sprint])
+
+    assert results.round_no == 4
+    assert results.results == (
+        RoundResult("Sergio Pérez", "Red Bull", 25),
+        RoundResult("Sergio Pérez", "Red Bull", 8),
+    )
+
+
+def test_round_results_cache():
+    cache = RoundResultsCache()
+    cache.add(ROUNDS[0])
+    cache.add(ROUNDS[2])
+
+    assert cache.missing(2023, 3) == [2]
+    assert cache.missing(2024, 1) == [1]
+    assert cache.rounds(2023, 3) == [ROUNDS[0], ROUNDS[2]]
+
+
+class RoundsErgast:
+    """A stand-in for ergast_py.Ergast serving the results of ROUNDS."""
+
+    def __init__(self):
+        # Shared with the copies the fetcher makes of the client
+        self.calls = []
+        self.reset()
+
+    def reset(self):
+        self.params = {"season": None, "round": None}
+
+    def season(self, year="current"):
+        self.params["season"] = year
+        return self
+
+    def round(self, round_no="last"):
+        self.params["round"] = round_no
+        return self
+
+    def get_driver_standing(self):
+        self.calls.append("get_driver_standing")
+        return SimpleNamespace(season=2023, round_no=len(ROUNDS))
+
+    def get_result(self):
+        self.calls.append(f"get_result {self.params['round']}")
+        results = ROUNDS[self.params["round"] - 1]
+        return SimpleNamespace(
+            season=results.season,
+            round_no=results.round_no,
+            race_name=results.race_name,
+            results=[
+                SimpleNamespace(
+                    driver=SimpleNamespace(
+                        given_name=result.driver.split()[0],
+                        family_name=result.driver.split()[1],
+                    ),
+                    constructor=SimpleNamespace(name=result.constructor),
+                    points=result.points,
+                )
+                for result in results.results
+            ],
+        )
+
+    def get_sprints(self):
+        self.calls.append(f"get_sprints {self.params['round']}")
+        return []
+
+
+@pytest.mark.asyncio
+async def test_handle_progress_fetches_every_round_once(
+    make_bot, message_handler, renderer, context
+):
+    ergast = RoundsErgast()
+    bot = make_bot(ergast)
+    update = SimpleNamespace(effective_chat=SimpleNamespace(id=15))
+
+    await bot.handle_progress(update, context)
+    await bot.handle_progress(update, context)
+
+    assert sorted(ergast.calls) == [
+        "get_driver_standing",
+        "get_driver_standing",
+        "get_result 1",
+        "get_result 2",
+        "get_result 3",
+        "get_sprints 1",
+        "get_sprints 2",
+        "get_sprints 3",
+    ]
+    assert [progression.round_no for progression in renderer.renders] == [
+        3,
+        3,
+    ]
+    assert context.bot.media_groups == [15, 15]
+    assert message_handler.messages == []
@@ -1,12 +1,14 @@
 import sqlite3
 from dataclasses import dataclass
+from types import SimpleNamespace
 
 import arrow
 import pytest
-from ics import Calendar
 from telegram.ext import ContextTypes
 
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
 from f1_schedule_telegram_bot.ical_fetcher import ICalFetcherInterface
+from f1_schedule_telegram_bot.ics_parser import ICalCalendar, parse_calendar
 from f1_schedule_telegram_bot.main import F1ScheduleTelegramBot
 from f1_schedule_telegram_bot.message_handler import MessageHandlerInterface
 
@@ -31,13 +33,13 @@ class MockMessageHandler(MessageHandlerInterface):
 
 
 class MockICalFetcher(ICalFetcherInterface):
-    async def fetch(self) -> Calendar:
+    async def fetch(self) -> ICalCalendar:
         with open(
             "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics",
             "r",
             encoding="UTF-8",
         ) as ics:
-            return Calendar(ics.read())
+            return parse_calendar(ics.read())
 
 
 # Set up in memory sqlite3 database
@@ -61,7 +63,7 @@ async def test_send_weekend_calendar_no_chats(get_dbconn):
     handler = MockMessageHandler()
     dbconn = get_dbconn
     bot = F1ScheduleTelegramBot(
-        dbconn=dbconn,
+        chat_store=ConnectionChatStore(dbconn),
         ergast=None,
         message_handler=handler,
         ical_fetcher=MockICalFetcher(),
@@ -80,7 +82,7 @@ async def test_send_weekend_calendar_one_chat(get_dbconn):
         """
     )
     bot = F1ScheduleTelegramBot(
-        dbconn=dbconn,
+        chat_store=ConnectionChatStore(dbconn),
         ergast=None,
         message_handler=handler,
         ical_fetcher=MockICalFetcher(),
@@ -119,10 +121,86 @@ async def test_simple_no_event(get_dbconn):
     arrow.utcnow = lambda: arrow.get("2023-10-12T20:00:00+00:00")
 
     bot = F1ScheduleTelegramBot(
-        dbconn=dbconn,
+        chat_store=ConnectionChatStore(dbconn),
         ergast=None,
         message_handler=handler,
         ical_fetcher=MockICalFetcher(),
     )
     await bot.send_weekend_calendar(None)
     assert not handler.messages
+
+
+@pytest.mark.asyncio
+async def test_send_weekend_calendar_per_timezone(get_dbconn):
+    handler = MockMessageHandler()
+    dbconn = get_dbconn
+    bot = F1ScheduleTelegramBot(
+        chat_store=ConnectionChatStore(dbconn),
+        ergast=None,
+        message_handler=handler,
+        ical_fetcher=MockICalFetcher(),
+    )
+    dbconn.executemany(
+        "INSERT INTO chats (chat_id, type, name, timezone) VALUES (?, ?, ?, ?)",
+        [
+            (15, "private", "amsterdam", None),
+            (16, "private", "new_york", "America/New_York"),
+            (17, "private", "new_york_too", "America/New_York"),
+        ],
+    )
+
+    arrow.utcnow = lambda: arrow.get("2023-10-19T20:00:00+00:00")
+
+    await bot.send_weekend_calendar("the-context")
+
+    messages = {
+        message.chat_id: message.message for message in handler.messages
+    }
+    assert messages == {
+        15: (
+            "<b>United States Grand Prix</b>\n"
+            "Qualifying: 23:00\n"
+            "Grand Prix: 21:00\n"
+        ),
+        16: (
+            "<b>United States Grand Prix</b>\n"
+            "Qualifying: 17:00\n"
+            "Grand Prix: 15:00\n"
+        ),
+        17: (
+            "<b>United States Grand Prix</b>\n"
+            "Qualifying: 17:00\n"
+            "Grand Prix: 15:00\n"
+        ),
+    }
+
+
+@pytest.mark.asyncio
+async def test_handle_timezone(get_dbconn):
+    handler = MockMessageHandler()
+    dbconn = get_dbconn
+    dbconn.execute(
+        "INSERT INTO chats (chat_id, type, name) VALUES (15, 'private', 'user')"
+    )
+    bot = F1ScheduleTelegramBot(
+        chat_store=ConnectionChatStore(dbconn),
+        ergast=None,
+        message_handler=handler,
+        ical_fetcher=MockICalFetcher(),
+    )
+
+    async def timezone_command(chat_id, *args):
+        update = SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id))
+        context = SimpleNamespace(args=list(args))
+        await bot.handle_timezone(update, context)
+        return handler.messages.pop().message
+
+    assert "Europe/Amsterdam" in await timezone_command(15)
+    assert "Unknown timezone" in await timezone_command(15, "Mars/Base")
+    assert await timezone_command(15, "asia/tokyo") == (
+        "Times are now shown in Asia/Tokyo 🕒"
+    )
+    assert "/start" in await timezone_command(16, "Asia/Tokyo")
+    assert dbconn.execute(
+        "SELECT timezone FROM chats WHERE chat_id = 15"
+    ).fetchone() == ("Asia/Tokyo",)
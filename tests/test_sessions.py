@@ -0,0 +1,61 @@
+import collections
+import datetime
+
+from f1_schedule_telegram_bot.ics_parser import ICalEvent, parse_calendar
+from f1_schedule_telegram_bot.sessions import (
+    SessionKind,
+    classify,
+    classify_all,
+)
+
+with open(
+    "f1-calendar_p1_p2_p3_qualifying_sprint_gp.ics", "r", encoding="UTF-8"
+) as calendar_file:
+    SESSIONS = classify_all(parse_calendar(calendar_file.read()).events)
+
+BEGIN = datetime.datetime(2023, 10, 22, 19, tzinfo=datetime.timezone.utc)
+
+
+def event(name, status="CONFIRMED"):
+    return ICalEvent("uid", name, BEGIN, BEGIN, status, None)
+
+
+def test_all_sessions_in_calendar_are_classified():
+    kinds = collections.Counter(session.kind for session in SESSIONS)
+
+    assert kinds == {
+        SessionKind.FP1: 22,
+        SessionKind.FP2: 16,
+        SessionKind.FP3: 16,
+        SessionKind.SPRINT_SHOOTOUT: 6,
+        SessionKind.SPRINT: 6,
+        SessionKind.QUALIFYING: 22,
+        SessionKind.RACE: 22,
+    }
+    assert not any(session.canceled for session in SESSIONS)
+
+
+def test_classify_extracts_label_and_grand_prix():
+    session = classify(event("F1: Sprint Shootout (Austrian Grand Prix)"))
+
+    assert session.kind == SessionKind.SPRINT_SHOOTOUT
+    assert session.label == "Sprint Shootout"
+    assert session.grand_prix == "Austrian Grand Prix"
+    assert session.begin == BEGIN
+
+
+def test_classify_canceled_sessions():
+    by_name = classify(event("F1: Grand Prix (Emilia Romagna) - Canceled"))
+    by_status = classify(event("F1: FP1 (Emilia Romagna)", "CANCELLED"))
+
+    assert by_name.kind == SessionKind.RACE
+    assert by_name.canceled
+    assert by_status.canceled
+
+
+def test_classify_unknown_session():
+    session = classify(event("F1: Parade (Monaco Grand Prix)"))
+
+    assert session.kind == SessionKind.OTHER
+    assert session.label == "Parade"
+    assert session.grand_prix == "Monaco Grand Prix"
@@ -0,0 +1,107 @@
+import pytest
+
+from f1_schedule_telegram_bot.standings_cache import (
+    ImageKey,
+    ImageKind,
+    StandingsImageCache,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class Renderer:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return b"image %d" % self.calls
+
+
+@pytest.mark.asyncio
+async def test_get_or_render_renders_once():
+    cache = StandingsImageCache()
+    render = Renderer()
+    key = ImageKey(2023, 18, ImageKind.DRIVERS)
+
+    first = await cache.get_or_render(key, render)
+    second = await cache.get_or_render(key, render)
+
+    assert first is second
+    assert render.calls == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_ratio == 0.5
+
+
+@pytest.mark.asyncio
+async def test_kinds_are_cached_separately():
+    cache = StandingsImageCache()
+    render = Renderer()
+
+    drivers = await cache.get_or_render(
+        ImageKey(2023, 18, ImageKind.DRIVERS), render
+    )
+    constructors = await cache.get_or_render(
+        ImageKey(2023, 18, ImageKind.CONSTRUCTORS), render
+    )
+
+    assert drivers != constructors
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_newer_round_invalidates_older_rounds():
+    cache = StandingsImageCache()
+    render = Renderer()
+    await cache.get_or_render(ImageKey(2023, 17, ImageKind.DRIVERS), render)
+    await cache.get_or_render(
+        ImageKey(2023, 17, ImageKind.CONSTRUCTORS), render
+    )
+
+    await cache.get_or_render(ImageKey(2023, 18, ImageKind.DRIVERS), render)
+
+    assert len(cache) == 1
+    assert cache.stats.invalidations == 2
+
+    await cache.get_or_render(ImageKey(2024, 1, ImageKind.DRIVERS), render)
+
+    assert len(cache) == 1
+    assert cache.stats.invalidations == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    cache = StandingsImageCache(max_size=2)
+    render = Renderer()
+    first = ImageKey(2023, 18, ImageKind.DRIVERS)
+    second = ImageKey(2023, 18, ImageKind.CONSTRUCTORS)
+    await cache.get_or_render(first, render)
+    await cache.get_or_render(second, render)
+    await cache.get_or_render(first, render)
+
+    # An older round does not invalidate anything, but does take up space
+    await cache.get_or_render(ImageKey(2023, 17, ImageKind.DRIVERS), render)
+    await cache.get_or_render(first, render)
+    await cache.get_or_render(second, render)
+
+    assert len(cache) == 2
+    assert render.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_file_ids_are_invalidated_with_older_rounds():
+    cache = StandingsImageCache()
+    older = ImageKey(2023, 17, ImageKind.DRIVERS)
+    await cache.get_or_render(older, Renderer())
+    cache.remember_file_id(older, "older")
+
+    assert cache.file_id(older) == "older"
+
+    newer = ImageKey(2023, 18, ImageKind.DRIVERS)
+    await cache.get_or_render(newer, Renderer())
+    cache.remember_file_id(older, "older again")
+    cache.remember_file_id(newer, "newer")
+
+    assert cache.file_id(older) is None
+    assert cache.file_id(newer) == "newer"
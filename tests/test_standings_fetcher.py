@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from f1_schedule_telegram_bot.standings_fetcher import StandingsFetcher
+
+pytest_plugins = ("pytest_asyncio",)
+
+DELAY = 0.2
+
+
+class SlowErgast:
+    """A stand-in for ergast_py.Ergast, whose calls block for a while."""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = failing
+        self.reset()
+
+    def reset(self):
+        self.params = {"season": None}
+
+    def season(self, year="current"):
+        self.params["season"] = year
+        return self
+
+    def _call(self, name):
+        time.sleep(self.delays.get(name, DELAY))
+        if name in self.failing:
+            raise ConnectionError(f"{name} failed")
+        return f"{name} {self.params['season']}"
+
+    def get_constructor_standing(self):
+        return self._call("get_constructor_standing")
+
+    def get_driver_standing(self):
+        return self._call("get_driver_standing")
+
+    def get_races(self):
+        return self._call("get_races")
+
+
+@pytest.mark.asyncio
+async def test_fetch_runs_calls_concurrently():
+    fetcher = StandingsFetcher(SlowErgast())
+
+    started = time.perf_counter()
+    data = await fetcher.fetch()
+    duration = time.perf_counter() - started
+
+    assert data.constructor_standing == "get_constructor_standing current"
+    assert data.driver_standing == "get_driver_standing current"
+    assert data.races == "get_races current"
+    # Sequential calls would take three times the delay
+    assert duration < 2 * DELAY
+
+
+@pytest.mark.asyncio
+async def test_fetch_does_not_block_the_event_loop():
+    fetcher = StandingsFetcher(SlowErgast())
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    await fetcher.fetch()
+    ticker.cancel()
+
+    assert ticks >= DELAY / 0.01 / 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_degrades_on_failure_and_timeout():
+    ergast = SlowErgast(
+        delays={"get_races": 1}, failing=("get_constructor_standing",)
+    )
+    fetcher = StandingsFetcher(ergast, timeout=0.5)
+
+    started = time.perf_counter()
+    data = await fetcher.fetch()
+    duration = time.perf_counter() - started
+
+    assert data.constructor_standing is None
+    assert data.driver_standing == "get_driver_standing current"
+    assert data.races is None
+    assert duration < 1
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest_plugins = ("pytest_asyncio",)
+
+DELAY = 0.2
+
+
+class StandingsErgast:
+    """A stand-in for ergast_py.Ergast, whose calls block for a while."""
+
+    def __init__(self, failing=()):
+        self.failing = failing
+        # Shared with the copies the fetcher makes of the client
+        self.calls = []
+        self.reset()
+
+    def reset(self):
+        self.params = {"season": None}
+
+    def season(self, year="current"):
+        self.params["season"] = year
+        return self
+
+    def _call(self, name):
+        self.calls.append(name)
+        time.sleep(DELAY)
+        if name in self.failing:
+            raise ConnectionError(f"{name} failed")
+        if name == "get_races":
+            return [SimpleNamespace(race_name="Race")] * 18
+        return SimpleNamespace(
+            season=2023,
+            round_no=18,
+            driver_standings=[],
+            constructor_standings=[],
+        )
+
+    def get_constructor_standing(self):
+        return self._call("get_constructor_standing")
+
+    def get_driver_standing(self):
+        return self._call("get_driver_standing")
+
+    def get_races(self):
+        return self._call("get_races")
+
+
+def chat_update(chat_id):
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id))
+
+
+@pytest.mark.asyncio
+async def test_handle_standings_without_races(
+    make_bot, message_handler, context
+):
+    bot = make_bot(StandingsErgast(failing=("get_races",)))
+
+    await bot.handle_standings(chat_update(15), context)
+
+    assert context.bot.media_groups == []
+    assert len(message_handler.messages) == 1
+    assert message_handler.messages[0][0] == 15
+
+
+@pytest.mark.asyncio
+async def test_concurrent_handle_standings_render_once(
+    make_bot, renderer, context
+):
+    ergast = StandingsErgast()
+    bot = make_bot(ergast)
+
+    await asyncio.gather(
+        *(
+            bot.handle_standings(chat_update(chat_id), context)
+            for chat_id in range(10)
+        )
+    )
+
+    # One call for the constructors, drivers and races each
+    assert len(ergast.calls) == 3
+    # One image for the drivers and one for the constructors
+    assert len(renderer.renders) == 2
+    # Every chat gets both images in one call, which are uploaded only once
+    assert sorted(context.bot.media_groups) == list(range(10))
+    assert context.bot.uploads == 2
@@ -0,0 +1,82 @@
+import concurrent.futures
+import pickle
+
+import numpy as np
+import pytest
+
+from f1_schedule_telegram_bot.points_progression import Progression
+from f1_schedule_telegram_bot.standings_data import (
+    ConstructorRow,
+    ConstructorStandings,
+    DriverRow,
+    DriverStandings,
+)
+from f1_schedule_telegram_bot.standings_renderer import StandingsRenderer
+
+pytest_plugins = ("pytest_asyncio",)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+DRIVERS = DriverStandings(
+    season=2023,
+    round_no=18,
+    race_name="United States Grand Prix",
+    rows=(
+        DriverRow("1", "Max Verstappen", "Red Bull", 466),
+        DriverRow("2", "Sergio Pérez", "Red Bull", 240),
+    ),
+)
+CONSTRUCTORS = ConstructorStandings(
+    season=2023,
+    round_no=18,
+    race_name="United States Grand Prix",
+    rows=(
+        ConstructorRow("1", "Red Bull", 706, 17),
+        ConstructorRow("2", "Mercedes", 371, 0),
+    ),
+)
+PROGRESSION = Progression(
+    season=2023,
+    race_names=("Bahrain Grand Prix", "Saudi Arabian Grand Prix"),
+    names=("Max Verstappen", "Sergio Pérez"),
+    points=np.array([[25.0, 44.0], [18.0, 43.0]]),
+)
+
+
+def test_standings_data_is_picklable():
+    assert pickle.loads(pickle.dumps(DRIVERS)) == DRIVERS
+    assert pickle.loads(pickle.dumps(CONSTRUCTORS)) == CONSTRUCTORS
+
+
+@pytest.mark.asyncio
+async def test_render_in_process_pool():
+    renderer = StandingsRenderer(max_workers=1)
+    try:
+        drivers = await renderer.render_drivers(DRIVERS)
+        constructors = await renderer.render_constructors(CONSTRUCTORS)
+        progress = await renderer.render_driver_progress(PROGRESSION)
+    finally:
+        renderer.close()
+
+    assert drivers.startswith(PNG_SIGNATURE)
+    assert constructors.startswith(PNG_SIGNATURE)
+    assert progress.startswith(PNG_SIGNATURE)
+
+
+@pytest.mark.asyncio
+async def test_render_falls_back_to_threads(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("no process pools here")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", unavailable)
+    renderer = StandingsRenderer(max_workers=1)
+    try:
+        drivers = await renderer.render_drivers(DRIVERS)
+
+        assert isinstance(
+            renderer._executor, concurrent.futures.ThreadPoolExecutor
+        )
+    finally:
+        renderer.close()
+
+    assert drivers.startswith(PNG_SIGNATURE)
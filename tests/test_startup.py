@@ -0,0 +1,53 @@
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+from benchmarks.bench_startup import REPEAT, STARTUP_BUDGET, measure_startup
+
+# The modules that are only imported once a standings command or job runs
+LAZY_MODULES = (
+    "PIL",
+    "numpy",
+    "matplotlib",
+    "ergast_py",
+    "f1_schedule_telegram_bot.draw_standings",
+    "f1_schedule_telegram_bot.draw_table",
+)
+
+
+def test_importing_the_bot_does_not_import_lazy_dependencies():
+    # A fresh interpreter, as the tests themselves import the dependencies
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys;"
+            "import f1_schedule_telegram_bot.main;"
+            "print(json.dumps(sorted(sys.modules)))",
+        ],
+        check=True,
+        capture_output=True,
+        env={
+            **os.environ,
+            "PYTHONPATH": str(pathlib.Path(__file__).resolve().parents[1]),
+        },
+        text=True,
+    ).stdout
+
+    modules = set(json.loads(output))
+    assert "f1_schedule_telegram_bot.main" in modules
+    assert [name for name in LAZY_MODULES if name in modules] == []
+
+
+def test_startup_does_not_import_lazy_dependencies():
+    assert measure_startup().modules == ()
+
+
+def test_startup_is_within_budget():
+    # The fastest of a few starts, as a single start may be slowed down by
+    # whatever else the machine is doing
+    runs = [measure_startup() for _ in range(REPEAT)]
+
+    assert min(run.ready for run in runs) < STARTUP_BUDGET
@@ -0,0 +1,37 @@
+from f1_schedule_telegram_bot.chat_registry import RegisteredChat
+from f1_schedule_telegram_bot.timezones import (
+    render_per_timezone,
+    resolve_timezone,
+)
+
+
+def test_resolve_timezone():
+    assert resolve_timezone("Europe/London") == "Europe/London"
+    assert resolve_timezone(" america/new_york ") == "America/New_York"
+    assert resolve_timezone("Mars/Olympus_Mons") is None
+
+
+def test_render_per_timezone_renders_once_per_timezone():
+    rendered = []
+
+    def render(timezone):
+        rendered.append(timezone)
+        return f"message in {timezone}"
+
+    groups = [
+        (
+            "Asia/Tokyo",
+            [RegisteredChat(chat_id, "private") for chat_id in range(3)],
+        ),
+        ("UTC", [RegisteredChat(3, "group")]),
+    ]
+
+    messages = list(render_per_timezone(groups, render))
+
+    assert rendered == ["Asia/Tokyo", "UTC"]
+    assert [(chat.chat_id, message) for chat, message in messages] == [
+        (0, "message in Asia/Tokyo"),
+        (1, "message in Asia/Tokyo"),
+        (2, "message in Asia/Tokyo"),
+        (3, "message in UTC"),
+    ]
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import socket
+import sqlite3
+
+import httpx
+import pytest
+import pytest_asyncio
+from telegram.request import BaseRequest
+
+from f1_schedule_telegram_bot.chat_store import ConnectionChatStore
+from f1_schedule_telegram_bot.database import DatabaseChat
+from f1_schedule_telegram_bot.ical_fetcher import ICalFetcherInterface
+from f1_schedule_telegram_bot.ics_parser import ICalCalendar, parse_calendar
+from f1_schedule_telegram_bot.main import F1ScheduleTelegramBot
+from f1_schedule_telegram_bot.message_handler import MessageHandler
+from f1_schedule_telegram_bot.webhook import (
+    WebhookSettings,
+    read_webhook_settings,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+SECRET_TOKEN = "s3cret-token"
+
+# A /start command as Telegram posts it to the webhook
+START_UPDATE = {
+    "update_id": 100,
+    "message": {
+        "message_id": 1,
+        "date": 1697745600,
+        "chat": {"id": 42, "type": "private", "username": "fan"},
+        "from": {
+            "id": 42,
+            "is_bot": False,
+            "first_name": "Fan",
+            "username": "fan",
+        },
+        "text": "/start",
+        "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+    },
+}
+
+
+class RecordingRequest(BaseRequest):
+    """Answer the Bot API calls locally, recording what the bot calls."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        endpoint = url.rsplit("/", 1)[-1]
+        parameters = request_data.parameters if request_data else {}
+        self.calls.append((endpoint, parameters))
+        if endpoint == "getMe":
+            result = {
+                "id": 1,
+                "is_bot": True,
+                "first_name": "F1",
+                "username": "f1_bot",
+            }
+        elif endpoint == "sendMessage":
+            result = {
+                "message_id": len(self.calls),
+                "date": 1697745600,
+                "chat": {"id": parameters["chat_id"], "type": "private"},
+                "text": parameters["text"],
+            }
+        else:
+            result = True
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+    def sent(self) -> list[tuple[int, str]]:
+        return [
+            (parameters["chat_id"], parameters["text"])
+            for endpoint, parameters in self.calls
+            if endpoint == "sendMessage"
+        ]
+
+
+class EmptyICalFetcher(ICalFetcherInterface):
+    async def fetch(self) -> ICalCalendar:
+        return parse_calendar("BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def webhook():
+    request = RecordingRequest()
+    conn = sqlite3.connect(":memory:")
+    store = ConnectionChatStore(conn)
+    bot = F1ScheduleTelegramBot(
+        chat_store=store,
+        ergast=None,
+        message_handler=MessageHandler(),
+        ical_fetcher=EmptyICalFetcher(),
+    )
+    application = bot.build_application("1:token", -1, request=request)
+    settings = WebhookSettings(
+        url="https://bot.example.com/telegram",
+        secret_token=SECRET_TOKEN,
+        listen="127.0.0.1",
+        port=unused_port(),
+    )
+
+    await application.initialize()
+    await application.updater.start_webhook(**settings.options())
+    await application.start()
+    try:
+        yield f"http://127.0.0.1:{settings.port}/telegram", request, store
+    finally:
+        await application.updater.stop()
+        await application.stop()
+        await application.shutdown()
+        await bot.shutdown(application)
+
+
+async def wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("The update was not handled in time")
+
+
+def test_polling_without_webhook_url():
+    assert read_webhook_settings({"BOT_TOKEN": "1:token"}) is None
+
+
+def test_webhook_settings_from_environment():
+    settings = read_webhook_settings(
+        {
+            "WEBHOOK_URL": "https://bot.example.com/telegram/",
+            "WEBHOOK_SECRET": SECRET_TOKEN,
+            "WEBHOOK_PORT": "8080",
+        }
+    )
+
+    assert settings.url_path == "telegram"
+    assert settings.options() == {
+        "listen": "0.0.0.0",
+        "port": 8080,
+        "url_path": "telegram",
+        "webhook_url": "https://bot.example.com/telegram/",
+        "secret_token": SECRET_TOKEN,
+    }
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"WEBHOOK_URL": "https://bot.example.com"},
+        {"WEBHOOK_URL": "http://bot.example.com", "WEBHOOK_SECRET": "a"},
+        {"WEBHOOK_URL": "https://bot.example.com", "WEBHOOK_SECRET": "a b"},
+        {
+            "WEBHOOK_URL": "https://bot.example.com",
+            "WEBHOOK_SECRET": "a",
+            "WEBHOOK_PORT": "port",
+        },
+    ],
+)
+def test_invalid_webhook_settings(environ):
+    with pytest.raises(EnvironmentError):
+        read_webhook_settings(environ)
+
+
+@pytest.mark.asyncio
+async def test_webhook_handles_posted_updates(webhook):
+    url, request, store = webhook
+    assert ("setWebhook", "https://bot.example.com/telegram") in [
+        (endpoint, parameters.get("url"))
+        for endpoint, parameters in request.calls
+    ]
+
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            url,
+            json=START_UPDATE,
+            headers={"X-Telegram-Bot-Api-Secret-Token": SECRET_TOKEN},
+        )
+    assert response.status_code == 200
+
+    await wait_for(lambda: request.sent())
+    await wait_for(store.read_chats)
+    assert request.sent()[0][0] == 42
+    assert "registered successfully" in request.sent()[0][1]
+    assert store.read_chats() == [DatabaseChat(42, "private", "fan")]
+
+
+@pytest.mark.asyncio
+async def test_webhook_rejects_a_wrong_secret_token(webhook):
+    url, request, store = webhook
+
+    async with httpx.AsyncClient() as client:
+        missing = await client.post(url, json=START_UPDATE)
+        wrong = await client.post(
+            url,
+            json=START_UPDATE,
+            headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+        )
+    await asyncio.sleep(0.1)
+
+    assert missing.status_code == wrong.status_code == 403
+    assert not request.sent()
+    assert not store.read_chats()
+
+
+@pytest.mark.asyncio
+async def test_webhook_handles_updates_concurrently(webhook):
+    url, request, store = webhook
+    updates = [
+        {
+            "update_id": 100 + chat_id,
+            "message": {
+                **START_UPDATE["message"],
+                "chat": {"id": chat_id, "type": "private", "username": "fan"},
+            },
+        }
+        for chat_id in range(1, 21)
+    ]
+
+    async with httpx.AsyncClient() as client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    url,
+                    json=update,
+                    headers={"X-Telegram-Bot-Api-Secret-Token": SECRET_TOKEN},
+                )
+                for update in updates
+            )
+        )
+
+    assert {response.status_code for response in responses} == {200}
+    await wait_for(lambda: len(store.read_chats()) == 20)
+    assert sorted(chat_id for chat_id, _ in request.sent()) == list(
+        range(1, 21)
+    )